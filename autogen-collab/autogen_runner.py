@@ -2,8 +2,14 @@
 """
 autogen_runner.py — AutoGen-style debate runner using OpenClaw's gateway.
 
-Each agent turn is run via `openclaw agent --agent <id> --json`, so all
-provider credentials are handled by OpenClaw — no API keys needed here.
+Each agent turn goes through OpenClaw (by default `openclaw agent --agent <id>
+--json`; see openclaw_client.py for the other transports), so all provider
+credentials are handled by OpenClaw — no API keys needed here.
+
+Modes:
+  debate        — round-robin, one agent per round
+  simultaneous  — every agent answers the same context concurrently each round;
+                  consensus when every answer in a round agrees
 
 Usage:
   python3 autogen_runner.py \
@@ -16,52 +22,71 @@ Usage:
     --timeout 300
 
 Output (always written, even on failure):
+  <output>/events.jsonl   — append-only event log the other three are rendered from
   <output>/status.json    — run status: running / complete / timeout / error
   <output>/result.md      — final answer with YAML frontmatter
-  <output>/transcript.md  — full conversation, flushed per turn
+  <output>/transcript.md  — full conversation; debate turns are streamed in as
+                            they arrive (gateway transport), others flushed per turn
+
+In debate mode a turn stops as soon as its `##AGREED##` line has arrived
+instead of waiting for the rest of the generation.
+
+--timeout is a hard run deadline: each turn gets at most the time left, and
+a turn still running when it passes is cancelled (its `openclaw` process is
+killed). The run then ends with status "timeout" and the partial transcript.
+
+Daemon mode: `python3 autogen_runner.py serve` keeps a warm runner on a Unix
+socket; `python3 runner_daemon.py submit -- <args above>` runs a task on it
+with the same output contract (see runner_daemon.py). Batch mode:
+`python3 autogen_runner.py batch tasks.jsonl --concurrency 8` runs a JSONL
+file of tasks from one warm process (see runner_batch.py). Queue mode:
+`python3 autogen_runner.py worker` runs tasks queued with task_queue.py.
 """
 
 import argparse
-import json
-import os
-import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+from openclaw_client import (
+    DeadlineExceeded, add_client_args, client_status, close_clients, configure_client, get_client,
+    run_deadline, set_run_deadline,
+)
+from run_log import RunLog
+from turn_context import DEFAULT_CONTEXT_TOKENS, RollingContext, load_context_budgets
+
 WORKSPACE = Path.home() / ".openclaw" / "workspace"
 SKILL_DIR = Path(__file__).resolve().parent
+PERSONAS_DIR = SKILL_DIR / "personas"
 CONSENSUS_SIGNAL = "##AGREED##"
-MAX_HISTORY_TURNS = 6  # prevent context window overflow on long debates
+# Recent turns verbatim + rolling summary of older ones, within each agent's token budget
+CONTEXT = RollingContext()
 
 
 # ── Output helpers ────────────────────────────────────────────────────────────
 
-def write_status(output_dir: Path, status: str, extra: dict = None):
-    data = {"status": status, "updated_at": datetime.now(timezone.utc).isoformat()}
-    if extra:
-        data.update(extra)
-    (output_dir / "status.json").write_text(json.dumps(data, indent=2))
+# Everything goes through the run's event log (run_log.py), which renders
+# status.json, transcript.md and result.md from it.
+
+def write_status(log: RunLog, status: str, extra: dict = None):
+    log.status(status, extra)
 
 
-def append_transcript(output_dir: Path, text: str):
-    with open(output_dir / "transcript.md", "a", encoding="utf-8") as f:
-        f.write(text + "\n")
-        f.flush()
+def append_transcript(log: RunLog, text: str):
+    log.transcript(text + "\n")
 
 
-def write_result(output_dir: Path, content: str, meta: dict):
-    frontmatter = "\n".join(f"{k}: {v}" for k, v in meta.items())
-    (output_dir / "result.md").write_text(f"---\n{frontmatter}\n---\n\n{content}\n")
+def write_result(log: RunLog, content: str, meta: dict):
+    log.result(content, meta)
 
 
-def synthesize_transcript(output_dir: Path) -> str:
-    path = output_dir / "transcript.md"
-    if not path.exists():
+def synthesize_transcript(log: RunLog) -> str:
+    lines = log.tail(40)
+    if not lines:
         return "No transcript available."
-    lines = path.read_text().splitlines()
-    tail = "\n".join(lines[-40:]) if len(lines) > 40 else "\n".join(lines)
+    tail = "\n".join(lines)
     return f"**Note: Consensus not reached within limits.**\n\nFinal discussion:\n\n{tail}"
 
 
@@ -69,111 +94,127 @@ def synthesize_transcript(output_dir: Path) -> str:
 
 def run_agent_turn(agent_id: str, message: str, timeout: int = 120) -> str:
     """
-    Call `openclaw agent --agent <id> --message <msg> --json` and return
-    the agent's text response. Raises on failure.
+    Send one turn to an OpenClaw agent over the configured transport and
+    return the agent's text response. Raises AgentTurnError on failure.
+    """
+    return get_client().run_turn(agent_id, message, timeout)
+
+
+def stream_agent_turn(log: RunLog, agent_id: str, message: str, timeout: int = 120) -> tuple[str, bool]:
     """
-    result = subprocess.run(
-        [
-            "openclaw", "agent",
-            "--agent", agent_id,
-            "--message", message,
-            "--json",
-            "--timeout", str(timeout),
-        ],
-        capture_output=True,
-        text=True,
-        timeout=timeout + 10,
-    )
-
-    if result.returncode != 0:
-        raise RuntimeError(f"openclaw agent exited {result.returncode}: {result.stderr[:200]}")
+    Run one turn, appending the reply to transcript.md as it streams in.
 
+    Stops reading as soon as a complete consensus line has arrived, so the
+    debate doesn't wait out the rest of the generation. Returns
+    (response, stopped_early). Raises AgentTurnError on failure; whatever
+    streamed before the failure stays in the transcript.
+    """
     try:
-        data = json.loads(result.stdout)
-        payloads = data.get("result", {}).get("payloads", [])
-        if not payloads:
-            raise ValueError("No payloads in response")
-        text = payloads[0].get("text", "")
-        aborted = data.get("result", {}).get("meta", {}).get("aborted", False)
-        if aborted:
-            raise RuntimeError(f"Agent turn aborted (timeout or error): {text[:100]}")
-        return text
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"Failed to parse agent JSON response: {e}\nOutput: {result.stdout[:200]}")
+        return get_client().stream_turn(agent_id, message, timeout, log.delta, stop=consensus_line_complete)
+    finally:
+        log.delta("\n")
+        log.end_stream()
 
 
 # ── Debate loop ───────────────────────────────────────────────────────────────
 
-def build_context(task: str, history: list[dict]) -> str:
+def build_context(task: str, history: list[dict], simultaneous: bool = False,
+                  budget: int | None = None) -> str:
     """
     Build the full conversation context to pass to the next agent.
-    Each agent gets: original task + full conversation history so far.
+    Each agent gets: original task + as much recent history verbatim as fits
+    the token budget + a rolling summary of the turns before that.
     """
     lines = [
         f"## Debate Task\n\n{task}\n",
         "## Conversation So Far\n",
     ]
-    recent_history = history[-MAX_HISTORY_TURNS:] if len(history) > MAX_HISTORY_TURNS else history
+    summary, recent_history = CONTEXT.fit([(t["agent"], t["response"]) for t in history], budget)
+    if summary:
+        lines.append(f"{summary}\n")
     if not recent_history:
-        lines.append("_(You are the first to respond.)_\n")
+        lines.append("_(You are the first to respond.)_\n" if not simultaneous
+                     else "_(First round — all agents are answering at the same time.)_\n")
+    else:
+        for agent_id, response in recent_history:
+            lines.append(f"**{agent_id}:** {response}\n")
+
+    if simultaneous:
+        lines.append(
+            f"\n## Your Turn\n\n"
+            f"The other agents are answering this same context at the same time. "
+            f"Respond concisely. If you genuinely agree with the positions in the latest round, "
+            f"write `{CONSENSUS_SIGNAL}` alone on a new line at the end of your message."
+        )
     else:
-        for turn in recent_history:
-            lines.append(f"**{turn['agent']}:** {turn['response']}\n")
-
-    lines.append(
-        f"\n## Your Turn\n\n"
-        f"Respond concisely. If you genuinely agree with the last response, "
-        f"write `{CONSENSUS_SIGNAL}` alone on a new line at the end of your message."
-    )
+        lines.append(
+            f"\n## Your Turn\n\n"
+            f"Respond concisely. If you genuinely agree with the last response, "
+            f"write `{CONSENSUS_SIGNAL}` alone on a new line at the end of your message."
+        )
     return "\n".join(lines)
 
 
-def run_debate(args, output_dir: Path, agent_ids: list[str]) -> dict:
+def signals_consensus(response: str) -> bool:
+    return any(line.strip() == CONSENSUS_SIGNAL for line in response.splitlines())
+
+
+def consensus_line_complete(partial: str) -> bool:
+    """Stop predicate for streamed turns: the consensus line has arrived in full."""
+    return signals_consensus(partial[:partial.rfind("\n") + 1])
+
+
+def run_debate(args, log: RunLog, agent_ids: list[str]) -> dict:
     task = args.task
     history = []
     consensus_reached = False
     rounds = 0
+    early_stops = 0
     final_message = ""
-    deadline = time.time() + args.timeout
+    deadline = run_deadline()
 
-    append_transcript(output_dir, f"# Debate · {args.task_id}\n\n**Task:** {task}\n\n**Agents:** {', '.join(agent_ids)}\n\n---\n")
+    append_transcript(log, f"# Debate · {args.task_id}\n\n**Task:** {task}\n\n**Agents:** {', '.join(agent_ids)}\n\n---\n")
 
     # Round-robin until consensus, max_rounds, or timeout
     agent_cycle = list(agent_ids)
     cycle_idx = 0
 
     while rounds < args.max_rounds:
-        if time.time() > deadline:
+        if deadline is not None and deadline.expired():
             break
 
         agent_id = agent_cycle[cycle_idx % len(agent_cycle)]
         cycle_idx += 1
 
-        context = build_context(task, history)
-        remaining_timeout = max(10, int(deadline - time.time()))
-        per_turn_timeout = min(remaining_timeout, args.turn_timeout)
-
-        append_transcript(output_dir, f"\n### Round {rounds + 1} · {agent_id}\n")
+        context = build_context(task, history, budget=CONTEXT.budget_for(agent_id))
+        append_transcript(log, f"\n### Round {rounds + 1} · {agent_id}\n")
 
         try:
-            response = run_agent_turn(agent_id, context, timeout=per_turn_timeout)
+            # The client clamps the turn to the run deadline and cancels it when that passes
+            response, stopped = stream_agent_turn(log, agent_id, context, timeout=args.turn_timeout)
+        except DeadlineExceeded:
+            append_transcript(log, f"_[run deadline reached during {agent_id}'s turn]_\n")
+            rounds += 1
+            break
         except Exception as e:
-            append_transcript(output_dir, f"_[{agent_id} error: {e}]_\n")
+            append_transcript(log, f"_[{agent_id} error: {e}]_\n")
             rounds += 1
             continue
 
-        append_transcript(output_dir, f"{response}\n")
+        append_transcript(log, "")
         history.append({"agent": agent_id, "response": response})
         final_message = response
         rounds += 1
+        early_stops += stopped
 
         # Update running status
-        write_status(output_dir, "running", {
+        write_status(log, "running", {
             "task_id": args.task_id,
             "rounds_completed": rounds,
+            "early_stops": early_stops,
         })
 
-        if any(line.strip() == CONSENSUS_SIGNAL for line in response.splitlines()):
+        if signals_consensus(response):
             consensus_reached = True
             break
 
@@ -182,27 +223,122 @@ def run_debate(args, output_dir: Path, agent_ids: list[str]) -> dict:
         "consensus_reached": consensus_reached,
         "final_message": final_message,
         "history": history,
+        "early_stops": early_stops,
+    }
+
+
+def run_simultaneous(args, log: RunLog, agent_ids: list[str]) -> dict:
+    """
+    Every agent answers the same context concurrently, once per round.
+
+    Consensus is judged over the whole round: every agent that answered must
+    signal agreement (and at least two must answer, when there are two or
+    more agents). --max-rounds counts rounds, not individual turns.
+    """
+    task = args.task
+    history = []
+    consensus_reached = False
+    rounds = 0
+    final_message = ""
+    round_timings = []
+    deadline = run_deadline()
+    # Every agent gets the same context, so it has to fit the tightest budget
+    budget = min(CONTEXT.budget_for(agent_id) for agent_id in agent_ids)
+
+    append_transcript(log, f"# Debate (simultaneous) · {args.task_id}\n\n**Task:** {task}\n\n**Agents:** {', '.join(agent_ids)}\n\n---\n")
+
+    with ThreadPoolExecutor(max_workers=len(agent_ids)) as executor:
+        while rounds < args.max_rounds:
+            if deadline is not None and deadline.expired():
+                break
+
+            context = build_context(task, history, simultaneous=True, budget=budget)
+            round_started = time.time()
+            futures = {
+                agent_id: executor.submit(run_agent_turn, agent_id, context, args.turn_timeout)
+                for agent_id in agent_ids
+            }
+            responses = {}
+            errors = {}
+            for agent_id, future in futures.items():
+                try:
+                    responses[agent_id] = future.result()
+                except Exception as e:
+                    errors[agent_id] = str(e)
+            round_seconds = time.time() - round_started
+            rounds += 1
+
+            # Write the round in agent order, whatever order the turns finished in
+            append_transcript(log, f"\n## Round {rounds} ({round_seconds:.1f}s)\n")
+            for agent_id in agent_ids:
+                append_transcript(log, f"\n### {agent_id}\n")
+                if agent_id in responses:
+                    append_transcript(log, f"{responses[agent_id]}\n")
+                else:
+                    append_transcript(log, f"_[{agent_id} error: {errors[agent_id]}]_\n")
+
+            for agent_id in agent_ids:
+                if agent_id in responses:
+                    history.append({"agent": agent_id, "response": responses[agent_id]})
+            if responses:
+                final_message = "\n\n".join(
+                    f"**{agent_id}:** {responses[agent_id]}" for agent_id in agent_ids if agent_id in responses
+                )
+
+            agreed = [a for a in responses if signals_consensus(responses[a])]
+            round_timings.append({
+                "round": rounds,
+                "seconds": round(round_seconds, 2),
+                "answered": len(responses),
+                "errors": len(errors),
+                "agreed": len(agreed),
+            })
+            write_status(log, "running", {
+                "task_id": args.task_id,
+                "rounds_completed": rounds,
+                "round_timings": round_timings,
+            })
+
+            if responses and len(agreed) == len(responses) and len(responses) >= min(2, len(agent_ids)):
+                consensus_reached = True
+                break
+
+    return {
+        "rounds": rounds,
+        "consensus_reached": consensus_reached,
+        "final_message": final_message,
+        "history": history,
+        "round_timings": round_timings,
     }
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
-def parse_args():
+def parse_args(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="OpenClaw multi-agent debate runner")
-    parser.add_argument("--mode", choices=["debate"], default="debate")
+    parser.add_argument("--mode", choices=["debate", "simultaneous"], default="debate",
+                        help="debate: one agent per round; simultaneous: all agents answer each round concurrently")
     parser.add_argument("--agents", required=True, help="Comma-separated agent IDs")
     parser.add_argument("--task", required=True, help="Task/question for debate")
     parser.add_argument("--task-id", required=True, dest="task_id")
     parser.add_argument("--output", required=True, help="Output directory path")
-    parser.add_argument("--max-rounds", type=int, default=10, dest="max_rounds")
+    parser.add_argument("--max-rounds", type=int, default=10, dest="max_rounds",
+                        help="Max turns (debate) or max rounds of all agents (simultaneous)")
     parser.add_argument("--timeout", type=int, default=300, help="Total wall-clock timeout (seconds)")
     parser.add_argument("--turn-timeout", type=int, default=60, dest="turn_timeout",
                         help="Per-turn timeout (seconds)")
-    return parser.parse_args()
-
-
-def main():
-    args = parse_args()
+    parser.add_argument("--context-tokens", type=int, default=DEFAULT_CONTEXT_TOKENS, dest="context_tokens",
+                        help="Prompt token budget for the conversation so far, per agent; a persona's "
+                             f"\"context_tokens\" overrides it (default: {DEFAULT_CONTEXT_TOKENS})")
+    add_client_args(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    configure_client(args, PERSONAS_DIR)
+    CONTEXT.default_budget = args.context_tokens
+    CONTEXT.budgets = load_context_budgets(PERSONAS_DIR)
     output_dir = Path(args.output)
 
     # Race condition prevention
@@ -210,20 +346,27 @@ def main():
         print(f"Error: output directory already exists: {output_dir}", file=sys.stderr)
         sys.exit(1)
     output_dir.mkdir(parents=True, exist_ok=False)
+    log = RunLog(output_dir)
 
     agent_ids = [a.strip() for a in args.agents.split(",") if a.strip()]
     started_at = time.time()
 
     # Write initial status immediately
-    write_status(output_dir, "running", {
+    write_status(log, "running", {
         "task_id": args.task_id,
         "agents": agent_ids,
         "started_at": datetime.now(timezone.utc).isoformat(),
     })
 
+    deadline = set_run_deadline(args.timeout)
     try:
-        result = run_debate(args, output_dir, agent_ids)
+        if args.mode == "simultaneous":
+            result = run_simultaneous(args, log, agent_ids)
+        else:
+            result = run_debate(args, log, agent_ids)
         duration = int(time.time() - started_at)
+        run_stats = {k: result[k] for k in ("round_timings", "early_stops") if k in result}
+        run_stats["context"] = CONTEXT.report()
 
         meta = {
             "task_id": args.task_id,
@@ -236,38 +379,44 @@ def main():
 
         timed_out = (not result["consensus_reached"]
                      and result["rounds"] >= args.max_rounds
-                     or time.time() - started_at >= args.timeout)
+                     or (deadline is not None and deadline.expired()))
 
         if result["consensus_reached"]:
-            write_result(output_dir, result["final_message"], meta)
-            write_status(output_dir, "complete", {
+            write_result(log, result["final_message"], meta)
+            write_status(log, "complete", {
                 "task_id": args.task_id,
                 "consensus_reached": True,
                 "rounds": result["rounds"],
                 "duration_seconds": duration,
+                **run_stats,
+                **client_status(),
             })
         elif timed_out:
-            write_result(output_dir, synthesize_transcript(output_dir), meta)
-            write_status(output_dir, "timeout", {
+            write_result(log, synthesize_transcript(log), meta)
+            write_status(log, "timeout", {
                 "task_id": args.task_id,
                 "reason": "Max rounds or wall-clock timeout reached without consensus",
                 "rounds": result["rounds"],
                 "duration_seconds": duration,
+                **run_stats,
+                **client_status(),
             })
         else:
-            write_result(output_dir, synthesize_transcript(output_dir), meta)
-            write_status(output_dir, "complete", {
+            write_result(log, synthesize_transcript(log), meta)
+            write_status(log, "complete", {
                 "task_id": args.task_id,
                 "consensus_reached": False,
                 "rounds": result["rounds"],
                 "duration_seconds": duration,
+                **run_stats,
+                **client_status(),
             })
 
     except Exception as e:
         import traceback
         duration = int(time.time() - started_at)
         tb = traceback.format_exc()
-        write_result(output_dir, f"**Error:** {e}\n\n```\n{tb}\n```", {
+        write_result(log, f"**Error:** {e}\n\n```\n{tb}\n```", {
             "task_id": args.task_id,
             "mode": args.mode,
             "agents": ", ".join(agent_ids),
@@ -275,13 +424,26 @@ def main():
             "consensus_reached": "false",
             "duration_seconds": duration,
         })
-        write_status(output_dir, "error", {
+        write_status(log, "error", {
             "task_id": args.task_id,
             "reason": str(e),
             "duration_seconds": duration,
+            **client_status(),
         })
         sys.exit(1)
+    finally:
+        close_clients()
+        log.close()
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["serve"]:
+        from runner_daemon import serve_main
+        sys.exit(serve_main(sys.argv[2:], main))
+    if sys.argv[1:2] == ["batch"]:
+        from runner_batch import batch_main
+        sys.exit(batch_main(sys.argv[2:], main))
+    if sys.argv[1:2] == ["worker"]:
+        from task_queue import worker_main
+        sys.exit(worker_main(sys.argv[2:], main))
     main()
@@ -0,0 +1,1285 @@
+#!/usr/bin/env python3
+"""
+openclaw_client.py — shared OpenClaw agent-turn client for the collab runners.
+
+One place for "send a message to an OpenClaw agent, get its text back",
+with a pluggable transport:
+
+  cli      — `openclaw agent --agent <id> --message <msg> --json` per turn
+             (default; what the runners always did)
+  worker   — a pool of long-lived worker processes speaking JSON lines on
+             stdin/stdout, so per-turn process startup is paid once
+  gateway  — HTTP straight to the local OpenClaw gateway's OpenAI-compatible
+             /v1/chat/completions endpoint over kept-alive connections
+
+Pick one with `--transport` on the runners or OPENCLAW_TRANSPORT.
+
+OpenClawClient.stream_turn() hands the reply to a callback as text deltas
+arrive and can stop reading once a caller-supplied predicate is satisfied
+(e.g. a consensus marker or a routing directive has been emitted). Only the
+gateway streams for real (server-sent events); the cli and worker
+transports deliver the whole reply as a single delta.
+
+A run deadline (set_run_deadline) bounds every turn: each turn's timeout is
+clamped to the time left, and when the deadline passes a watchdog cancels
+every in-flight turn — CLI children and workers are killed, gateway sockets
+closed — so a timed-out run stops holding gateway capacity. Those turns
+raise DeadlineExceeded.
+
+set_agent_limits() caps concurrent turns per agent with semaphores; passing
+process-shared slots makes the caps hold across forked runs (the runners'
+batch mode uses flock()ed lock files, which a killed run can't leak).
+
+Every agent has a circuit breaker: after --breaker-failures consecutive
+failed turns it opens for --breaker-cooldown seconds, during which the
+agent's turns go to its fallback agent (--fallback AGENT=FALLBACK, or
+"fallback_agent" in its config) or fail fast with AgentUnavailable; then one
+trial turn decides whether it closes again. Agents with a fallback also get
+hedged turns: if the agent hasn't answered after its p95 latency (tracked
+per agent and kept across runs), the same turn goes to the fallback too and
+whichever answers first wins; the other is cancelled. client_status()
+reports per-agent latency, hedge and breaker stats.
+
+Turns can also be served from an opt-in on-disk cache (`--turn-cache`),
+keyed by agent ID, the agent's model from its agents/personas JSON, and a
+hash of the prompt, so re-running a crew, graph or debate with unchanged
+upstream prompts skips those turns. Entries expire after a TTL and the
+least recently used are evicted past a size cap.
+
+Environment:
+  OPENCLAW_TRANSPORT      cli | worker | gateway (default: cli)
+  OPENCLAW_CLI            command for the cli transport (default: openclaw)
+  OPENCLAW_WORKER_CMD     command for each worker process (required for worker)
+  OPENCLAW_WORKERS        worker pool size (default: 4)
+  OPENCLAW_GATEWAY_URL    gateway base URL (default: http://127.0.0.1:18789)
+  OPENCLAW_GATEWAY_TOKEN  bearer token for the gateway, if auth is enabled
+  OPENCLAW_TURN_CACHE     turn cache database path (enables the cache)
+  OPENCLAW_FALLBACKS      fallback agents, AGENT=FALLBACK,... (enables hedging)
+  OPENCLAW_LATENCY_STATS  per-agent latency history for hedging
+                          (default: ~/.openclaw/cache/agent-latency.json)
+
+Worker protocol: one JSON request per line on stdin,
+  {"agent": "<id>", "message": "<text>", "timeout": <seconds>}
+answered by one line on stdout holding the same JSON document that
+`openclaw agent --json` prints, or {"error": "<message>"}.
+
+openclaw_stub.py implements all three transports locally for tests and
+benchmarks. This file is kept identical across autogen-collab,
+crewai-collab and langgraph-collab — change all three together.
+"""
+
+import hashlib
+import http.client
+import json
+import math
+import os
+import queue
+import shlex
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlsplit
+
+DEFAULT_TRANSPORT = "cli"
+DEFAULT_GATEWAY_URL = "http://127.0.0.1:18789"
+TRANSPORTS = ("cli", "worker", "gateway")
+
+DEFAULT_CACHE_PATH = Path.home() / ".openclaw" / "cache" / "collab-turns.sqlite"
+DEFAULT_CACHE_TTL = 7 * 24 * 3600
+DEFAULT_CACHE_MAX_MB = 256
+
+DEFAULT_LATENCY_PATH = Path.home() / ".openclaw" / "cache" / "agent-latency.json"
+LATENCY_WINDOW = 50          # recent successful turns per agent behind its p95
+LATENCY_MIN_SAMPLES = 5      # fewer than this and --hedge-after is used instead
+DEFAULT_HEDGE_AFTER = 30.0
+HEDGE_MIN_DELAY = 1.0
+HEDGE_THREADS = 64
+DEFAULT_BREAKER_FAILURES = 3
+DEFAULT_BREAKER_COOLDOWN = 60.0
+
+
+class AgentTurnError(RuntimeError):
+    """An agent turn failed: non-zero exit, bad response, abort or timeout."""
+
+
+class DeadlineExceeded(AgentTurnError):
+    """The run deadline passed before or during a turn."""
+
+
+class AgentUnavailable(AgentTurnError):
+    """The agent's circuit breaker is open and it has no usable fallback."""
+
+
+class Deadline:
+    """A wall-clock budget for a whole run, shared by every turn in it."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, timeout: int, agent_id: str) -> int:
+        """timeout cut to the time left; raises DeadlineExceeded if none is."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Run deadline ({self.seconds:g}s) passed before {agent_id}'s turn")
+        return max(1, min(timeout, math.ceil(remaining)))
+
+
+# ── Response parsing ──────────────────────────────────────────────────────────
+
+def parse_agent_json(raw: str, agent_id: str) -> str:
+    """Extract the reply text from `openclaw agent --json` output."""
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise AgentTurnError(
+            f"Failed to parse openclaw JSON from agent {agent_id}: {e}\nOutput: {raw[:300]}"
+        )
+    if "error" in data and "result" not in data:
+        raise AgentTurnError(f"openclaw agent {agent_id} failed: {str(data['error'])[:400]}")
+
+    payloads = data.get("result", {}).get("payloads", [])
+    if not payloads:
+        raise AgentTurnError(f"No payloads in openclaw response for agent {agent_id}")
+    text = payloads[0].get("text", "")
+    if data.get("result", {}).get("meta", {}).get("aborted", False):
+        raise AgentTurnError(f"Agent {agent_id} turn aborted (timeout or error): {text[:100]}")
+    return text
+
+
+# ── Transports ────────────────────────────────────────────────────────────────
+
+class Transport:
+    """Sends one turn to one agent. Implementations must be thread-safe."""
+
+    name = "base"
+
+    def run_turn(self, agent_id: str, message: str, timeout: int) -> str:
+        raise NotImplementedError
+
+    def stream_turn(self, agent_id: str, message: str, timeout: int,
+                    on_delta: Callable[[str], None], stop: Callable[[str], bool] | None = None) -> tuple[str, bool]:
+        """
+        Like run_turn, but pass text to on_delta as it arrives.
+
+        Returns (text, stopped): stopped is True if stop(text so far) returned
+        True and the rest of the reply was not read. Transports that can't
+        stream deliver the whole reply as one delta and never stop early.
+        """
+        text = self.run_turn(agent_id, message, timeout)
+        on_delta(text)
+        return text, False
+
+    def cancel(self) -> None:
+        """Abort every in-flight turn; they raise AgentTurnError. Later turns are unaffected."""
+
+    def cancel_thread(self, thread_id: int) -> None:
+        """Abort the turn in flight on thread thread_id, if any (the loser of a hedged turn)."""
+
+    def close(self) -> None:
+        pass
+
+
+class CLITransport(Transport):
+    """A fresh `openclaw agent --json` process per turn."""
+
+    name = "cli"
+
+    def __init__(self, command: list[str] | None = None):
+        self.command = command or shlex.split(os.environ.get("OPENCLAW_CLI", "openclaw"))
+        self._lock = threading.Lock()
+        self._running: set[subprocess.Popen] = set()
+        self._by_thread: dict[int, subprocess.Popen] = {}
+
+    def run_turn(self, agent_id: str, message: str, timeout: int) -> str:
+        proc = subprocess.Popen(
+            self.command + [
+                "agent",
+                "--agent", agent_id,
+                "--message", message,
+                "--json",
+                "--timeout", str(timeout),
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._running.add(proc)
+            self._by_thread[thread_id] = proc
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout + 10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise AgentTurnError(f"openclaw agent --agent {agent_id} timed out after {timeout + 10}s")
+        finally:
+            with self._lock:
+                self._running.discard(proc)
+                self._by_thread.pop(thread_id, None)
+        if proc.returncode != 0:
+            raise AgentTurnError(
+                f"openclaw agent --agent {agent_id} failed (exit {proc.returncode}): "
+                f"{stderr[:200]}"
+            )
+        return parse_agent_json(stdout, agent_id)
+
+    def cancel(self) -> None:
+        with self._lock:
+            running = list(self._running)
+        for proc in running:
+            if proc.poll() is None:
+                proc.kill()
+
+    def cancel_thread(self, thread_id: int) -> None:
+        with self._lock:
+            proc = self._by_thread.get(thread_id)
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+
+
+class _Worker:
+    """One long-lived worker process with a reader thread feeding a line queue."""
+
+    def __init__(self, command: list[str]):
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self.lines: queue.Queue = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self) -> None:
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.lines.put(None)  # EOF
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def kill(self) -> None:
+        if self.alive():
+            self.proc.kill()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+class WorkerPoolTransport(Transport):
+    """
+    A pool of long-lived worker processes (see the module docstring for the protocol).
+
+    Workers start lazily, are reused across turns and threads, and are
+    killed and replaced if a turn times out or the process dies.
+    """
+
+    name = "worker"
+
+    def __init__(self, command: list[str] | None = None, size: int | None = None):
+        if command is None:
+            raw = os.environ.get("OPENCLAW_WORKER_CMD", "")
+            if not raw:
+                raise AgentTurnError(
+                    "The worker transport needs OPENCLAW_WORKER_CMD (a command speaking the "
+                    "JSON-lines worker protocol, e.g. `python3 openclaw_stub.py worker`)"
+                )
+            command = shlex.split(raw)
+        self.command = command
+        self.size = size or int(os.environ.get("OPENCLAW_WORKERS", "4"))
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._all: list[_Worker] = []
+        self._busy: dict[int, _Worker] = {}
+
+    def _acquire(self) -> _Worker:
+        self._slots.acquire()
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = _Worker(self.command)
+                with self._lock:
+                    self._all.append(worker)
+                return worker
+            if worker.alive():
+                return worker
+            worker.kill()
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        if healthy and worker.alive():
+            self._idle.put(worker)
+        else:
+            worker.kill()
+            with self._lock:
+                if worker in self._all:
+                    self._all.remove(worker)
+        self._slots.release()
+
+    def run_turn(self, agent_id: str, message: str, timeout: int) -> str:
+        worker = self._acquire()
+        healthy = False
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._busy[thread_id] = worker
+        try:
+            request = json.dumps({"agent": agent_id, "message": message, "timeout": timeout})
+            try:
+                worker.proc.stdin.write(request + "\n")
+                worker.proc.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                raise AgentTurnError(f"openclaw worker for {agent_id} is gone: {e}")
+            try:
+                line = worker.lines.get(timeout=timeout + 10)
+            except queue.Empty:
+                raise AgentTurnError(f"openclaw worker turn for {agent_id} timed out after {timeout + 10}s")
+            if line is None:
+                raise AgentTurnError(f"openclaw worker for {agent_id} exited mid-turn")
+            healthy = True
+            return parse_agent_json(line, agent_id)
+        finally:
+            with self._lock:
+                self._busy.pop(thread_id, None)
+            self._release(worker, healthy)
+
+    def cancel(self) -> None:
+        # Busy workers see EOF and fail their turn; idle ones are replaced on next use
+        with self._lock:
+            workers = list(self._all)
+        for worker in workers:
+            worker.kill()
+
+    def cancel_thread(self, thread_id: int) -> None:
+        with self._lock:
+            worker = self._busy.get(thread_id)
+        if worker is not None:
+            worker.kill()  # the turn sees EOF; the worker is replaced
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._all = self._all, []
+        for worker in workers:
+            worker.kill()
+
+
+class GatewayTransport(Transport):
+    """
+    Direct HTTP to the gateway's OpenAI-compatible chat endpoint.
+
+    Each thread keeps its own persistent connection, so a turn costs one
+    request on an open socket instead of a process launch.
+    """
+
+    name = "gateway"
+    path = "/v1/chat/completions"
+
+    def __init__(self, url: str | None = None, token: str | None = None):
+        parts = urlsplit(url or os.environ.get("OPENCLAW_GATEWAY_URL", DEFAULT_GATEWAY_URL))
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or (443 if self.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.token = token if token is not None else os.environ.get("OPENCLAW_GATEWAY_TOKEN", "")
+        self._local = threading.local()
+        self._conns: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._cancels = 0  # bumped by cancel(), so a cancelled request isn't retried
+        self._by_thread: dict[int, http.client.HTTPConnection] = {}
+        self._thread_cancels: dict[int, int] = {}  # the same, per thread, for cancel_thread()
+
+    def _connection(self, timeout: int) -> tuple[http.client.HTTPConnection, bool]:
+        """(connection, reused) for this thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        conn = cls(self.host, self.port, timeout=timeout)
+        self._local.conn = conn
+        with self._lock:
+            self._conns.append(conn)
+            self._by_thread[threading.get_ident()] = conn
+        return conn, False
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            with self._lock:
+                self._by_thread.pop(threading.get_ident(), None)
+
+    @staticmethod
+    def _shutdown(conn: http.client.HTTPConnection) -> None:
+        sock = conn.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def request_body(self, agent_id: str, message: str, stream: bool = False) -> bytes:
+        return json.dumps({
+            "model": f"openclaw:{agent_id}",
+            "messages": [{"role": "user", "content": message}],
+            "stream": stream,
+        }).encode("utf-8")
+
+    def headers(self, agent_id: str) -> dict:
+        headers = {"Content-Type": "application/json", "x-openclaw-agent-id": agent_id}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def open(self, agent_id: str, message: str, timeout: int, stream: bool = False) -> http.client.HTTPResponse:
+        """Send the request and return the response (status already checked)."""
+        body = self.request_body(agent_id, message, stream)
+        thread_id = threading.get_ident()
+        cancels = (self._cancels, self._thread_cancels.get(thread_id, 0))
+        for attempt in (1, 2):
+            conn, reused = self._connection(timeout)
+            try:
+                conn.request("POST", self.prefix + self.path, body=body, headers=self.headers(agent_id))
+                response = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                # A kept-alive socket the server already closed: reconnect once
+                self._drop_connection()
+                if (not reused or attempt == 2
+                        or (self._cancels, self._thread_cancels.get(thread_id, 0)) != cancels):
+                    raise AgentTurnError(f"Gateway connection failed for agent {agent_id}: {e}")
+            except TimeoutError:
+                self._drop_connection()
+                raise AgentTurnError(f"Gateway turn for {agent_id} timed out after {timeout}s")
+            except OSError as e:
+                self._drop_connection()
+                raise AgentTurnError(f"Gateway connection failed for agent {agent_id}: {e}")
+
+        if response.status != 200:
+            detail = response.read()[:400].decode("utf-8", "replace")
+            raise AgentTurnError(f"Gateway returned {response.status} for agent {agent_id}: {detail}")
+        return response
+
+    def run_turn(self, agent_id: str, message: str, timeout: int) -> str:
+        response = self.open(agent_id, message, timeout)
+        try:
+            raw = response.read()
+        except (TimeoutError, OSError) as e:
+            self._drop_connection()
+            raise AgentTurnError(f"Gateway turn for {agent_id} failed while reading: {e}")
+        try:
+            data = json.loads(raw)
+            return data["choices"][0]["message"]["content"] or ""
+        except (json.JSONDecodeError, KeyError, IndexError, TypeError) as e:
+            raise AgentTurnError(f"Unexpected gateway response for agent {agent_id}: {e}: {raw[:300]!r}")
+
+    def stream_turn(self, agent_id: str, message: str, timeout: int,
+                    on_delta: Callable[[str], None], stop: Callable[[str], bool] | None = None) -> tuple[str, bool]:
+        response = self.open(agent_id, message, timeout, stream=True)
+        parts: list[str] = []
+        stopped = False
+        try:
+            for raw in response:
+                line = raw.decode("utf-8", "replace").strip()
+                if not line.startswith("data:"):
+                    continue  # blank separators, comments, event: lines
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                    if "error" in chunk:
+                        raise AgentTurnError(f"Gateway stream for agent {agent_id} failed: {str(chunk['error'])[:400]}")
+                    delta = (chunk["choices"][0].get("delta") or {}).get("content") or ""
+                except (json.JSONDecodeError, KeyError, IndexError, TypeError) as e:
+                    raise AgentTurnError(f"Unexpected gateway stream chunk for agent {agent_id}: {e}: {data[:300]!r}")
+                if not delta:
+                    continue
+                parts.append(delta)
+                on_delta(delta)
+                if stop is not None and stop("".join(parts)):
+                    stopped = True
+                    break
+            if not stopped:
+                response.read()  # drain the terminating chunk so the connection can be reused
+        except (TimeoutError, OSError) as e:
+            self._drop_connection()
+            raise AgentTurnError(f"Gateway stream for {agent_id} failed while reading: {e}")
+        finally:
+            if stopped:
+                # Abandon the rest of the generation: closing the socket tells the gateway to stop
+                response.close()
+                self._drop_connection()
+        return "".join(parts), stopped
+
+    def cancel(self) -> None:
+        # Shutting the sockets down unblocks readers and tells the gateway to stop generating
+        with self._lock:
+            self._cancels += 1
+            conns = list(self._conns)
+        for conn in conns:
+            self._shutdown(conn)
+
+    def cancel_thread(self, thread_id: int) -> None:
+        with self._lock:
+            self._thread_cancels[thread_id] = self._thread_cancels.get(thread_id, 0) + 1
+            conn = self._by_thread.get(thread_id)
+        if conn is not None:
+            self._shutdown(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+
+
+def make_transport(name: str | None = None) -> Transport:
+    """Build a transport by name (default: OPENCLAW_TRANSPORT or cli)."""
+    name = name or os.environ.get("OPENCLAW_TRANSPORT", DEFAULT_TRANSPORT)
+    if name == "cli":
+        return CLITransport()
+    if name == "worker":
+        return WorkerPoolTransport()
+    if name == "gateway":
+        return GatewayTransport()
+    raise ValueError(f"Unknown OpenClaw transport: {name!r} (choose from {', '.join(TRANSPORTS)})")
+
+
+# ── Turn cache ────────────────────────────────────────────────────────────────
+
+def load_agent_models(config_dir: Path) -> dict[str, str]:
+    """agent_id → model from agents/ or personas/ JSON configs ("openclaw_model" or "model")."""
+    models = {}
+    for path in Path(config_dir).glob("*.json"):
+        try:
+            cfg = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        agent_id = cfg.get("agent_id") or path.stem
+        models[agent_id] = cfg.get("openclaw_model") or cfg.get("model") or ""
+    return models
+
+
+class TurnCache:
+    """
+    Content-addressed store of agent turn responses in one SQLite file.
+
+    Safe to share between threads and between runner processes. Only
+    successful turns are stored.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_CACHE_TTL,
+                 max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024, models: dict | None = None):
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.models = models or {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS turns ("
+            " key TEXT PRIMARY KEY, agent TEXT, model TEXT,"
+            " created REAL, last_used REAL, size INTEGER, response TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS turns_last_used ON turns(last_used)")
+        self._conn.commit()
+        self.counts = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evicted": 0}
+
+    def key(self, agent_id: str, prompt: str) -> str:
+        model = self.models.get(agent_id, "")
+        return hashlib.sha256(f"{agent_id}\0{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, agent_id: str, prompt: str) -> str | None:
+        key = self.key(agent_id, prompt)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT created, response FROM turns WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.counts["misses"] += 1
+                return None
+            if now - row[0] > self.ttl:
+                self._conn.execute("DELETE FROM turns WHERE key = ?", (key,))
+                self._conn.commit()
+                self.counts["expired"] += 1
+                self.counts["misses"] += 1
+                return None
+            self._conn.execute("UPDATE turns SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.counts["hits"] += 1
+            return row[1]
+
+    def put(self, agent_id: str, prompt: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO turns VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.key(agent_id, prompt), agent_id, self.models.get(agent_id, ""), now, now, size, response),
+            )
+            self.counts["stores"] += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        cur = self._conn.execute("DELETE FROM turns WHERE created < ?", (now - self.ttl,))
+        self.counts["expired"] += cur.rowcount
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM turns").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM turns ORDER BY last_used").fetchall():
+            self._conn.execute("DELETE FROM turns WHERE key = ?", (key,))
+            self.counts["evicted"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM turns").fetchone()
+        return {**self.counts, "entries": entries, "bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ── Agent health ──────────────────────────────────────────────────────────────
+
+def load_agent_fallbacks(config_dir: Path) -> dict[str, str]:
+    """agent_id → fallback agent from agents/ or personas/ JSON configs ("fallback_agent")."""
+    fallbacks = {}
+    for path in Path(config_dir).glob("*.json"):
+        try:
+            cfg = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        if cfg.get("fallback_agent"):
+            fallbacks[cfg.get("agent_id") or path.stem] = cfg["fallback_agent"]
+    return fallbacks
+
+
+def parse_fallbacks(spec: str) -> dict[str, str]:
+    """"sage=vista,forge=sage" → {"sage": "vista", "forge": "sage"}."""
+    fallbacks = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        agent, _, fallback = item.strip().partition("=")
+        if not agent or not fallback or agent == fallback:
+            raise ValueError(f"bad fallback {item!r}; expected AGENT=FALLBACK")
+        fallbacks[agent] = fallback
+    return fallbacks
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class AgentHealth:
+    """
+    Per-agent latency history, hedging policy and circuit breakers, shared by
+    every client in the process. Thread-safe.
+
+    A breaker opens after `breaker_failures` consecutive failed turns (run
+    deadlines and cancelled hedge losers don't count). While open, route()
+    sends the agent's turns to its fallback; after `breaker_cooldown`
+    seconds one trial turn is let through, and its outcome closes the
+    breaker or opens it again.
+    """
+
+    def __init__(self, fallbacks: dict[str, str] | None = None, hedge: bool = True,
+                 hedge_after: float = DEFAULT_HEDGE_AFTER,
+                 breaker_failures: int = DEFAULT_BREAKER_FAILURES,
+                 breaker_cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+                 latency_path: Path | None = None):
+        self.fallbacks = dict(fallbacks or {})
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.breaker_failures = max(1, breaker_failures)
+        self.breaker_cooldown = breaker_cooldown
+        self.latency_path = Path(latency_path) if latency_path else None
+        self._lock = threading.Lock()
+        self._latency: dict[str, deque] = {}
+        self._new_samples: dict[str, list[float]] = {}
+        self._breakers: dict[str, dict] = {}
+        self.stats: dict[str, dict] = {}
+        if self.latency_path is not None:
+            for agent_id, samples in self._read_latency().items():
+                self._latency[agent_id] = deque(samples, maxlen=LATENCY_WINDOW)
+
+    # ── latency and hedging ──────────────────────────────────────────────────
+
+    def p95(self, agent_id: str) -> float | None:
+        with self._lock:
+            samples = self._latency.get(agent_id)
+            return percentile(samples, 95) if samples and len(samples) >= LATENCY_MIN_SAMPLES else None
+
+    def hedge_delay(self, agent_id: str) -> float | None:
+        """Seconds to wait for agent_id before hedging to its fallback, or None to not hedge."""
+        if not self.hedge or agent_id not in self.fallbacks:
+            return None
+        p95 = self.p95(agent_id)
+        return self.hedge_after if p95 is None else max(HEDGE_MIN_DELAY, p95)
+
+    def count(self, agent_id: str, key: str) -> None:
+        with self._lock:
+            self._stats(agent_id)[key] += 1
+
+    def _stats(self, agent_id: str) -> dict:
+        return self.stats.setdefault(agent_id, {
+            "turns": 0, "errors": 0, "hedged": 0, "fallback_won": 0, "rerouted": 0, "breaker_opens": 0,
+        })
+
+    # ── circuit breakers ─────────────────────────────────────────────────────
+
+    def allow(self, agent_id: str) -> bool:
+        """
+        Whether agent_id may take a turn now. An open breaker lets one trial
+        through after the cooldown; the caller must settle it with record()
+        or release(). A trial unsettled for a whole cooldown is replaced.
+        """
+        with self._lock:
+            breaker = self._breakers.get(agent_id)
+            if breaker is None or breaker["state"] == "closed":
+                return True
+            now = time.monotonic()
+            since = breaker["opened"] if breaker["state"] == "open" else breaker["trial"]
+            if now - since >= self.breaker_cooldown:
+                breaker["state"], breaker["trial"] = "half-open", now  # this caller's turn is the trial
+                return True
+            return False
+
+    def closed(self, agent_id: str) -> bool:
+        """Whether agent_id's breaker is closed (unlike allow(), never claims a trial)."""
+        with self._lock:
+            breaker = self._breakers.get(agent_id)
+            return breaker is None or breaker["state"] == "closed"
+
+    def release(self, agent_id: str) -> None:
+        """
+        A turn ended without a verdict on the agent (run deadline, cancelled
+        hedge): if it was the trial, reopen the breaker with its old opened
+        time so the next turn becomes the trial.
+        """
+        with self._lock:
+            breaker = self._breakers.get(agent_id)
+            if breaker is not None and breaker["state"] == "half-open":
+                breaker["state"] = "open"
+
+    def route(self, agent_id: str) -> str:
+        """The agent that should take agent_id's turn. Raises AgentUnavailable."""
+        if self.allow(agent_id):
+            return agent_id
+        fallback = self.fallbacks.get(agent_id)
+        if fallback and self.allow(fallback):
+            self.count(agent_id, "rerouted")
+            return fallback
+        with self._lock:
+            breaker = self._breakers[agent_id]
+            retry = max(0.0, self.breaker_cooldown - (time.monotonic() - breaker["opened"]))
+        raise AgentUnavailable(
+            f"{agent_id} is unavailable after {breaker['failures']} consecutive failed turns "
+            f"(circuit open, next trial in {retry:.0f}s)"
+            + (f"; fallback {fallback} is unavailable too" if fallback else "; no fallback agent configured")
+        )
+
+    def record(self, agent_id: str, seconds: float, ok: bool) -> None:
+        """Record a finished turn: a latency sample if it succeeded, a breaker failure if not."""
+        with self._lock:
+            stats = self._stats(agent_id)
+            stats["turns"] += 1
+            breaker = self._breakers.setdefault(agent_id, {"state": "closed", "failures": 0, "opened": 0.0,
+                                                           "trial": 0.0})
+            if ok:
+                self._latency.setdefault(agent_id, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+                self._new_samples.setdefault(agent_id, []).append(round(seconds, 3))
+                breaker["state"], breaker["failures"] = "closed", 0
+                return
+            stats["errors"] += 1
+            breaker["failures"] += 1
+            if breaker["state"] == "half-open" or (
+                    breaker["state"] == "closed" and breaker["failures"] >= self.breaker_failures):
+                breaker["state"], breaker["opened"] = "open", time.monotonic()
+                stats["breaker_opens"] += 1
+                fallback = self.fallbacks.get(agent_id)
+                print(f"[openclaw-client] circuit open for {agent_id} after {breaker['failures']} failed turns; "
+                      f"{'routing to ' + fallback if fallback else 'failing fast'} for "
+                      f"{self.breaker_cooldown:g}s", file=sys.stderr, flush=True)
+
+    def report(self) -> dict:
+        """status.json view: per-agent turns, errors, p95 latency, hedges and breaker state."""
+        with self._lock:
+            agents = {}
+            for agent_id, stats in self.stats.items():
+                samples = self._latency.get(agent_id)
+                agents[agent_id] = {
+                    **stats,
+                    "p95_seconds": (round(percentile(samples, 95), 2)
+                                    if samples and len(samples) >= LATENCY_MIN_SAMPLES else None),
+                    "breaker": self._breakers.get(agent_id, {}).get("state", "closed"),
+                }
+            return agents
+
+    # ── latency history ──────────────────────────────────────────────────────
+
+    def _read_latency(self) -> dict[str, list[float]]:
+        try:
+            data = json.loads(self.latency_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {k: [float(x) for x in v] for k, v in data.items() if isinstance(v, list)}
+
+    def save(self) -> None:
+        """Merge this process's new latency samples into the history file."""
+        with self._lock:
+            new, self._new_samples = self._new_samples, {}
+        if self.latency_path is None or not new:
+            return
+        try:
+            self.latency_path.parent.mkdir(parents=True, exist_ok=True)
+            history = self._read_latency()
+            for agent_id, samples in new.items():
+                history[agent_id] = (history.get(agent_id, []) + samples)[-LATENCY_WINDOW:]
+            tmp = self.latency_path.with_name(f"{self.latency_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(history))
+            os.replace(tmp, self.latency_path)
+        except OSError:
+            pass  # latency history is best effort
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+class OpenClawClient:
+    """Runs agent turns over a transport and keeps simple per-agent timing stats."""
+
+    def __init__(self, transport: Transport | None = None, cache: TurnCache | None = None):
+        self.transport = transport or make_transport()
+        self.cache = cache
+        self._lock = threading.Lock()
+        self.stats: dict[str, dict] = {}
+
+    def run_turn(self, agent_id: str, message: str, timeout: int = 90) -> str:
+        """Send message to agent_id and return its reply. Raises AgentTurnError."""
+        cache = self.cache or _default_cache
+        if cache is not None:
+            cached = cache.get(agent_id, message)
+            if cached is not None:
+                return cached
+
+        text, _, answered_by = self._serve(agent_id, message, timeout, None, None, stream=False)
+        if cache is not None and answered_by == agent_id:
+            cache.put(agent_id, message, text)
+        return text
+
+    def stream_turn(self, agent_id: str, message: str, timeout: int = 90,
+                    on_delta: Callable[[str], None] | None = None,
+                    stop: Callable[[str], bool] | None = None) -> tuple[str, bool]:
+        """
+        Run a turn, passing text deltas to on_delta as they arrive.
+
+        Returns (text, stopped); see Transport.stream_turn. A cached reply is
+        delivered as one delta. Replies cut short by stop are not cached.
+        """
+        on_delta = on_delta or (lambda delta: None)
+        cache = self.cache or _default_cache
+        if cache is not None:
+            cached = cache.get(agent_id, message)
+            if cached is not None:
+                on_delta(cached)
+                return cached, False
+
+        text, stopped, answered_by = self._serve(agent_id, message, timeout, on_delta, stop, stream=True)
+        if cache is not None and not stopped and answered_by == agent_id:
+            cache.put(agent_id, message, text)
+        return text, stopped
+
+    def _serve(self, agent_id: str, message: str, timeout: int,
+               on_delta: Callable[[str], None] | None, stop: Callable[[str], bool] | None,
+               stream: bool) -> tuple[str, bool, str]:
+        """(text, stopped, answering agent): routes around open breakers and hedges slow agents."""
+        target = _health.route(agent_id)
+        delay = _health.hedge_delay(target) if target == agent_id else None
+        if delay is None:
+            text, stopped = self._attempt(target, message, timeout, on_delta, stop, stream)
+            return text, stopped, target
+        return self._hedged(target, _health.fallbacks[target], delay, message, timeout, on_delta, stop, stream)
+
+    def _attempt(self, agent_id: str, message: str, timeout: int,
+                 on_delta: Callable[[str], None] | None, stop: Callable[[str], bool] | None,
+                 stream: bool, cancelled: threading.Event | None = None) -> tuple[str, bool]:
+        """
+        One turn on the transport, within agent_id's concurrency slot and the
+        run deadline. Every outcome settles agent_id's breaker: a verdict is
+        recorded, anything else releases a trial claimed by route().
+        """
+        deadline = _deadline
+        recorded = False
+        try:
+            with _agent_slot(agent_id, deadline):
+                if cancelled is not None and cancelled.is_set():
+                    raise AgentTurnError(f"hedged turn for {agent_id} cancelled")  # lost while waiting for a slot
+                if deadline is not None:
+                    timeout = deadline.clamp(timeout, agent_id)
+                start = time.monotonic()
+                ok = False
+                try:
+                    if stream:
+                        text, stopped = self.transport.stream_turn(agent_id, message, timeout, on_delta, stop)
+                    else:
+                        text, stopped = self.transport.run_turn(agent_id, message, timeout), False
+                    ok = True
+                except AgentTurnError as e:
+                    error = _deadline_error(deadline, agent_id, e)
+                    # Run deadlines and hedge losers say nothing about the agent's health
+                    if not isinstance(error, DeadlineExceeded) and not (cancelled and cancelled.is_set()):
+                        _health.record(agent_id, time.monotonic() - start, ok=False)
+                        recorded = True
+                    raise error
+                finally:
+                    self._record(agent_id, time.monotonic() - start, ok)
+            _health.record(agent_id, time.monotonic() - start, ok=True)
+            recorded = True
+            return text, stopped
+        finally:
+            if not recorded:
+                _health.release(agent_id)
+
+    def _hedged(self, agent_id: str, fallback: str, delay: float, message: str, timeout: int,
+                on_delta: Callable[[str], None] | None, stop: Callable[[str], bool] | None,
+                stream: bool) -> tuple[str, bool, str]:
+        """
+        Run agent_id's turn; if it hasn't answered within delay seconds, start
+        the same turn on fallback and take whichever answers first. A streamed
+        turn belongs to the first agent to send text: only its deltas reach
+        on_delta. The other turn is cancelled.
+        """
+        on_delta = on_delta or (lambda delta: None)
+        lock = threading.Lock()
+        winner: list[str] = []
+        results: queue.Queue = queue.Queue()
+        racers: dict[str, dict] = {}
+
+        def claim(aid: str) -> bool:
+            with lock:
+                if not winner:
+                    winner.append(aid)
+                return winner[0] == aid
+
+        def start(aid: str) -> None:
+            racer = racers[aid] = {"thread": None, "cancelled": threading.Event()}
+
+            def forward(delta: str) -> None:
+                if claim(aid):
+                    on_delta(delta)
+
+            def run() -> None:
+                racer["thread"] = threading.get_ident()
+                try:
+                    results.put((aid, self._attempt(aid, message, timeout, forward, stop, stream,
+                                                    racer["cancelled"]), None))
+                except Exception as e:
+                    results.put((aid, None, e))
+
+            _hedge_pool().submit(run)
+
+        def cancel_others(aid: str) -> None:
+            for other, racer in racers.items():
+                if other != aid:
+                    racer["cancelled"].set()
+                    if racer["thread"] is not None:
+                        self.transport.cancel_thread(racer["thread"])
+
+        started = time.monotonic()
+        start(agent_id)
+        pending = {agent_id}
+        errors: dict[str, Exception] = {}
+        wait: float | None = delay
+        while pending:
+            try:
+                aid, result, error = results.get(timeout=wait)
+            except queue.Empty:
+                wait = None
+                deadline = _deadline
+                with lock:
+                    answering = bool(winner)
+                # Only hedge to a healthy fallback: a trial turn there would be cancelled half the time
+                if answering or (deadline is not None and deadline.remaining() < 1) or not _health.closed(fallback):
+                    continue
+                _health.count(agent_id, "hedged")
+                start(fallback)
+                pending.add(fallback)
+                continue
+            pending.discard(aid)
+            if error is not None:
+                errors[aid] = error
+                with lock:
+                    owned = bool(winner) and winner[0] == aid
+                if owned or isinstance(error, DeadlineExceeded) or not pending:
+                    cancel_others(aid)
+                    raise error if owned else errors.get(agent_id, error)
+                continue
+            if not claim(aid):
+                continue  # the other agent is already streaming its answer
+            cancel_others(aid)
+            if aid != agent_id:
+                _health.count(agent_id, "fallback_won")
+                print(f"[openclaw-client] {agent_id} slow (hedged after {delay:.1f}s); "
+                      f"{fallback} answered first in {time.monotonic() - started:.1f}s",
+                      file=sys.stderr, flush=True)
+            text, stopped = result
+            return text, stopped, aid
+        raise AgentTurnError(f"hedged turn for {agent_id} ended without an answer")
+
+    def cancel(self) -> None:
+        self.transport.cancel()
+
+    def _record(self, agent_id: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            s = self.stats.setdefault(agent_id, {"turns": 0, "errors": 0, "seconds": 0.0})
+            s["turns"] += 1
+            s["errors"] += 0 if ok else 1
+            s["seconds"] = round(s["seconds"] + seconds, 3)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def _deadline_error(deadline: Deadline | None, agent_id: str, error: AgentTurnError) -> AgentTurnError:
+    """Report a turn that failed because the run deadline cancelled it as DeadlineExceeded."""
+    if deadline is not None and deadline.expired() and not isinstance(error, DeadlineExceeded):
+        exc = DeadlineExceeded(f"Run deadline ({deadline.seconds:g}s) reached during {agent_id}'s turn")
+        exc.__cause__ = error
+        return exc
+    return error
+
+
+@contextmanager
+def _agent_slot(agent_id: str, deadline: Deadline | None):
+    """Hold one of agent_id's concurrent-turn slots, if it has a cap."""
+    slot = _agent_limits.get(agent_id)
+    if slot is None:
+        yield
+        return
+    if not slot.acquire(timeout=None if deadline is None else max(0.0, deadline.remaining())):
+        raise DeadlineExceeded(f"Run deadline ({deadline.seconds:g}s) passed while {agent_id} was at its "
+                               f"concurrency cap")
+    try:
+        yield
+    finally:
+        slot.release()
+
+
+_clients: dict[str, OpenClawClient] = {}
+_clients_lock = threading.Lock()
+_default_cache: TurnCache | None = None
+_deadline: Deadline | None = None
+_watchdog: threading.Timer | None = None
+_agent_limits: dict = {}
+_health = AgentHealth()
+_hedge_executor: ThreadPoolExecutor | None = None
+_hedge_lock = threading.Lock()
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    """Threads for hedged turns, reused so gateway connections stay kept alive."""
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(HEDGE_THREADS, thread_name_prefix="openclaw-hedge")
+        return _hedge_executor
+
+
+def set_agent_health(health: AgentHealth) -> None:
+    """Use health's fallbacks, hedging policy and breakers for every turn from now on."""
+    global _health
+    _health = health
+
+
+def set_turn_cache(cache: TurnCache | None) -> None:
+    """Use cache for every client that wasn't given its own."""
+    global _default_cache
+    _default_cache = cache
+
+
+def get_client(transport: str | None = None) -> OpenClawClient:
+    """Process-wide client for a transport name, created on first use."""
+    name = transport or os.environ.get("OPENCLAW_TRANSPORT", DEFAULT_TRANSPORT)
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = _clients[name] = OpenClawClient(make_transport(name))
+        return client
+
+
+def set_run_deadline(seconds: float | None) -> Deadline | None:
+    """
+    Start the run clock. Every later turn's timeout is clamped to the time
+    left, and when it runs out every in-flight turn is cancelled.
+    """
+    global _deadline, _watchdog
+    if _watchdog is not None:
+        _watchdog.cancel()
+    _deadline = _watchdog = None
+    if seconds and seconds > 0:
+        _deadline = Deadline(seconds)
+        _watchdog = threading.Timer(seconds, cancel_turns)
+        _watchdog.daemon = True
+        _watchdog.start()
+    return _deadline
+
+
+def set_agent_limits(limits: dict) -> None:
+    """
+    Cap concurrent turns per agent: limits maps agent_id → a semaphore, or
+    anything with its acquire(timeout)/release(), that every turn for that
+    agent holds.
+    """
+    global _agent_limits
+    _agent_limits = dict(limits)
+
+
+def run_deadline() -> Deadline | None:
+    return _deadline
+
+
+def cancel_turns() -> None:
+    """Abort every in-flight turn on every client."""
+    with _clients_lock:
+        clients = list(_clients.values())
+    for client in clients:
+        client.cancel()
+
+
+def close_clients() -> None:
+    global _hedge_executor
+    set_run_deadline(None)
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+    with _hedge_lock:
+        executor, _hedge_executor = _hedge_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    _health.save()
+    if _default_cache is not None:
+        _default_cache.close()
+        set_turn_cache(None)
+
+
+# ── Runner wiring ─────────────────────────────────────────────────────────────
+
+def add_client_args(parser) -> None:
+    """Register the shared --transport / --turn-cache / fallback flags on a runner's parser."""
+    parser.add_argument("--transport", choices=TRANSPORTS, default=None,
+                        help="How agent turns reach OpenClaw (default: $OPENCLAW_TRANSPORT or cli)")
+    parser.add_argument("--turn-cache", nargs="?", const=str(DEFAULT_CACHE_PATH), default=None,
+                        dest="turn_cache", metavar="PATH",
+                        help=f"Reuse cached responses for identical agent turns "
+                             f"(default path: {DEFAULT_CACHE_PATH}; or set $OPENCLAW_TURN_CACHE)")
+    parser.add_argument("--turn-cache-ttl", type=float, default=DEFAULT_CACHE_TTL, dest="turn_cache_ttl",
+                        help=f"Seconds a cached turn stays valid (default: {DEFAULT_CACHE_TTL})")
+    parser.add_argument("--turn-cache-max-mb", type=float, default=DEFAULT_CACHE_MAX_MB, dest="turn_cache_max_mb",
+                        help=f"Evict least recently used turns past this size (default: {DEFAULT_CACHE_MAX_MB})")
+    parser.add_argument("--fallback", default=None, metavar="AGENT=FALLBACK,...",
+                        help="Fallback agents for hedged turns and open circuit breakers "
+                             "(adds to \"fallback_agent\" in agent configs and $OPENCLAW_FALLBACKS)")
+    parser.add_argument("--no-hedge", action="store_true", dest="no_hedge",
+                        help="Use fallbacks only while a breaker is open, never to hedge slow turns")
+    parser.add_argument("--hedge-after", type=float, default=DEFAULT_HEDGE_AFTER, dest="hedge_after",
+                        help=f"Seconds before hedging an agent whose p95 latency isn't known yet "
+                             f"(default: {DEFAULT_HEDGE_AFTER:g})")
+    parser.add_argument("--breaker-failures", type=int, default=DEFAULT_BREAKER_FAILURES, dest="breaker_failures",
+                        help=f"Consecutive failed turns that open an agent's circuit breaker "
+                             f"(default: {DEFAULT_BREAKER_FAILURES})")
+    parser.add_argument("--breaker-cooldown", type=float, default=DEFAULT_BREAKER_COOLDOWN, dest="breaker_cooldown",
+                        help=f"Seconds an open breaker routes around the agent before a trial turn "
+                             f"(default: {DEFAULT_BREAKER_COOLDOWN:g})")
+
+
+def configure_client(args, config_dir: Path) -> None:
+    """Apply add_client_args() flags. config_dir holds the agent JSON configs (for cache keys)."""
+    if getattr(args, "transport", None):
+        os.environ["OPENCLAW_TRANSPORT"] = args.transport
+    cache_path = getattr(args, "turn_cache", None) or os.environ.get("OPENCLAW_TURN_CACHE")
+    if cache_path:
+        set_turn_cache(TurnCache(
+            cache_path,
+            ttl=getattr(args, "turn_cache_ttl", DEFAULT_CACHE_TTL),
+            max_bytes=int(getattr(args, "turn_cache_max_mb", DEFAULT_CACHE_MAX_MB) * 1024 * 1024),
+            models=load_agent_models(config_dir),
+        ))
+    fallbacks = load_agent_fallbacks(config_dir)
+    fallbacks.update(parse_fallbacks(os.environ.get("OPENCLAW_FALLBACKS", "")))
+    fallbacks.update(parse_fallbacks(getattr(args, "fallback", None) or ""))
+    latency_path = os.environ.get("OPENCLAW_LATENCY_STATS") or (DEFAULT_LATENCY_PATH if fallbacks else None)
+    set_agent_health(AgentHealth(
+        fallbacks,
+        hedge=not getattr(args, "no_hedge", False),
+        hedge_after=getattr(args, "hedge_after", DEFAULT_HEDGE_AFTER),
+        breaker_failures=getattr(args, "breaker_failures", DEFAULT_BREAKER_FAILURES),
+        breaker_cooldown=getattr(args, "breaker_cooldown", DEFAULT_BREAKER_COOLDOWN),
+        latency_path=latency_path,
+    ))
+
+
+def client_status() -> dict:
+    """Extra status.json fields describing the shared client: per-agent health, cache stats when enabled."""
+    status = {}
+    agents = _health.report()
+    if agents:
+        status["agent_health"] = agents
+    if _default_cache is not None:
+        status["turn_cache"] = _default_cache.stats()
+    return status
+
+
+def run_agent_turn(agent_id: str, message: str, timeout: int = 90, transport: str | None = None) -> str:
+    """Convenience wrapper: one turn on the shared client for `transport`."""
+    return get_client(transport).run_turn(agent_id, message, timeout)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Send one message to an OpenClaw agent")
+    parser.add_argument("--agent", required=True)
+    parser.add_argument("--message", required=True)
+    parser.add_argument("--timeout", type=int, default=90)
+    parser.add_argument("--transport", choices=TRANSPORTS, default=None)
+    args = parser.parse_args()
+    try:
+        print(run_agent_turn(args.agent, args.message, args.timeout, args.transport))
+    except AgentTurnError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        close_clients()
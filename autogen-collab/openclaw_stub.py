@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+openclaw_stub.py — local stand-in for OpenClaw, for tests and benchmarks.
+
+Speaks all three openclaw_client transports without any provider behind it:
+
+  python3 openclaw_stub.py serve --port 18799     # gateway: /v1/chat/completions
+  python3 openclaw_stub.py worker                 # worker: JSON lines on stdin/stdout
+  python3 openclaw_stub.py agent --agent sage --message hi --json
+                                                  # cli: mimics `openclaw agent --json`
+
+Point a runner at it with, e.g.:
+  OPENCLAW_CLI="python3 openclaw_stub.py" ...
+  OPENCLAW_WORKER_CMD="python3 openclaw_stub.py worker" ...
+  OPENCLAW_GATEWAY_URL=http://127.0.0.1:18799 ...
+
+Replies are "<agent> received <N> chars." unless OPENCLAW_STUB_REPLY is set
+(a template with {agent} and {chars}). OPENCLAW_STUB_LATENCY (seconds) adds
+a fixed delay per turn and OPENCLAW_STUB_SLOW (AGENT=SECONDS,...) extra
+delay for particular agents; OPENCLAW_STUB_FAIL lists agent IDs that always fail.
+OPENCLAW_STUB_CHUNK_DELAY (seconds) paces streamed gateway replies, which
+are sent one word per chunk.
+
+  python3 openclaw_stub.py bench [--turns 50]
+
+measures per-turn overhead of each transport against the stub.
+
+This file is kept identical across autogen-collab, crewai-collab and
+langgraph-collab — change all three together.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SKILL_DIR = Path(__file__).resolve().parent
+
+
+def stub_reply(agent_id: str, message: str) -> str:
+    template = os.environ.get("OPENCLAW_STUB_REPLY", "{agent} received {chars} chars.")
+    return template.format(agent=agent_id, chars=len(message))
+
+
+def stub_turn(agent_id: str, message: str) -> tuple[str, bool]:
+    """(reply text, failed) after the configured latency."""
+    latency = float(os.environ.get("OPENCLAW_STUB_LATENCY", "0") or 0)
+    for item in os.environ.get("OPENCLAW_STUB_SLOW", "").split(","):
+        agent, _, seconds = item.strip().partition("=")
+        if agent == agent_id and seconds:
+            latency += float(seconds)
+    if latency:
+        time.sleep(latency)
+    failing = {a.strip() for a in os.environ.get("OPENCLAW_STUB_FAIL", "").split(",") if a.strip()}
+    if agent_id in failing:
+        return f"stub failure for {agent_id}", True
+    return stub_reply(agent_id, message), False
+
+
+def agent_json(text: str, aborted: bool = False) -> dict:
+    """The document `openclaw agent --json` prints."""
+    return {"result": {"payloads": [{"text": text}], "meta": {"aborted": aborted}}}
+
+
+# ── cli ───────────────────────────────────────────────────────────────────────
+
+def cmd_agent(args) -> int:
+    text, failed = stub_turn(args.agent, args.message)
+    if failed:
+        print(text, file=sys.stderr)
+        return 1
+    print(json.dumps(agent_json(text)))
+    return 0
+
+
+# ── worker ────────────────────────────────────────────────────────────────────
+
+def cmd_worker(args) -> int:
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            text, failed = stub_turn(request["agent"], request["message"])
+            response = {"error": text} if failed else agent_json(text)
+        except (json.JSONDecodeError, KeyError) as e:
+            response = {"error": f"bad request: {e}"}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+# ── gateway ───────────────────────────────────────────────────────────────────
+
+class StubGatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real gateway
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+
+        model = body.get("model", "")
+        agent_id = self.headers.get("x-openclaw-agent-id") or model.split(":", 1)[-1]
+        message = "\n\n".join(m.get("content", "") for m in body.get("messages", []))
+        text, failed = stub_turn(agent_id, message)
+        if failed:
+            self._send_json(502, {"error": {"message": text}})
+            return
+
+        if not body.get("stream"):
+            self._send_json(200, {
+                "id": "stub",
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+            })
+            return
+
+        # Server-sent events, one word per chunk
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        words = text.split(" ")
+        chunk_delay = float(os.environ.get("OPENCLAW_STUB_CHUNK_DELAY", "0") or 0)
+        try:
+            for i, word in enumerate(words):
+                if i and chunk_delay:
+                    time.sleep(chunk_delay)
+                delta = word if i == 0 else " " + word
+                chunk = {"object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client stopped reading early
+        self.close_connection = True
+
+
+def start_stub_gateway(port: int = 0) -> ThreadingHTTPServer:
+    """Start the stub gateway on a background thread; port 0 picks a free port."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubGatewayHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def cmd_serve(args) -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubGatewayHandler)
+    server.daemon_threads = True
+    print(f"Stub OpenClaw gateway on http://127.0.0.1:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+def cmd_bench(args) -> int:
+    sys.path.insert(0, str(SKILL_DIR))
+    import openclaw_client as oc
+
+    stub = [sys.executable, str(Path(__file__).resolve())]
+    server = start_stub_gateway()
+    transports = {
+        "cli": lambda: oc.CLITransport(command=stub),
+        "worker": lambda: oc.WorkerPoolTransport(command=stub + ["worker"], size=1),
+        "gateway": lambda: oc.GatewayTransport(url=f"http://127.0.0.1:{server.server_address[1]}"),
+    }
+    message = "x" * args.message_chars
+
+    print(f"Per-turn overhead against the stub ({args.turns} turns, {args.message_chars}-char prompt, "
+          f"stub latency {os.environ.get('OPENCLAW_STUB_LATENCY', '0')}s)\n")
+    print(f"{'transport':<10} {'first ms':>9} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, factory in transports.items():
+        client = oc.OpenClawClient(factory())
+        try:
+            timings = []
+            for _ in range(args.turns + 1):
+                start = time.perf_counter()
+                client.run_turn("bench", message, timeout=30)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            client.close()
+        first, rest = timings[0], sorted(timings[1:])
+        p95 = rest[min(len(rest) - 1, int(len(rest) * 0.95))]
+        print(f"{name:<10} {first:>9.1f} {statistics.mean(rest):>9.2f} "
+              f"{statistics.median(rest):>9.2f} {p95:>9.2f}")
+    server.shutdown()
+    print("\nfirst = includes worker spawn / connection setup; the rest are steady-state turns.")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local OpenClaw stub for tests and benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    agent_p = sub.add_parser("agent", help="Mimic `openclaw agent --json`")
+    agent_p.add_argument("--agent", required=True)
+    agent_p.add_argument("--message", required=True)
+    agent_p.add_argument("--json", action="store_true")
+    agent_p.add_argument("--timeout", type=int, default=90)
+
+    sub.add_parser("worker", help="Serve the JSON-lines worker protocol on stdin/stdout")
+
+    serve_p = sub.add_parser("serve", help="Serve a stub gateway /v1/chat/completions")
+    serve_p.add_argument("--port", type=int, default=18799)
+
+    bench_p = sub.add_parser("bench", help="Benchmark per-turn overhead of each transport")
+    bench_p.add_argument("--turns", type=int, default=50)
+    bench_p.add_argument("--message-chars", type=int, default=4000)
+
+    args = parser.parse_args()
+    return {"agent": cmd_agent, "worker": cmd_worker, "serve": cmd_serve, "bench": cmd_bench}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+runner_daemon.py — keep a collab runner warm and hand it tasks over a Unix socket.
+
+A cold run pays for a fresh interpreter plus the framework imports (LangGraph
+and CrewAI take a second or more) before the first status.json is written. A
+daemon pays that once:
+
+  python3 <runner>.py serve [--socket PATH]          # preload, then wait for tasks
+  python3 runner_daemon.py submit [--socket PATH] -- <runner args>
+
+Each submitted task runs in a child forked from the warm daemon, so tasks are
+isolated from each other (fresh run deadline, clients and context stats) and
+can run concurrently. `submit` behaves like running the runner directly: it
+streams the runner's output (stdout and stderr merged) and exits with its
+exit code, and the task writes the same output directory. The task runs with
+the submitter's working directory and OPENCLAW_* environment. If the client
+goes away the task keeps running; if no daemon is listening, `submit` runs
+the runner cold instead.
+
+  python3 runner_daemon.py bench [--runs 5] -- <runner args without --task-id/--output>
+
+measures cold vs warm task startup (launch until status.json exists) and
+total run time, using a throwaway daemon.
+
+This file is kept identical across autogen-collab, crewai-collab and
+langgraph-collab — change all three together.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Callable
+
+SKILL_DIR = Path(__file__).resolve().parent
+RUNNER = next(SKILL_DIR.glob("*_runner.py"), None)
+DEFAULT_SOCKET = Path.home() / ".openclaw" / "run" / f"{SKILL_DIR.name}.sock"
+EXIT_MARKER = b"\0exit "  # then the exit code and a newline; runners never print NUL
+MAX_REQUEST_BYTES = 1 << 20
+REQUEST_TIMEOUT = 10
+
+
+def socket_path(path: str | None) -> Path:
+    return Path(path or os.environ.get("OPENCLAW_RUNNER_SOCKET") or DEFAULT_SOCKET).expanduser()
+
+
+def task_label(argv: list[str]) -> str:
+    if "--task-id" in argv[:-1]:
+        return argv[argv.index("--task-id") + 1]
+    return "?"
+
+
+# ── Daemon ────────────────────────────────────────────────────────────────────
+
+def _daemon_alive(path: Path) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def _read_request(conn: socket.socket) -> dict:
+    conn.settimeout(REQUEST_TIMEOUT)
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+        if len(data) > MAX_REQUEST_BYTES:
+            raise ValueError("request too large")
+    conn.settimeout(None)
+    request = json.loads(data)
+    if not isinstance(request.get("argv"), list):
+        raise ValueError("request has no argv list")
+    return request
+
+
+def _reap(children: set[int]) -> None:
+    while children:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            children.clear()
+            return
+        if pid == 0:
+            return
+        children.discard(pid)
+
+
+class _OutputRelay:
+    """
+    Points the task's stdout/stderr (fds 1 and 2, so subprocesses too) at a
+    pipe and copies it to the client. Once the client is gone the output is
+    drained and dropped, so printing never fails mid-run.
+    """
+
+    def __init__(self, conn: socket.socket):
+        self.conn = conn
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, 1)
+        os.dup2(write_fd, 2)
+        os.close(write_fd)
+        self._read_fd = read_fd
+        self.connected = True
+        self._thread = threading.Thread(target=self._pump, daemon=True)
+        self._thread.start()
+        sys.stdout.reconfigure(line_buffering=True)
+
+    def _pump(self) -> None:
+        while chunk := os.read(self._read_fd, 65536):
+            if self.connected:
+                try:
+                    self.conn.sendall(chunk)
+                except OSError:
+                    self.connected = False
+
+    def close(self) -> None:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        os.close(devnull)
+        # A leftover subprocess holding the pipe shouldn't hold up the exit code
+        self._thread.join(timeout=5)
+
+
+def run_argv(run: Callable[[list[str]], None], argv: list[str]) -> int:
+    """Call a runner's main(argv) and return the exit code it would have exited with."""
+    try:
+        run(argv)
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+
+
+def _run_task(conn: socket.socket, request: dict, run: Callable[[list[str]], None]) -> None:
+    """Child side of a fork: run one task and report its exit code. Never returns."""
+    code = 1
+    try:
+        os.setsid()  # Ctrl-C / SIGTERM to the daemon leaves running tasks alone
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        os.chdir(request.get("cwd") or "/")
+        for key in [k for k in os.environ if k.startswith("OPENCLAW_")]:
+            del os.environ[key]
+        os.environ.update(request.get("env") or {})
+        argv = [str(a) for a in request["argv"]]
+        sys.argv = [sys.argv[0]] + argv
+
+        relay = _OutputRelay(conn)
+        code = run_argv(run, argv)
+        relay.close()
+        if relay.connected:
+            conn.sendall(EXIT_MARKER + f"{code}\n".encode())
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        os._exit(code)
+
+
+def serve(run: Callable[[list[str]], None], path: Path, preload: Callable[[], None] | None = None) -> int:
+    """
+    Preload, then accept tasks on a Unix socket until SIGTERM/SIGINT. Each
+    task is `run(argv)` in a forked child; children outlive the daemon.
+    """
+    name = SKILL_DIR.name
+    if path.exists():
+        if _daemon_alive(path):
+            print(f"[{name} daemon] already running on {path}", file=sys.stderr)
+            return 1
+        path.unlink()  # stale socket from a daemon that died
+
+    if preload:
+        preload()
+    # Forking a process with threads only carries the forking thread over
+    if threading.active_count() > 1:
+        print(f"[{name} daemon] warning: preload left {threading.active_count() - 1} "
+              f"threads running; they will not exist in tasks", file=sys.stderr)
+
+    # Anyone who can connect can run argv as this user, so the socket must
+    # never exist with looser permissions than 0600, not even briefly.
+    old_umask = os.umask(0o077)
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    server.listen(64)
+    server.settimeout(1.0)
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    print(f"[{name} daemon] ready on {path} (pid {os.getpid()})", file=sys.stderr, flush=True)
+
+    children: set[int] = set()
+    try:
+        while not stopping:
+            _reap(children)
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            except InterruptedError:
+                continue
+            try:
+                request = _read_request(conn)
+            except (OSError, ValueError) as e:
+                print(f"[{name} daemon] bad request: {e}", file=sys.stderr, flush=True)
+                conn.close()
+                continue
+
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                _run_task(conn, request, run)
+            conn.close()
+            children.add(pid)
+            print(f"[{name} daemon] task {task_label(request['argv'])} → pid {pid}", file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        path.unlink(missing_ok=True)
+        _reap(children)
+    print(f"[{name} daemon] stopped ({len(children)} tasks still running)", file=sys.stderr)
+    return 0
+
+
+def serve_main(argv: list[str], run: Callable[[list[str]], None],
+               preload: Callable[[], None] | None = None) -> int:
+    """`<runner>.py serve ...` entry point."""
+    parser = argparse.ArgumentParser(prog=f"{Path(sys.argv[0]).name} serve",
+                                     description=f"Keep the {SKILL_DIR.name} runner warm and run submitted tasks")
+    parser.add_argument("--socket", help=f"Unix socket path (default: $OPENCLAW_RUNNER_SOCKET or {DEFAULT_SOCKET})")
+    args = parser.parse_args(argv)
+    return serve(run, socket_path(args.socket), preload)
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+def submit(argv: list[str], path: Path, out=None) -> int:
+    """Run a task on the daemon, streaming its output; returns its exit code."""
+    out = out or sys.stdout.buffer
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(str(path))
+    except OSError:
+        conn.close()
+        print(f"[runner-daemon] no daemon on {path}; running {RUNNER.name} cold", file=sys.stderr, flush=True)
+        os.execv(sys.executable, [sys.executable, str(RUNNER)] + argv)
+
+    env = {k: v for k, v in os.environ.items() if k.startswith("OPENCLAW_")}
+    conn.sendall(json.dumps({"argv": argv, "cwd": os.getcwd(), "env": env}).encode() + b"\n")
+
+    with conn:
+        tail = b""
+        while chunk := conn.recv(65536):
+            data = tail + chunk
+            marker = data.find(EXIT_MARKER)
+            if marker >= 0:
+                out.write(data[:marker])
+                out.flush()
+                rest = data[marker + len(EXIT_MARKER):]
+                while not rest.endswith(b"\n") and (chunk := conn.recv(64)):
+                    rest += chunk
+                return int(rest.strip() or 1)
+            # Hold back a possible partial marker at the end of the chunk
+            keep = len(EXIT_MARKER) - 1
+            out.write(data[:-keep])
+            out.flush()
+            tail = data[-keep:]
+        out.write(tail)
+    print(f"[runner-daemon] lost the connection to {path} before the task finished", file=sys.stderr)
+    return 1
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def _timed_run(cmd: list[str], status_path: Path) -> tuple[float, float, int]:
+    """(seconds until status.json exists, seconds until exit, exit code)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    startup = None
+    while proc.poll() is None:
+        if startup is None and status_path.exists():
+            startup = time.perf_counter() - start
+        time.sleep(0.002)
+    total = time.perf_counter() - start
+    return (startup if startup is not None else total), total, proc.returncode
+
+
+def bench(runner_args: list[str], runs: int) -> int:
+    workdir = Path(tempfile.mkdtemp(prefix="runner-bench-"))
+    path = workdir / "daemon.sock"
+    python = sys.executable
+
+    daemon_start = time.perf_counter()
+    daemon = subprocess.Popen([python, str(RUNNER), "serve", "--socket", str(path)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    while not _daemon_alive(path):
+        if daemon.poll() is not None:
+            print(f"Daemon exited with {daemon.returncode} during warm-up", file=sys.stderr)
+            return 1
+        time.sleep(0.01)
+    warm_up = time.perf_counter() - daemon_start
+
+    commands = {
+        "cold": [python, str(RUNNER)],
+        "warm": [python, str(Path(__file__).resolve()), "submit", "--socket", str(path), "--"],
+    }
+    results = {mode: [] for mode in commands}
+    try:
+        for i in range(runs):
+            for mode, prefix in commands.items():  # interleaved, so drift hits both
+                output = workdir / f"{mode}-{i}"
+                cmd = prefix + runner_args + ["--task-id", f"bench-{mode}-{i}", "--output", str(output)]
+                startup, total, code = _timed_run(cmd, output / "status.json")
+                if code != 0:
+                    print(f"{mode} run {i} exited {code}; output in {output}", file=sys.stderr)
+                    return 1
+                results[mode].append((startup, total))
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+    print(f"{RUNNER.name}: {runs} runs per mode (daemon warm-up {warm_up * 1000:.0f} ms, paid once)\n")
+    print(f"{'mode':<6} {'startup p50 ms':>15} {'startup min ms':>15} {'total p50 ms':>13}")
+    medians = {}
+    for mode, timings in results.items():
+        startups = [s for s, _ in timings]
+        medians[mode] = statistics.median(startups)
+        print(f"{mode:<6} {medians[mode] * 1000:>15.0f} {min(startups) * 1000:>15.0f} "
+              f"{statistics.median(t for _, t in timings) * 1000:>13.0f}")
+    print(f"\nstartup = launch until status.json exists; warm is {medians['cold'] / medians['warm']:.1f}x faster.")
+    print(f"Outputs: {workdir}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Submit tasks to a warm collab runner daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+    submit_p = sub.add_parser("submit", help="Run a task on the daemon (runner args after --)")
+    submit_p.add_argument("--socket", help=f"Unix socket path (default: $OPENCLAW_RUNNER_SOCKET or {DEFAULT_SOCKET})")
+    submit_p.add_argument("runner_args", nargs=argparse.REMAINDER)
+    bench_p = sub.add_parser("bench", help="Compare cold and warm task startup (runner args after --)")
+    bench_p.add_argument("--runs", type=int, default=5)
+    bench_p.add_argument("runner_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    runner_args = args.runner_args[1:] if args.runner_args[:1] == ["--"] else args.runner_args
+    if args.command == "submit":
+        return submit(runner_args, socket_path(args.socket))
+    return bench(runner_args, args.runs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
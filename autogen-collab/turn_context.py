@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+turn_context.py — token-budgeted conversation context for the collab runners.
+
+Instead of "the last N turns verbatim", a prompt gets as many recent turns
+verbatim as fit the agent's token budget, plus a rolling summary of every
+older turn. The summary is extractive — each older turn contributes its
+opening sentence and any directive lines (NEXT:, METADATA:, ##AGREED##) —
+so it costs no extra agent turn. It is extended incrementally as turns fall
+out of the verbatim window and cached between prompts, so each prompt only
+does work for the turns that are new since the last one.
+
+Token counts are estimated at ~4 characters per token, which is close
+enough for budgeting and needs no tokenizer.
+
+Per-agent budgets come from "context_tokens" in the agent's personas/ or
+agents/ JSON config, falling back to the runner's --context-tokens.
+
+This file is kept identical across autogen-collab and langgraph-collab —
+change both together.
+"""
+
+import json
+import re
+import threading
+from pathlib import Path
+
+DEFAULT_CONTEXT_TOKENS = 3000
+SUMMARY_SHARE = 0.25   # of the budget reserved for the rolling summary
+DIGEST_TOKENS = 60     # per older turn in the summary
+TURN_OVERHEAD_TOKENS = 8  # label and separators around each verbatim turn
+CHARS_PER_TOKEN = 4
+
+DIRECTIVE_RE = re.compile(r"^(NEXT:|METADATA:|##AGREED##)", re.IGNORECASE)
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s")
+
+
+def count_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_tokens(text: str, tokens: int) -> str:
+    """Cut text to about `tokens` tokens at a word boundary."""
+    limit = max(0, tokens) * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip() + " …"
+
+
+def digest(text: str, tokens: int = DIGEST_TOKENS) -> str:
+    """One-line extract of a turn: its opening sentence plus any directive lines."""
+    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+    directives = [line for line in lines if DIRECTIVE_RE.match(line)]
+    prose = [line for line in lines if not DIRECTIVE_RE.match(line) and not line.startswith("#")]
+    opening = SENTENCE_END_RE.split(prose[0], maxsplit=1)[0] if prose else ""
+    parts = [truncate_tokens(opening, tokens)] if opening else []
+    return " ".join(parts + directives)
+
+
+def load_context_budgets(config_dir: Path) -> dict[str, int]:
+    """agent_id → "context_tokens" from the agent JSON configs that set it."""
+    budgets = {}
+    for path in Path(config_dir).glob("*.json"):
+        try:
+            cfg = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        if isinstance(cfg.get("context_tokens"), int) and cfg["context_tokens"] > 0:
+            budgets[cfg.get("agent_id") or path.stem] = cfg["context_tokens"]
+    return budgets
+
+
+class RollingContext:
+    """
+    Fits a conversation history to a token budget.
+
+    History is a list of (label, text) turns, oldest first, that only ever
+    grows; if a call passes a history that doesn't extend the previous one,
+    the summary is rebuilt from scratch. Safe to share between threads.
+    """
+
+    def __init__(self, default_budget: int = DEFAULT_CONTEXT_TOKENS, budgets: dict | None = None,
+                 summary_share: float = SUMMARY_SHARE, digest_tokens: int = DIGEST_TOKENS):
+        self.default_budget = default_budget
+        self.budgets = budgets or {}
+        self.summary_share = summary_share
+        self.digest_tokens = digest_tokens
+        self._lock = threading.Lock()
+        self._tokens: dict[str, int] = {}
+        self._folded: list[tuple[str, str]] = []  # turns already in the summary
+        self._lines: list[tuple[str, str, int]] = []  # (label, "- label: digest", tokens) per folded turn
+        self.stats = {"prompts": 0, "context_tokens": 0, "max_context_tokens": 0,
+                      "summarized_turns": 0, "truncated_turns": 0}
+
+    def budget_for(self, agent_id: str | None) -> int:
+        return self.budgets.get(agent_id, self.default_budget)
+
+    def _count(self, text: str) -> int:
+        n = self._tokens.get(text)
+        if n is None:
+            n = self._tokens[text] = count_tokens(text)
+        return n
+
+    def fit(self, turns: list[tuple[str, str]], budget: int | None = None,
+            max_chars: int | None = None) -> tuple[str, list[tuple[str, str]]]:
+        """
+        Split turns into (summary, recent).
+
+        recent is the longest tail of turns that fits the budget verbatim
+        (the newest turn is kept even if it has to be truncated); summary is
+        a markdown digest of everything older, or "" when nothing is older.
+        max_chars cuts each verbatim turn; pass it here rather than cutting
+        turns beforehand, so callers with different limits share the cached
+        summary (it is always built from the full turns).
+        """
+        budget = budget or self.default_budget
+        with self._lock:
+            summary_budget = int(budget * self.summary_share) if len(turns) > 1 else 0
+            verbatim_budget = budget - summary_budget
+
+            recent: list[tuple[str, str]] = []
+            used = 0
+            truncated = 0
+            for label, text in reversed(turns):
+                if max_chars:
+                    text = text[:max_chars]
+                cost = self._count(text) + TURN_OVERHEAD_TOKENS
+                if used + cost > verbatim_budget:
+                    if not recent:
+                        recent.append((label, truncate_tokens(text, verbatim_budget - TURN_OVERHEAD_TOKENS)))
+                        used = verbatim_budget
+                        truncated = 1
+                    break
+                recent.append((label, text))
+                used += cost
+            recent.reverse()
+
+            older = turns[:len(turns) - len(recent)]
+            # Whatever the verbatim window didn't use is available to the summary
+            summary = self._summary(older, summary_budget + verbatim_budget - used)
+
+            total = used + count_tokens(summary)
+            self.stats["prompts"] += 1
+            self.stats["context_tokens"] += total
+            self.stats["max_context_tokens"] = max(self.stats["max_context_tokens"], total)
+            self.stats["summarized_turns"] = max(self.stats["summarized_turns"], len(older))
+            self.stats["truncated_turns"] += truncated
+            return summary, recent
+
+    def _summary(self, older: list[tuple[str, str]], budget: int) -> str:
+        if not older:
+            return ""
+        # Reuse the cached digests while older and the folded turns share a prefix
+        # (a smaller budget elsewhere may have folded more turns than this call needs)
+        n = min(len(self._folded), len(older))
+        if n and self._folded[n - 1] != older[n - 1]:
+            self._folded, self._lines = [], []
+        for label, text in older[len(self._folded):]:
+            line = f"- {label}: {digest(text, self.digest_tokens)}"
+            self._folded.append((label, text))
+            self._lines.append((label, line, count_tokens(line)))
+
+        # Newest digests first until the budget runs out, leaving room for the
+        # header and the omitted-turns note
+        header = "_Summary of earlier turns:_"
+        kept: list[str] = []
+        used = count_tokens(header) + 24
+        for _, line, tokens in reversed(self._lines[:len(older)]):
+            if used + tokens > budget:
+                break
+            kept.append(line)
+            used += tokens
+        omitted = len(older) - len(kept)
+        if omitted:
+            labels = sorted({label for label, _, _ in self._lines[:omitted]})
+            header += f"\n- _({omitted} earliest turns by {', '.join(labels)} omitted)_"
+        return header + "\n" + "\n".join(reversed(kept))
+
+    def report(self) -> dict:
+        """Context-size stats for status.json."""
+        with self._lock:
+            prompts = self.stats["prompts"]
+            return {
+                "prompts": prompts,
+                "avg_context_tokens": round(self.stats["context_tokens"] / prompts) if prompts else 0,
+                "max_context_tokens": self.stats["max_context_tokens"],
+                "summarized_turns": self.stats["summarized_turns"],
+                "truncated_turns": self.stats["truncated_turns"],
+            }
@@ -2,7 +2,8 @@
 """
 crewai_runner.py — CrewAI-powered structured task runner for OpenClaw.
 
-All LLM calls route through `openclaw agent --json` via OpenClawLLM.
+All LLM calls route through OpenClaw via OpenClawLLM (`openclaw agent --json`
+by default; --transport selects another openclaw_client transport).
 No API keys needed — uses existing OpenClaw provider configuration.
 
 Usage:
@@ -20,11 +21,25 @@ Process types:
   sequential   — agents work in order, each task assigned round-robin
   hierarchical — CrewAI manager agent coordinates workers
   consensus    — sequential with consensus instruction appended to each task
+
+--timeout is a run deadline: each LLM call's timeout is clamped to the time
+left, in-flight calls are cancelled when it passes, and the run ends with
+status "timeout" and whatever tasks had finished as a partial result.
+
+Daemon mode: `python3 crewai_runner.py serve` imports CrewAI once and keeps a
+warm runner on a Unix socket; `python3 runner_daemon.py submit -- <args above>`
+runs a task on it with the same output contract (see runner_daemon.py).
+Batch mode: `python3 crewai_runner.py batch tasks.jsonl --concurrency 8` runs
+a JSONL file of tasks from one warm process (see runner_batch.py). Queue
+mode: `python3 crewai_runner.py worker` runs tasks queued with task_queue.py.
 """
 
 import argparse
+import contextlib
+import io
 import json
 import sys
+import threading
 import time
 import traceback
 from datetime import datetime, timezone
@@ -43,28 +58,30 @@ if _venv_lib.exists():
 if str(SKILL_DIR) not in sys.path:
     sys.path.insert(0, str(SKILL_DIR))
 
+from openclaw_client import (
+    DeadlineExceeded, add_client_args, client_status, close_clients, configure_client,
+    run_deadline, set_run_deadline,
+)
+from run_log import RunLog
+
 
 # ── Output helpers ────────────────────────────────────────────────────────────
 
-def write_status(output_dir: Path, status: str, extra: dict = None):
-    """Write status.json to output_dir. Always called, even on error."""
-    data = {"status": status, "updated_at": datetime.now(timezone.utc).isoformat()}
-    if extra:
-        data.update(extra)
-    (output_dir / "status.json").write_text(json.dumps(data, indent=2))
+# All three files are rendered from the run's event log (see run_log.py).
 
+def write_status(log: RunLog, status: str, extra: dict = None):
+    """Record a status (status.json). Always called, even on error."""
+    log.status(status, extra)
 
-def append_transcript(output_dir: Path, text: str):
-    """Append text to transcript.md (creates if missing)."""
-    with open(output_dir / "transcript.md", "a", encoding="utf-8") as f:
-        f.write(text + "\n")
-        f.flush()
 
+def append_transcript(log: RunLog, text: str):
+    """Append text to transcript.md."""
+    log.transcript(text + "\n")
 
-def write_result(output_dir: Path, content: str, meta: dict):
+
+def write_result(log: RunLog, content: str, meta: dict):
     """Write result.md with YAML-style frontmatter."""
-    fm = "\n".join(f"{k}: {v}" for k, v in meta.items())
-    (output_dir / "result.md").write_text(f"---\n{fm}\n---\n\n{content}\n")
+    log.result(content, meta)
 
 
 # ── Agent config ──────────────────────────────────────────────────────────────
@@ -80,6 +97,24 @@ def load_agent_config(agent_id: str) -> dict:
     return json.loads(path.read_text())
 
 
+def refresh_agent_configs() -> None:
+    """Rebuild agent configs whose SOUL.md changed (best-effort, failures ignored)."""
+    try:
+        import build_agents
+        with contextlib.redirect_stdout(io.StringIO()):
+            for agent_id in build_agents.AGENT_DIRS:
+                build_agents.build_agent(agent_id)
+    except Exception:
+        pass
+
+
+def preload() -> None:
+    """Daemon warm-up: import CrewAI and the LLM bridge, refresh agent configs."""
+    import crewai  # noqa: F401
+    import openclaw_llm  # noqa: F401
+    refresh_agent_configs()
+
+
 # ── Task parsing ──────────────────────────────────────────────────────────────
 
 def parse_task_spec(spec: str) -> dict:
@@ -100,19 +135,70 @@ def parse_task_spec(spec: str) -> dict:
     }
 
 
+# Seconds kickoff() gets past the deadline to unwind from its cancelled call
+KICKOFF_GRACE = 5
+
+
+class CrewTimeout(DeadlineExceeded):
+    """The run deadline passed mid-crew; carries the finished task outputs."""
+
+    def __init__(self, message: str, partial: list[tuple[str, str]]):
+        super().__init__(message)
+        self.partial = partial
+
+
+def completed_outputs(tasks: list, specs: list) -> list[tuple[str, str]]:
+    """(title, raw output) for every task that finished."""
+    done = []
+    for task, spec in zip(tasks, specs):
+        output = getattr(task, "output", None)
+        raw = getattr(output, "raw", None) if output is not None else None
+        if raw:
+            done.append((spec["title"], raw))
+    return done
+
+
+def kickoff_with_deadline(crew, tasks: list, specs: list):
+    """
+    crew.kickoff(), bounded by the run deadline. Runs on a daemon thread so
+    the runner can return on time even if CrewAI retries or swallows the
+    DeadlineExceeded its LLM calls raise once the time is up.
+    """
+    deadline = run_deadline()
+    if deadline is None:
+        return crew.kickoff()
+
+    outcome = {}
+
+    def _kickoff():
+        try:
+            outcome["result"] = crew.kickoff()
+        except BaseException as exc:
+            outcome["error"] = exc
+
+    thread = threading.Thread(target=_kickoff, name="crew-kickoff", daemon=True)
+    thread.start()
+    thread.join(max(0.0, deadline.remaining()) + KICKOFF_GRACE)
+
+    if "result" in outcome:
+        return outcome["result"]
+    error = outcome.get("error")
+    if thread.is_alive() or deadline.expired():
+        raise CrewTimeout(
+            f"Run deadline ({deadline.seconds:g}s) reached" + (f": {error}" if error else ""),
+            completed_outputs(tasks, specs),
+        )
+    raise error
+
+
 # ── Crew runner ───────────────────────────────────────────────────────────────
 
-def run_crew(args, output_dir: Path, agent_ids: list, task_specs: list) -> dict:
+def run_crew(args, log: RunLog, agent_ids: list, task_specs: list) -> dict:
     """Build and run a CrewAI crew. Returns dict with result text and metadata."""
     from crewai import Agent, Task, Crew, Process
     from openclaw_llm import OpenClawLLM
 
-    # Auto-rebuild stale agent configs (best-effort, ignore failures)
-    import subprocess
-    subprocess.run(
-        [sys.executable, str(SKILL_DIR / "build_agents.py")],
-        capture_output=True,
-    )
+    refresh_agent_configs()
 
     # ── Build CrewAI agents ───────────────────────────────────────────────────
     crewai_agents = []
@@ -129,7 +215,7 @@ def run_crew(args, output_dir: Path, agent_ids: list, task_specs: list) -> dict:
         )
         crewai_agents.append(agent)
         append_transcript(
-            output_dir,
+            log,
             f"## Agent: {cfg['name']} ({agent_id}) — {cfg['role']}\n"
         )
 
@@ -157,14 +243,14 @@ def run_crew(args, output_dir: Path, agent_ids: list, task_specs: list) -> dict:
         )
         tasks.append(task)
         append_transcript(
-            output_dir,
+            log,
             f"### Task {i+1}: {spec['title']}\n"
             f"**Agent:** {assigned_agent.role}\n"
             f"**Expected:** {spec['expected_output']}\n"
         )
 
     append_transcript(
-        output_dir,
+        log,
         f"\n## Process: {args.process}\n**Tasks:** {len(tasks)}\n\n---\n"
     )
 
@@ -206,14 +292,14 @@ def run_crew(args, output_dir: Path, agent_ids: list, task_specs: list) -> dict:
         )
 
     # ── Kick off ──────────────────────────────────────────────────────────────
-    crew_result = crew.kickoff()
+    crew_result = kickoff_with_deadline(crew, tasks, task_specs)
 
     # CrewOutput has .raw (str); fall back to str() for safety
     result_text = crew_result.raw if hasattr(crew_result, "raw") else str(crew_result)
     if not result_text.strip():
         result_text = "_(No output produced by crew.)_"
 
-    append_transcript(output_dir, f"\n## Final Result\n\n{result_text}\n")
+    append_transcript(log, f"\n## Final Result\n\n{result_text}\n")
 
     return {
         "result":  result_text,
@@ -224,7 +310,7 @@ def run_crew(args, output_dir: Path, agent_ids: list, task_specs: list) -> dict:
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
 
-def parse_args():
+def parse_args(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(
         description=(
             "CrewAI structured task runner for OpenClaw.\n"
@@ -279,7 +365,7 @@ def parse_args():
         required=True,
         help=(
             "Output directory path. MUST NOT already exist (race condition guard). "
-            "Files written: status.json, result.md, transcript.md"
+            "Files written: events.jsonl, status.json, result.md, transcript.md"
         ),
     )
     parser.add_argument(
@@ -293,13 +379,17 @@ def parse_args():
         "--timeout",
         type=int,
         default=300,
-        help="Overall crew timeout in seconds (default: 300). Not yet enforced internally.",
+        help="Run deadline in seconds (default: 300). LLM calls are clamped to the "
+             "time left and cancelled when it passes.",
     )
-    return parser.parse_args()
+    # --transport, --turn-cache and friends; see openclaw_client.py
+    add_client_args(parser)
+    return parser.parse_args(argv)
 
 
-def main():
-    args = parse_args()
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    configure_client(args, AGENTS_DIR)
     output_dir = Path(args.output).expanduser().resolve()
 
     # ── Race condition guard ──────────────────────────────────────────────────
@@ -316,13 +406,15 @@ def main():
     except OSError as e:
         print(f"Error: could not create output directory {output_dir}: {e}", file=sys.stderr)
         sys.exit(1)
+    log = RunLog(output_dir)
 
     agent_ids  = [a.strip() for a in args.agents.split(",") if a.strip()]
     task_specs = [parse_task_spec(t) for t in args.tasks]
     started_at = time.time()
+    set_run_deadline(args.timeout)
 
     # Write initial status immediately (before any LLM calls)
-    write_status(output_dir, "running", {
+    write_status(log, "running", {
         "task_id":    args.task_id,
         "process":    args.process,
         "agents":     agent_ids,
@@ -331,7 +423,7 @@ def main():
     })
 
     append_transcript(
-        output_dir,
+        log,
         f"# CrewAI Run: {args.task_id}\n"
         f"**Started:** {datetime.now(timezone.utc).isoformat()}\n"
         f"**Process:** {args.process}\n"
@@ -339,7 +431,7 @@ def main():
     )
 
     try:
-        result   = run_crew(args, output_dir, agent_ids, task_specs)
+        result   = run_crew(args, log, agent_ids, task_specs)
         duration = int(time.time() - started_at)
 
         meta = {
@@ -350,21 +442,48 @@ def main():
             "duration_seconds": duration,
             "status":           "complete",
         }
-        write_result(output_dir, result["result"], meta)
-        write_status(output_dir, "complete", {
+        write_result(log, result["result"], meta)
+        write_status(log, "complete", {
             "task_id":          args.task_id,
             "duration_seconds": duration,
+            **client_status(),
         })
 
         print(f"✅ Done in {duration}s → {output_dir}")
 
+    except CrewTimeout as e:
+        duration = int(time.time() - started_at)
+        sections = [f"### {title}\n\n{raw}" for title, raw in e.partial]
+        partial = "\n\n".join(sections) if sections else "_(No task finished before the deadline.)_"
+        write_result(log, f"**Note: {e}**\n\nPartial results:\n\n{partial}", {
+            "task_id":          args.task_id,
+            "process":          args.process,
+            "agents":           ", ".join(agent_ids),
+            "tasks":            len(task_specs),
+            "tasks_completed":  len(e.partial),
+            "duration_seconds": duration,
+            "status":           "timeout",
+        })
+        write_status(log, "timeout", {
+            "task_id":          args.task_id,
+            "reason":           str(e),
+            "tasks_completed":  len(e.partial),
+            "duration_seconds": duration,
+            **client_status(),
+        })
+        append_transcript(log, f"\n## TIMEOUT\n\n{e}\n")
+
+        print(f"⏱ Timed out after {duration}s: {e}", file=sys.stderr)
+        print(f"   Output: {output_dir}", file=sys.stderr)
+        sys.exit(1)
+
     except Exception as e:
         duration = int(time.time() - started_at)
         tb = traceback.format_exc()
         error_content = f"**Error:** {e}\n\n```\n{tb}\n```"
 
         # Graceful degradation: ALWAYS write all 3 output files even on error
-        write_result(output_dir, error_content, {
+        write_result(log, error_content, {
             "task_id":          args.task_id,
             "process":          args.process,
             "agents":           ", ".join(agent_ids),
@@ -372,17 +491,30 @@ def main():
             "duration_seconds": duration,
             "status":           "error",
         })
-        write_status(output_dir, "error", {
+        write_status(log, "error", {
             "task_id":          args.task_id,
             "reason":           str(e),
             "duration_seconds": duration,
+            **client_status(),
         })
-        append_transcript(output_dir, f"\n## ERROR\n\n```\n{tb}\n```\n")
+        append_transcript(log, f"\n## ERROR\n\n```\n{tb}\n```\n")
 
         print(f"❌ Error after {duration}s: {e}", file=sys.stderr)
         print(f"   Output: {output_dir}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        close_clients()
+        log.close()
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["serve"]:
+        from runner_daemon import serve_main
+        sys.exit(serve_main(sys.argv[2:], main, preload))
+    if sys.argv[1:2] == ["batch"]:
+        from runner_batch import batch_main
+        sys.exit(batch_main(sys.argv[2:], main, preload))
+    if sys.argv[1:2] == ["worker"]:
+        from task_queue import worker_main
+        sys.exit(worker_main(sys.argv[2:], main, preload))
     main()
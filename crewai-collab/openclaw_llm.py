@@ -2,53 +2,21 @@
 """
 openclaw_llm.py — CrewAI LLM bridge to OpenClaw gateway.
 
-Routes all LLM calls through `openclaw agent --agent <id> --json`
-so no API keys are needed in this skill.
+Routes all LLM calls through OpenClaw (by default `openclaw agent --agent
+<id> --json`; see openclaw_client.py for the other transports) so no API
+keys are needed in this skill.
 """
 
-import json
-import subprocess
 from typing import Any, Optional
 
 from crewai.llms.base_llm import BaseLLM
 
+from openclaw_client import get_client
 
-def run_openclaw_agent(agent_id: str, message: str, timeout: int = 90) -> str:
-    """Call openclaw agent and return the text response."""
-    result = subprocess.run(
-        [
-            "openclaw", "agent",
-            "--agent", agent_id,
-            "--message", message,
-            "--json",
-            "--timeout", str(timeout),
-        ],
-        capture_output=True,
-        text=True,
-        timeout=timeout + 10,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"openclaw agent --agent {agent_id} failed (exit {result.returncode}): "
-            f"{result.stderr[:200]}"
-        )
-    try:
-        data = json.loads(result.stdout)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(
-            f"Failed to parse openclaw JSON: {e}\nOutput: {result.stdout[:300]}"
-        )
 
-    payloads = data.get("result", {}).get("payloads", [])
-    if not payloads:
-        raise RuntimeError(
-            f"No payloads in openclaw response for agent {agent_id}"
-        )
-    text = payloads[0].get("text", "")
-    aborted = data.get("result", {}).get("meta", {}).get("aborted", False)
-    if aborted:
-        raise RuntimeError(f"Agent {agent_id} turn aborted: {text[:100]}")
-    return text
+def run_openclaw_agent(agent_id: str, message: str, timeout: int = 90) -> str:
+    """Run one agent turn over the configured transport and return the text response."""
+    return get_client().run_turn(agent_id, message, timeout)
 
 
 def extract_prompt_from_messages(messages: "str | list") -> str:
@@ -84,7 +52,7 @@ class OpenClawLLM(BaseLLM):
 
     Subclasses BaseLLM (the abstract base crewai expects) and implements
     the required ``call()`` method, forwarding prompts to the given OpenClaw
-    agent via the ``openclaw agent --json`` CLI.
+    agent via openclaw_client (the ``openclaw agent --json`` CLI by default).
 
     Usage::
 
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+runner_batch.py — run a JSONL file of collab tasks from one warm process.
+
+  python3 <runner>.py batch tasks.jsonl [--concurrency 4] [--agent-cap sage=2,*=3]
+                                        [--output-root DIR] [--summary PATH]
+                                        [-- <runner args for every task>]
+
+Each line is one task, written as the runner's flags with JSON keys
+(underscores or dashes), e.g. for the debate runner:
+
+  {"task_id": "d-001", "task": "Pick a queue", "agents": ["sage", "forge"], "mode": "debate"}
+
+"agents" may be a list or a comma-separated string; other lists become
+repeated values (crewai's "tasks"), objects are passed as JSON (langgraph's
+"metadata"), true is a bare flag and false/null are left out. "output"
+defaults to <output-root>/<task_id>. Arguments after `--` go to every task;
+a task's own keys override them.
+
+The runner's frameworks are imported (and agent configs refreshed) once;
+each task then runs in a child forked from that warm process, at most
+--concurrency at a time, and writes its usual output directory. Tasks are
+forked rather than threaded because the runners keep per-run state — run
+deadline, clients, context stats — at module level.
+
+--agent-cap bounds concurrent turns per agent across all running tasks
+("*" caps every agent not listed): with sage=2, at most two sage turns are
+in flight however many tasks include sage. A turn waiting for a slot is
+still bounded by its task's --timeout. Slots are flock()ed lock files under
+the log dir, so a task killed mid-turn (SIGKILL, OOM) gives its slot back.
+
+When the batch ends a summary (throughput, statuses, task duration
+percentiles, failures with reasons) is printed and, with --summary, written
+as JSON. Each task's console output goes to <log-dir>/<n>-<task_id>.log.
+Exits 1 if any task failed.
+
+This file is kept identical across autogen-collab, crewai-collab and
+langgraph-collab — change all three together.
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Callable
+
+from openclaw_client import set_agent_limits
+from runner_daemon import run_argv
+
+DEFAULT_CONCURRENCY = 4
+# Agents a task can talk to besides its "agents": supervisors/synthesizers/managers
+EXTRA_AGENT_KEYS = ("supervisor", "synthesizer")
+DEFAULT_EXTRA_AGENTS = ("main",)
+
+
+class BatchTask:
+    def __init__(self, index: int, record: dict, argv: list[str]):
+        self.index = index
+        self.record = record
+        self.task_id = str(record["task_id"])
+        self.output = Path(record["output"]).expanduser()
+        self.argv = argv
+        agents = record.get("agents") or []
+        if isinstance(agents, str):
+            agents = agents.split(",")
+        self.agents = {a.strip() for a in agents if a.strip()}
+        self.agents.update(str(record[k]) for k in EXTRA_AGENT_KEYS if record.get(k))
+
+    def run(self, run: Callable[[list[str]], None]) -> int:
+        """Run the task in this process with the runner's main; returns its exit code."""
+        sys.argv = [sys.argv[0]] + self.argv
+        return run_argv(run, self.argv)
+
+
+def task_argv(record: dict) -> list[str]:
+    """Runner argv for one JSONL record."""
+    argv = []
+    for key, value in record.items():
+        flag = "--" + key.replace("_", "-")
+        if value is None or value is False:
+            continue
+        if value is True:
+            argv.append(flag)
+        elif isinstance(value, list):
+            values = [str(v) for v in value]
+            argv += [flag, ",".join(values)] if key == "agents" else [flag, *values]
+        elif isinstance(value, dict):
+            argv += [flag, json.dumps(value)]
+        else:
+            argv += [flag, str(value)]
+    return argv
+
+
+def load_tasks(path: Path, output_root: Path | None, common: list[str]) -> tuple[list[BatchTask], list[dict]]:
+    """(runnable tasks, results for lines that couldn't be turned into a task)"""
+    tasks, invalid = [], []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict) or not record.get("task_id"):
+                    raise ValueError("each line must be a JSON object with a task_id")
+                record = {k.replace("-", "_"): v for k, v in record.items()}
+                if not record.get("output"):
+                    if output_root is None:
+                        raise ValueError("no \"output\" and no --output-root")
+                    record["output"] = str(output_root / str(record["task_id"]))
+                tasks.append(BatchTask(len(tasks), record, common + task_argv(record)))
+            except ValueError as e:  # includes JSONDecodeError
+                invalid.append({"task_id": f"line {lineno}", "status": "invalid", "exit_code": None,
+                                "seconds": 0.0, "reason": str(e)})
+    return tasks, invalid
+
+
+def parse_caps(specs: list[str]) -> dict[str, int]:
+    caps = {}
+    for spec in specs:
+        for item in spec.split(","):
+            agent, _, n = item.strip().partition("=")
+            if not agent or not n.isdigit() or int(n) < 1:
+                raise ValueError(f"bad --agent-cap {item!r}; expected AGENT=N with N >= 1")
+            caps[agent] = int(n)
+    return caps
+
+
+class FileSlots:
+    """
+    n concurrent-turn slots for one agent, shared by every process: each slot
+    is a lock file held with flock(). Same acquire()/release() interface as a
+    semaphore, but the kernel drops a dead holder's lock, so a task that is
+    killed mid-turn can't leak its slot.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, lock_dir: Path, agent: str, n: int):
+        self.paths = [lock_dir / f"{agent}.{i}.lock" for i in range(n)]
+        for path in self.paths:
+            path.touch()
+        self._held = threading.local()  # fds this thread holds, one per nested acquire
+
+    def _fds(self) -> list[int]:
+        if not hasattr(self._held, "fds"):
+            self._held.fds = []
+        return self._held.fds
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            for path in self.paths:
+                fd = os.open(path, os.O_RDWR)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    os.close(fd)
+                    continue
+                self._fds().append(fd)
+                return True
+            if end is None:
+                time.sleep(self.POLL_INTERVAL)
+                continue
+            left = end - time.monotonic()
+            if left <= 0:
+                return False
+            time.sleep(min(self.POLL_INTERVAL, left))
+
+    def release(self) -> None:
+        fd = self._fds().pop()
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def agent_slots(caps: dict[str, int], tasks: list[BatchTask], lock_dir: Path) -> dict:
+    """One process-shared FileSlots per capped agent; "*" expands to every agent seen."""
+    default = caps.get("*")
+    agents = set(caps) - {"*"}
+    if default:
+        agents.update(DEFAULT_EXTRA_AGENTS)
+        for task in tasks:
+            agents.update(task.agents)
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    return {agent: FileSlots(lock_dir, agent, caps.get(agent, default)) for agent in sorted(agents)}
+
+
+# ── Running ───────────────────────────────────────────────────────────────────
+
+def start_task(child: Callable[[], int], log_path: Path) -> int:
+    """Fork; the child sends its output to log_path and exits with child()'s return value."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 1
+    try:
+        fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.dup2(fd, 1)
+        os.dup2(fd, 2)
+        os.close(fd)
+        code = child()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(code)
+
+
+def _last_line(path: Path) -> str:
+    try:
+        lines = [line for line in path.read_text(errors="replace").splitlines() if line.strip()]
+    except OSError:
+        return ""
+    return lines[-1].strip()[:300] if lines else ""
+
+
+def task_result(task: BatchTask, exit_code: int, seconds: float, log_path: Path) -> dict:
+    try:
+        status = json.loads((task.output / "status.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        status = {}
+    state = status.get("status") or ("complete" if exit_code == 0 else "error")
+    result = {"task_id": task.task_id, "status": state, "exit_code": exit_code,
+              "seconds": round(seconds, 2), "output": str(task.output)}
+    if exit_code != 0 or state != "complete":
+        result["reason"] = status.get("reason") or status.get("message") or _last_line(log_path)
+        result["log"] = str(log_path)
+    return result
+
+
+def run_batch(run: Callable[[list[str]], None], tasks: list[BatchTask], concurrency: int,
+              log_dir: Path) -> tuple[list[dict], int]:
+    """Run tasks in forked children; returns (results, peak concurrency)."""
+    pending = deque(tasks)
+    running: dict[int, tuple[BatchTask, float, Path]] = {}
+    results = []
+    peak = 0
+    interrupted = False
+    while running or (pending and not interrupted):
+        while pending and not interrupted and len(running) < concurrency:
+            task = pending.popleft()
+            safe_id = re.sub(r"[^\w.-]", "_", task.task_id)
+            log_path = log_dir / f"{task.index + 1:04d}-{safe_id}.log"
+            running[start_task(lambda: task.run(run), log_path)] = (task, time.monotonic(), log_path)
+            peak = max(peak, len(running))
+        try:
+            pid, wait_status = os.wait()
+        except KeyboardInterrupt:
+            # Children got the same SIGINT; collect them, start nothing new
+            interrupted = True
+            continue
+        task, started, log_path = running.pop(pid)
+        result = task_result(task, os.waitstatus_to_exitcode(wait_status), time.monotonic() - started, log_path)
+        results.append(result)
+        print(f"[batch] {result['status']:<8} {task.task_id} ({result['seconds']:.1f}s)", file=sys.stderr, flush=True)
+    for task in pending:
+        results.append({"task_id": task.task_id, "status": "skipped", "exit_code": None, "seconds": 0.0,
+                        "reason": "batch interrupted"})
+    return results, peak
+
+
+# ── Summary ───────────────────────────────────────────────────────────────────
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct))]
+
+
+def summarize(results: list[dict], wall_seconds: float, concurrency: int, peak: int) -> dict:
+    durations = sorted(r["seconds"] for r in results if r["exit_code"] is not None)
+    failures = [r for r in results if r["exit_code"] != 0]
+    summary = {
+        "tasks": len(results),
+        "succeeded": len(results) - len(failures),
+        "failed": len(failures),
+        "statuses": dict(Counter(r["status"] for r in results)),
+        "wall_seconds": round(wall_seconds, 2),
+        "tasks_per_minute": round(len(durations) / wall_seconds * 60, 2) if wall_seconds else 0.0,
+        "concurrency": concurrency,
+        "peak_concurrency": peak,
+        "failures": failures,
+        "results": results,
+    }
+    if durations:
+        summary["task_seconds"] = {
+            "mean": round(statistics.mean(durations), 2),
+            "p50": round(statistics.median(durations), 2),
+            "p95": round(percentile(durations, 0.95), 2),
+            "max": round(durations[-1], 2),
+        }
+    return summary
+
+
+def print_summary(summary: dict, log_dir: Path) -> None:
+    statuses = ", ".join(f"{k} {v}" for k, v in sorted(summary["statuses"].items()))
+    print(f"\nBatch: {summary['tasks']} tasks in {summary['wall_seconds']:.1f}s "
+          f"({summary['tasks_per_minute']:.1f}/min, concurrency {summary['concurrency']}, "
+          f"peak {summary['peak_concurrency']})")
+    print(f"  statuses: {statuses}")
+    if "task_seconds" in summary:
+        t = summary["task_seconds"]
+        print(f"  task time: mean {t['mean']:.1f}s, p50 {t['p50']:.1f}s, p95 {t['p95']:.1f}s, max {t['max']:.1f}s")
+    if summary["failures"]:
+        print(f"  failed ({summary['failed']}):")
+        for r in summary["failures"]:
+            print(f"    {r['task_id']}: {r['status']} (exit {r['exit_code']}) — {r.get('reason') or 'no reason recorded'}")
+    print(f"  logs: {log_dir}")
+
+
+def batch_main(argv: list[str], run: Callable[[list[str]], None],
+               preload: Callable[[], None] | None = None) -> int:
+    """`<runner>.py batch ...` entry point."""
+    parser = argparse.ArgumentParser(prog=f"{Path(sys.argv[0]).name} batch",
+                                     description="Run a JSONL file of tasks from one warm process")
+    parser.add_argument("tasks_file", help="JSONL file, one task per line")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Tasks running at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--agent-cap", action="append", default=[], metavar="AGENT=N[,...]",
+                        help="Max concurrent turns for an agent across all tasks; '*' for every other agent")
+    parser.add_argument("--output-root", help="Output directory parent for tasks without \"output\"")
+    parser.add_argument("--summary", help="Also write the summary as JSON here")
+    parser.add_argument("--log-dir", help="Where per-task console logs go (default: a new temp dir)")
+    # Everything after "--" is runner args for every task
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    common = argv[split + 1:]
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    output_root = Path(args.output_root).expanduser() if args.output_root else None
+    try:
+        tasks, invalid = load_tasks(Path(args.tasks_file), output_root, common)
+        caps = parse_caps(args.agent_cap)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    log_dir = Path(args.log_dir).expanduser() if args.log_dir else Path(tempfile.mkdtemp(prefix="collab-batch-"))
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    if preload:
+        preload()
+    set_agent_limits(agent_slots(caps, tasks, log_dir / "agent-slots"))
+
+    start = time.monotonic()
+    results, peak = run_batch(run, tasks, args.concurrency, log_dir)
+    summary = summarize(invalid + results, time.monotonic() - start, args.concurrency, peak)
+    print_summary(summary, log_dir)
+    if args.summary:
+        Path(args.summary).expanduser().write_text(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+task_queue.py — durable task queue for collab runs, drained by worker processes.
+
+  python3 task_queue.py enqueue tasks.jsonl [--queue URL] [--max-attempts 3]
+  python3 <runner>.py worker [--queue URL] [--concurrency 4] [--drain] [-- <runner args>]
+  python3 task_queue.py status [--queue URL]
+
+Task lines use the batch format (see runner_batch.py); "output" is resolved
+against the enqueuer's working directory, so any worker writes to the same
+place. Tasks are queued per skill — a langgraph-collab worker only takes
+langgraph-collab tasks — and any number of workers can drain the same queue.
+
+A worker leases a task (marking it taken until lease_expires), forks the
+warm runner for it and writes the usual status.json / result.md /
+transcript.md. The forked task heartbeats its own lease, so the lease lives
+exactly as long as the run does: if the task or its host dies, heartbeats
+stop, the lease expires after --lease seconds, and the next worker to poll
+retries it. A retry moves the dead attempt's output directory aside to
+<output>.attempt-<n>. A task whose lease is abandoned --max-attempts times is
+marked failed. Runs that finish — complete, timeout or error — are final;
+only abandoned leases are retried.
+
+Backends are pluggable: open_queue() picks one by URL scheme. SQLite
+(`sqlite:///path` or a bare path; default ~/.openclaw/queue/collab-tasks.sqlite
+or $OPENCLAW_TASK_QUEUE) covers any number of workers on one host; SQLite
+locking is not safe over network filesystems, so for several hosts subclass
+TaskQueue for a networked store and register_backend() it.
+
+This file is kept identical across autogen-collab, crewai-collab and
+langgraph-collab — change all three together.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from runner_batch import BatchTask, load_tasks, start_task, task_argv, task_result
+
+SKILL_DIR = Path(__file__).resolve().parent
+DEFAULT_QUEUE_PATH = Path.home() / ".openclaw" / "queue" / "collab-tasks.sqlite"
+DEFAULT_LEASE = 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+POLL_INTERVAL = 1.0
+LEASE_LOST_EXIT = 75  # a forked task exits with this when another worker took its lease
+
+
+@dataclass
+class Lease:
+    runner: str
+    task_id: str
+    token: str
+    attempt: int
+    record: dict
+
+
+class TaskQueue:
+    """
+    Backend interface. Every state change after lease() is fenced by the
+    lease token, so a worker that lost its lease can't overwrite the
+    attempt that replaced it.
+    """
+
+    def enqueue(self, runner: str, task_id: str, record: dict, max_attempts: int) -> bool:
+        """Add a task; False if runner already has one with this task_id."""
+        raise NotImplementedError
+
+    def lease(self, runner: str, owner: str, seconds: float) -> Lease | None:
+        """Take the oldest queued or abandoned task for runner, or None."""
+        raise NotImplementedError
+
+    def heartbeat(self, lease: Lease, seconds: float) -> bool:
+        """Extend the lease; False if it is no longer ours."""
+        raise NotImplementedError
+
+    def finish(self, lease: Lease, result: dict) -> bool:
+        """Record a finished run (runner_batch.task_result) as final."""
+        raise NotImplementedError
+
+    def abandon(self, lease: Lease) -> None:
+        """Give the lease up now, so the task is retried without waiting for expiry."""
+        raise NotImplementedError
+
+    def counts(self) -> dict[str, dict[str, int]]:
+        """runner → state → number of tasks."""
+        raise NotImplementedError
+
+    def problems(self, limit: int = 20) -> list[dict]:
+        """Failed and currently leased tasks, newest first."""
+        raise NotImplementedError
+
+
+class SQLiteQueue(TaskQueue):
+    """TaskQueue in one SQLite file (WAL). Fork-safe: each process opens its own connection."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn_pid = None
+        self._conn_obj = None
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn().executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    runner        TEXT NOT NULL,
+                    task_id       TEXT NOT NULL,
+                    record        TEXT NOT NULL,
+                    state         TEXT NOT NULL,      -- queued | leased | done | failed
+                    attempts      INTEGER NOT NULL DEFAULT 0,
+                    max_attempts  INTEGER NOT NULL,
+                    lease_owner   TEXT,
+                    lease_token   TEXT,
+                    lease_expires REAL,
+                    enqueued_at   REAL NOT NULL,
+                    updated_at    REAL NOT NULL,
+                    exit_code     INTEGER,
+                    status        TEXT,
+                    error         TEXT,
+                    PRIMARY KEY (runner, task_id)
+                );
+                CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (runner, state, enqueued_at);
+            """)
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._conn_pid != os.getpid():
+            # Never use a connection inherited across fork()
+            self._conn_obj = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                             check_same_thread=False)
+            self._conn_obj.execute("PRAGMA journal_mode=WAL")
+            self._conn_obj.execute("PRAGMA synchronous=NORMAL")
+            self._conn_pid = os.getpid()
+        return self._conn_obj
+
+    def enqueue(self, runner, task_id, record, max_attempts):
+        now = time.time()
+        with self._lock:
+            cur = self._conn().execute(
+                "INSERT OR IGNORE INTO tasks (runner, task_id, record, state, max_attempts, enqueued_at, updated_at)"
+                " VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (runner, task_id, json.dumps(record), max_attempts, now, now),
+            )
+            return cur.rowcount == 1
+
+    def lease(self, runner, owner, seconds):
+        now = time.time()
+        with self._lock:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "UPDATE tasks SET state = 'failed', lease_token = NULL, updated_at = ?,"
+                    " error = 'lease abandoned ' || attempts || ' times'"
+                    " WHERE runner = ? AND state = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                    (now, runner, now),
+                )
+                row = conn.execute(
+                    "SELECT task_id, record, attempts FROM tasks"
+                    " WHERE runner = ? AND (state = 'queued' OR (state = 'leased' AND lease_expires < ?))"
+                    " ORDER BY enqueued_at, rowid LIMIT 1",
+                    (runner, now),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                token = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE tasks SET state = 'leased', attempts = attempts + 1, lease_owner = ?,"
+                    " lease_token = ?, lease_expires = ?, updated_at = ? WHERE runner = ? AND task_id = ?",
+                    (owner, token, now + seconds, now, runner, row[0]),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return Lease(runner, row[0], token, row[2] + 1, json.loads(row[1]))
+
+    def _fenced(self, lease: Lease, assignments: str, params: tuple) -> bool:
+        with self._lock:
+            cur = self._conn().execute(
+                f"UPDATE tasks SET {assignments}, updated_at = ?"
+                " WHERE runner = ? AND task_id = ? AND lease_token = ? AND state = 'leased'",
+                params + (time.time(), lease.runner, lease.task_id, lease.token),
+            )
+            return cur.rowcount == 1
+
+    def heartbeat(self, lease, seconds):
+        return self._fenced(lease, "lease_expires = ?", (time.time() + seconds,))
+
+    def finish(self, lease, result):
+        state = "done" if result["exit_code"] == 0 else "failed"
+        return self._fenced(lease, "state = ?, lease_token = NULL, exit_code = ?, status = ?, error = ?",
+                            (state, result["exit_code"], result["status"], result.get("reason")))
+
+    def abandon(self, lease):
+        self._fenced(lease, "lease_expires = 0", ())
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn().execute("SELECT runner, state, COUNT(*) FROM tasks GROUP BY runner, state").fetchall()
+        counts: dict[str, dict[str, int]] = {}
+        for runner, state, n in rows:
+            counts.setdefault(runner, {})[state] = n
+        return counts
+
+    def problems(self, limit=20):
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT runner, task_id, state, attempts, lease_owner, lease_expires, error FROM tasks"
+                " WHERE state IN ('leased', 'failed') ORDER BY updated_at DESC LIMIT ?", (limit,),
+            ).fetchall()
+        keys = ("runner", "task_id", "state", "attempts", "lease_owner", "lease_expires", "error")
+        return [dict(zip(keys, row)) for row in rows]
+
+
+BACKENDS: dict[str, Callable[[str], TaskQueue]] = {
+    "sqlite": lambda url: SQLiteQueue(url.split("://", 1)[1]),
+}
+
+
+def register_backend(scheme: str, factory: Callable[[str], TaskQueue]) -> None:
+    """Make open_queue() hand URLs with this scheme to factory(url)."""
+    BACKENDS[scheme] = factory
+
+
+def open_queue(url: str | None = None) -> TaskQueue:
+    url = url or os.environ.get("OPENCLAW_TASK_QUEUE") or str(DEFAULT_QUEUE_PATH)
+    if "://" not in url:
+        return SQLiteQueue(url)
+    scheme = url.split("://", 1)[0]
+    if scheme not in BACKENDS:
+        raise ValueError(f"No task queue backend for {scheme!r} (have: {', '.join(sorted(BACKENDS))})")
+    return BACKENDS[scheme](url)
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+def _run_leased(run: Callable[[list[str]], None], queue: TaskQueue, lease: Lease, task: BatchTask,
+                log_path: Path, lease_seconds: float) -> int:
+    """Fork the task; the child heartbeats its own lease and records its own result."""
+
+    def child() -> int:
+        interrupted = []
+
+        def on_signal(signum, frame):
+            interrupted.append(signum)
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGINT, on_signal)
+        signal.signal(signal.SIGTERM, on_signal)
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(lease_seconds / 3):
+                if not queue.heartbeat(lease, lease_seconds):
+                    print(f"[worker] lost the lease on {lease.task_id}; another worker has it", file=sys.stderr)
+                    sys.stderr.flush()
+                    os._exit(LEASE_LOST_EXIT)
+
+        threading.Thread(target=beat, daemon=True).start()
+        code = task.run(run)
+        stop.set()
+        if interrupted:
+            queue.abandon(lease)  # stopped, not finished: let another worker retry it
+        else:
+            queue.finish(lease, task_result(task, code, time.monotonic() - started, log_path))
+        return code
+
+    started = time.monotonic()
+    return start_task(child, log_path)
+
+
+def _set_aside(output: Path, attempt: int) -> None:
+    """Move a dead attempt's output directory out of the way of the retry."""
+    if output.exists():
+        output.rename(output.with_name(f"{output.name}.attempt-{attempt - 1}"))
+
+
+def _drained(queue: TaskQueue, runner: str) -> bool:
+    """Nothing left that could still need running: no queued tasks, no live or abandoned leases."""
+    counts = queue.counts().get(runner, {})
+    return not counts.get("queued") and not counts.get("leased")
+
+
+def work(run: Callable[[list[str]], None], queue: TaskQueue, runner: str, common: list[str],
+         concurrency: int, lease_seconds: float, log_dir: Path, drain: bool) -> int:
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    running: dict[int, tuple[Lease, BatchTask]] = {}
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    done = failed = 0
+    print(f"[worker {owner}] {runner} tasks, concurrency {concurrency}, lease {lease_seconds:g}s",
+          file=sys.stderr, flush=True)
+
+    try:
+        while True:
+            while running:
+                pid, wait_status = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                lease, task = running.pop(pid)
+                code = os.waitstatus_to_exitcode(wait_status)
+                if code < 0:
+                    queue.abandon(lease)  # killed before it could record anything
+                if code == 0:
+                    done += 1
+                else:
+                    failed += 1
+                print(f"[worker {owner}] {task.task_id} attempt {lease.attempt} exited {code}",
+                      file=sys.stderr, flush=True)
+
+            leased = False
+            if not stopping and len(running) < concurrency:
+                lease = queue.lease(runner, owner, lease_seconds)
+                if lease is not None:
+                    leased = True
+                    record = dict(lease.record)
+                    task = BatchTask(0, record, common + task_argv(record))
+                    if lease.attempt > 1:
+                        _set_aside(task.output, lease.attempt)
+                    log_path = log_dir / f"{task.task_id}.attempt-{lease.attempt}.log"
+                    running[_run_leased(run, queue, lease, task, log_path, lease_seconds)] = (lease, task)
+                    print(f"[worker {owner}] {task.task_id} attempt {lease.attempt} started",
+                          file=sys.stderr, flush=True)
+            if not running and (stopping or (drain and not leased and _drained(queue, runner))):
+                break
+            if not leased:
+                time.sleep(0.05 if running else POLL_INTERVAL)
+    except KeyboardInterrupt:
+        # Ctrl-C reached the forked tasks too; they give their leases back
+        while running:
+            try:
+                running.pop(os.wait()[0], None)
+            except ChildProcessError:
+                break
+    print(f"[worker {owner}] stopped: {done} finished, {failed} failed", file=sys.stderr, flush=True)
+    return 0
+
+
+def worker_main(argv: list[str], run: Callable[[list[str]], None],
+                preload: Callable[[], None] | None = None) -> int:
+    """`<runner>.py worker ...` entry point."""
+    parser = argparse.ArgumentParser(prog=f"{Path(sys.argv[0]).name} worker",
+                                     description=f"Run queued {SKILL_DIR.name} tasks")
+    parser.add_argument("--queue", help=f"Queue URL or SQLite path (default: $OPENCLAW_TASK_QUEUE or "
+                                         f"{DEFAULT_QUEUE_PATH})")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tasks this worker runs at once (default: 4)")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE,
+                        help=f"Lease length in seconds; heartbeats renew it every third (default: {DEFAULT_LEASE:g})")
+    parser.add_argument("--drain", action="store_true",
+                        help="Exit once no task for this runner is queued or leased")
+    parser.add_argument("--log-dir", help="Where per-task console logs go (default: a new temp dir)")
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    queue = open_queue(args.queue)
+    log_dir = Path(args.log_dir).expanduser() if args.log_dir else Path(tempfile.mkdtemp(prefix="collab-worker-"))
+    log_dir.mkdir(parents=True, exist_ok=True)
+    if preload:
+        preload()
+    return work(run, queue, SKILL_DIR.name, argv[split + 1:], args.concurrency, args.lease, log_dir, args.drain)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def cmd_enqueue(args) -> int:
+    output_root = Path(args.output_root).expanduser().resolve() if args.output_root else None
+    try:
+        tasks, invalid = load_tasks(Path(args.tasks_file), output_root, [])
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    queue = open_queue(args.queue)
+    added = duplicates = 0
+    for task in tasks:
+        record = dict(task.record)
+        record["output"] = str(task.output.resolve())
+        if queue.enqueue(args.runner, task.task_id, record, args.max_attempts):
+            added += 1
+        else:
+            duplicates += 1
+            print(f"  skipped {task.task_id}: already queued", file=sys.stderr)
+    for bad in invalid:
+        print(f"  skipped {bad['task_id']}: {bad['reason']}", file=sys.stderr)
+    print(f"Queued {added} {args.runner} tasks ({duplicates} duplicates, {len(invalid)} invalid)")
+    return 1 if invalid else 0
+
+
+def cmd_status(args) -> int:
+    queue = open_queue(args.queue)
+    states = ("queued", "leased", "done", "failed")
+    print(f"{'runner':<18}" + "".join(f"{s:>8}" for s in states))
+    for runner, counts in sorted(queue.counts().items()):
+        print(f"{runner:<18}" + "".join(f"{counts.get(s, 0):>8}" for s in states))
+    now = time.time()
+    for p in queue.problems():
+        if p["state"] == "leased":
+            left = p["lease_expires"] - now
+            detail = f"{p['lease_owner']}, lease {'expired' if left < 0 else f'{left:.0f}s left'}"
+        else:
+            detail = p["error"] or "failed"
+        print(f"  {p['state']:<7} {p['runner']}/{p['task_id']} (attempt {p['attempts']}): {detail}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Durable task queue for the collab runners")
+    parser.add_argument("--queue", help=f"Queue URL or SQLite path (default: $OPENCLAW_TASK_QUEUE or "
+                                        f"{DEFAULT_QUEUE_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enqueue_p = sub.add_parser("enqueue", help="Queue the tasks in a JSONL file (runner_batch.py format)")
+    enqueue_p.add_argument("tasks_file")
+    enqueue_p.add_argument("--runner", default=SKILL_DIR.name, help=f"Skill whose workers run them "
+                                                                    f"(default: {SKILL_DIR.name})")
+    enqueue_p.add_argument("--output-root", help="Output directory parent for tasks without \"output\"")
+    enqueue_p.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                           help=f"Leases a task may abandon before it is failed (default: {DEFAULT_MAX_ATTEMPTS})")
+    sub.add_parser("status", help="Task counts per runner and state, leased and failed tasks")
+    args = parser.parse_args()
+    return {"enqueue": cmd_enqueue, "status": cmd_status}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
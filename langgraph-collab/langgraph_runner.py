@@ -3,9 +3,19 @@
 langgraph_runner.py — Stateful multi-agent graph runner using LangGraph.
 
 Topologies: linear, supervisor, parallel, conditional
-Routes all LLM calls through `openclaw agent --agent <id> --json`.
+Routes all LLM calls through OpenClaw (`openclaw agent --agent <id> --json` by
+default; --transport selects another openclaw_client transport).
 No API keys needed — uses existing OpenClaw provider configuration.
 
+Sequential nodes stream replies into transcript.md as they arrive (gateway
+transport); supervisor turns stop reading once their `NEXT:` line is complete.
+With --supervisor-plan the supervisor plans several steps per turn (including
+parallel ones) and is consulted again only at the plan's end or when a step
+is blocked.
+
+Each run is checkpointed to SQLite under its --task-id; after an error or
+timeout, rerunning with --resume continues from the last completed node.
+
 Usage:
   python3 langgraph_runner.py \\
     --topology linear \\
@@ -16,16 +26,25 @@ Usage:
     --max-steps 5 \\
     --turn-timeout 90 \\
     --timeout 300
+
+Daemon mode: `python3 langgraph_runner.py serve` keeps a warm runner (LangGraph
+already imported) on a Unix socket; `python3 runner_daemon.py submit -- <args>`
+runs a task on it with the same output contract (see runner_daemon.py).
+Batch mode: `python3 langgraph_runner.py batch tasks.jsonl --concurrency 8`
+runs a JSONL file of tasks from one warm process (see runner_batch.py).
+Queue mode: `python3 langgraph_runner.py worker` runs tasks queued with
+task_queue.py.
 """
 
 import argparse
 import json
+import os
 import re
-import signal
-import subprocess
+import sqlite3
 import sys
 import time
 import traceback
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Annotated, List, TypedDict
@@ -33,12 +52,25 @@ from typing import Annotated, List, TypedDict
 import operator
 
 # LangGraph imports
-from langgraph.graph import END, StateGraph
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import END, START, StateGraph
+
+from openclaw_client import (
+    DeadlineExceeded, add_client_args, client_status, close_clients, configure_client, get_client,
+    run_deadline, set_run_deadline,
+)
+from run_log import RunLog
+from turn_context import DEFAULT_CONTEXT_TOKENS, RollingContext, load_context_budgets
 
 SKILL_DIR = Path(__file__).parent
 AGENTS_DIR = SKILL_DIR / "agents"
 
-MAX_HISTORY_TURNS = 6  # cap message history to prevent context overflow
+# Recent messages verbatim + rolling summary of older ones, within each agent's token budget
+CONTEXT = RollingContext()
+
+DEFAULT_CHECKPOINT_DB = Path(os.environ.get(
+    "OPENCLAW_LANGGRAPH_CHECKPOINTS", "~/.openclaw/checkpoints/langgraph-collab.sqlite"
+)).expanduser()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -52,6 +84,9 @@ class GraphState(TypedDict):
     result: str
     steps: int
     next_agent: str      # used by supervisor routing
+    plan: list           # --supervisor-plan: steps not yet run, each a list of agent IDs
+    plan_finish: bool    # the plan ends the task (NEXT: FINISH) rather than NEXT: REVIEW
+    blocked: str         # a planned step failed or reported BLOCKED: hand back to the supervisor
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -59,64 +94,96 @@ class GraphState(TypedDict):
 # ─────────────────────────────────────────────────────────────────────────────
 
 class OutputManager:
-    def __init__(self, output_dir: Path, task_id: str):
+    """Transcript, status and result for one run, all recorded in its event log (run_log.py)."""
+
+    def __init__(self, output_dir: Path, task_id: str, resume: bool = False):
         self.output_dir = output_dir
         self.task_id = task_id
-        output_dir.mkdir(parents=True, exist_ok=False)
-        self._transcript_path = output_dir / "transcript.md"
-        self._status_path = output_dir / "status.json"
-        self._result_path = output_dir / "result.md"
-        # Initialise files
-        self._transcript_path.write_text(f"# Transcript — {task_id}\n\n")
+        # --resume may continue in the failed run's output dir; its log is appended to
+        fresh = not output_dir.exists()
+        output_dir.mkdir(parents=True, exist_ok=resume)
+        self.run_log = RunLog(output_dir)  # thread-safe: parallel branches log concurrently
+        if fresh:
+            self.run_log.transcript(f"# Transcript — {task_id}\n\n")
         self._write_status("running", "")
 
     # ── transcript ──────────────────────────────────────────────────────────
 
     def log(self, agent_id: str, content: str, node_type: str = "agent") -> None:
         ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
-        entry = f"## [{ts}] {agent_id.upper()} ({node_type})\n\n{content}\n\n---\n\n"
-        with open(self._transcript_path, "a") as fh:
-            fh.write(entry)
+        self.run_log.transcript(f"## [{ts}] {agent_id.upper()} ({node_type})\n\n{content}\n\n---\n\n")
         preview = content[:80].replace("\n", " ")
         print(f"[{ts}] [{agent_id}] {preview}...", file=sys.stderr, flush=True)
 
+    def resumed(self, replayed: list[str], checkpoint_id: str) -> None:
+        """Note where a --resume run picks up; the replayed nodes' messages are in the restored state."""
+        ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
+        done = ", ".join(replayed) if replayed else "none"
+        self.run_log.transcript(
+            f"## [{ts}] RESUMED from checkpoint {checkpoint_id}\n\n"
+            f"Replayed from the checkpoint (not run again): {done}\n\n---\n\n"
+        )
+        print(f"[{ts}] [resume] replayed {len(replayed)} nodes: {done}", file=sys.stderr, flush=True)
+
+    @contextmanager
+    def stream(self, agent_id: str, node_type: str = "agent"):
+        """
+        Like log(), but yields an on_delta callback that appends the entry's
+        text as it arrives. Only for nodes that run alone in their superstep;
+        concurrent branches use log() so their entries don't interleave.
+        """
+        ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
+        parts: list[str] = []
+        self.run_log.transcript(f"## [{ts}] {agent_id.upper()} ({node_type})\n\n")
+
+        def on_delta(delta: str) -> None:
+            parts.append(delta)
+            self.run_log.delta(delta)
+
+        try:
+            yield on_delta
+        finally:
+            self.run_log.end_stream()
+            self.run_log.transcript("\n\n---\n\n")
+        preview = "".join(parts)[:80].replace("\n", " ")
+        print(f"[{ts}] [{agent_id}] {preview}...", file=sys.stderr, flush=True)
+
     # ── status ───────────────────────────────────────────────────────────────
 
     def _write_status(self, status: str, message: str, extra: dict | None = None) -> None:
-        data: dict = {
+        self.run_log.status(status, {"task_id": self.task_id, "message": message, **(extra or {})})
+
+    def _write_result(self, status: str, steps: int, content: str) -> None:
+        self.run_log.result(content, {
             "task_id": self.task_id,
             "status": status,
-            "message": message,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-        }
-        if extra:
-            data.update(extra)
-        self._status_path.write_text(json.dumps(data, indent=2))
-
-    def complete(self, result: str, steps: int) -> None:
-        self._write_status("complete", f"Completed in {steps} steps", {"steps": steps})
-        fm = (
-            f"---\n"
-            f"task_id: {self.task_id}\n"
-            f"status: complete\n"
-            f"steps: {steps}\n"
-            f"timestamp: {datetime.now(timezone.utc).isoformat()}\n"
-            f"---\n\n"
-        )
-        self._result_path.write_text(fm + result)
+            "steps": steps,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def complete(self, result: str, steps: int, fields: dict | None = None) -> None:
+        self._write_status("complete", f"Completed in {steps} steps",
+                           {"steps": steps, **(fields or {}), "context": CONTEXT.report(), **client_status()})
+        self._write_result("complete", steps, result)
 
     def error(self, exc: Exception, steps: int, tb_str: str = "") -> None:
         msg = str(exc)[:400]
-        self._write_status("error", msg, {"steps": steps})
-        fm = (
-            f"---\n"
-            f"task_id: {self.task_id}\n"
-            f"status: error\n"
-            f"steps: {steps}\n"
-            f"timestamp: {datetime.now(timezone.utc).isoformat()}\n"
-            f"---\n\n"
-        )
-        self._result_path.write_text(fm + f"ERROR: {msg}\n\n```\n{tb_str or msg}\n```\n")
+        self._write_status("error", msg, {"steps": steps, "context": CONTEXT.report(), **client_status()})
+        self._write_result("error", steps, f"ERROR: {msg}\n\n```\n{tb_str or msg}\n```")
+
+    def timeout(self, exc: Exception, messages: list[dict], steps: int) -> None:
+        """The run deadline passed: record what the graph finished before it."""
+        msg = str(exc)[:400]
+        self._write_status("timeout", msg, {"steps": steps, "context": CONTEXT.report(), **client_status()})
+        sections = [
+            f"### {m['agent'].upper()} ({m['role']})\n{m['content']}"
+            for m in messages if "error" not in m
+        ]
+        partial = "\n\n".join(sections) if sections else "_(No agent finished before the deadline.)_"
+        self._write_result("timeout", steps, f"**Note: {msg}**\n\nPartial results:\n\n{partial}")
+
+    def close(self) -> None:
+        self.run_log.close()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -134,49 +201,165 @@ def load_agent_config(agent_id: str) -> dict:
 
 
 def call_agent(agent_id: str, prompt: str, turn_timeout: int = 90) -> str:
-    """Invoke `openclaw agent --json` and return the text response."""
-    result = subprocess.run(
-        [
-            "openclaw", "agent",
-            "--agent", agent_id,
-            "--message", prompt,
-            "--json",
-            "--timeout", str(turn_timeout),
-        ],
-        capture_output=True,
-        text=True,
-        timeout=turn_timeout + 20,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"openclaw agent --agent {agent_id} failed "
-            f"(exit {result.returncode}): {result.stderr[:400]}"
-        )
-    try:
-        data = json.loads(result.stdout)
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(
-            f"Failed to parse JSON from openclaw agent {agent_id}: {exc}\n"
-            f"Raw output: {result.stdout[:500]}"
-        ) from exc
-
-    payloads = data.get("result", {}).get("payloads", [])
-    if not payloads:
-        raise RuntimeError(f"No payloads in openclaw response for agent {agent_id}")
-
-    text = payloads[0].get("text", "")
-    aborted = data.get("result", {}).get("meta", {}).get("aborted", False)
-    if aborted:
-        raise RuntimeError(f"Agent {agent_id} turn was aborted by runtime")
+    """Run one agent turn over the configured OpenClaw transport and return the text response."""
+    return get_client().run_turn(agent_id, prompt, turn_timeout)
+
+
+def stream_agent(agent_id: str, prompt: str, turn_timeout: int, out: OutputManager,
+                 node_type: str, stop=None) -> str:
+    """
+    Run one agent turn, streaming the reply into the transcript as it arrives.
+
+    stop(text_so_far) → True ends the turn early (see OpenClawClient.stream_turn).
+    """
+    with out.stream(agent_id, node_type) as on_delta:
+        text, _ = get_client().stream_turn(agent_id, prompt, turn_timeout, on_delta, stop)
     return text
 
 
+NEXT_DIRECTIVE = re.compile(r"NEXT:\s*(\S+)", re.IGNORECASE)
+
+
+def next_directive_complete(partial: str) -> bool:
+    """Stop predicate for supervisor turns: a full `NEXT: <id>` line has arrived."""
+    return NEXT_DIRECTIVE.search(partial[:partial.rfind("\n") + 1]) is not None
+
+
+PLAN_STEP = re.compile(r"^\W*(?:\d+[.)]\s*)?NEXT:\s*(.+?)\s*$", re.IGNORECASE | re.MULTILINE)
+PLAN_END = re.compile(r"NEXT:\s*(FINISH|REVIEW)\b", re.IGNORECASE)
+BLOCKED_DIRECTIVE = re.compile(r"^\W*BLOCKED:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+BRANCH_SUFFIX = "__parallel"
+
+
+def plan_complete(partial: str) -> bool:
+    """Stop predicate for planning turns: the closing `NEXT: FINISH|REVIEW` line has arrived."""
+    return PLAN_END.search(partial[:partial.rfind("\n") + 1]) is not None
+
+
+def parse_plan(response: str, worker_ids: list[str]) -> tuple[list[list[str]], bool]:
+    """
+    (steps, finish) from a planning turn's `NEXT:` lines. Each step is the
+    workers that take it (several = in parallel); finish is whether the plan
+    ends the task. Unknown IDs are dropped; a plan with no usable step finishes.
+    """
+    steps = []
+    for match in PLAN_STEP.finditer(response):
+        targets = [t.strip().strip("`*.;").lower() for t in re.split(r"[,+&]|\band\b", match.group(1))]
+        if targets and targets[0] in ("finish", "review"):
+            return steps, targets[0] == "finish" or not steps
+        step = list(dict.fromkeys(t for t in targets if t in worker_ids))
+        if step:
+            steps.append(step)
+    return steps, not steps
+
+
+def blocked_reason(agent_id: str, response: str) -> str:
+    match = BLOCKED_DIRECTIVE.search(response)
+    return f"{agent_id}: {match.group(1).strip()}" if match else ""
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Node factories
 # ─────────────────────────────────────────────────────────────────────────────
 
-def make_worker_node(agent_id: str, out: OutputManager, turn_timeout: int):
-    """Return a LangGraph node function for a standard worker agent."""
+def format_prior(prior: list[dict], budget: int, max_chars: int | None = None) -> str:
+    """Render prior messages for a prompt: recent ones verbatim, older ones summarized."""
+    turns = [(f"{m['agent'].upper()} — {m['role']}", m["content"]) for m in prior]
+    summary, recent = CONTEXT.fit(turns, budget, max_chars)
+    parts = [summary] if summary else []
+    parts += [f"[{label}]:\n{content}" for label, content in recent]
+    return "\n\n".join(parts)
+
+
+def parse_metadata(response: str, metadata: dict) -> dict:
+    """Return metadata updated with any `METADATA: key=value` lines in response."""
+    new_metadata = dict(metadata)
+    for line in response.splitlines():
+        line = line.strip()
+        if line.upper().startswith("METADATA:"):
+            kv = line.split(":", 1)[1].strip()
+            if "=" in kv:
+                k, v = kv.split("=", 1)
+                new_metadata[k.strip()] = v.strip()
+    return new_metadata
+
+
+BLOCKED_INSTRUCTION = (
+    "If you cannot do your part (missing input, an earlier step went wrong), "
+    "reply with a line `BLOCKED: <reason>` and the supervisor will re-plan."
+)
+
+
+def make_branch_node(agent_id: str, out: OutputManager, turn_timeout: int, planned: bool = False):
+    """
+    Return a worker node for one branch of a concurrent fan-out.
+
+    Branches run in the same superstep, so they only write `messages` (the one
+    key with a reducer). A failed or timed-out turn becomes an error message
+    instead of an exception, so one slow agent can't cancel its siblings.
+    planned branches are a parallel step of a supervisor plan: they see the
+    work so far and may answer BLOCKED.
+    """
+    config = load_agent_config(agent_id)
+    role = config.get("role", agent_id)
+    name = config.get("name", agent_id)
+    goal = config.get("goal", "")
+
+    def _node(state: GraphState) -> dict:
+        if planned:
+            ctx = format_prior(state.get("messages", []), CONTEXT.budget_for(agent_id)) or "No prior context."
+            prompt = (
+                f"You are {name}, {role}.\n"
+                f"Goal: {goal}\n\n"
+                f"## Task\n{state['task']}\n\n"
+                f"## Prior Work\n{ctx}\n\n"
+                f"## Your Turn\n"
+                f"Other specialists are taking this step in parallel. Contribute your "
+                f"expertise. Be specific and concise. {BLOCKED_INSTRUCTION}"
+            )
+        else:
+            prompt = (
+                f"You are {name}, {role}.\n"
+                f"Goal: {goal}\n\n"
+                f"## Task\n{state['task']}\n\n"
+                f"## Your Turn\n"
+                f"Other specialists are answering in parallel and a synthesizer will merge "
+                f"the perspectives. Contribute your expertise. Be specific and concise."
+            )
+        started = time.time()
+        try:
+            response = call_agent(agent_id, prompt, turn_timeout)
+            error = None
+        except Exception as exc:
+            response = f"_[{agent_id} failed: {exc}]_"
+            error = str(exc)[:400]
+        finished = time.time()
+        out.log(agent_id, response, "branch" if error is None else "branch error")
+
+        message = {
+            "agent": agent_id,
+            "role": role,
+            "content": response,
+            "branch": True,
+            "started": started,
+            "finished": finished,
+        }
+        if error is not None:
+            message["error"] = error
+        return {"messages": [message]}
+
+    _node.__name__ = f"node_{agent_id}_branch"
+    return _node
+
+
+def make_worker_node(agent_id: str, out: OutputManager, turn_timeout: int, planned: bool = False):
+    """
+    Return a LangGraph node function for a standard worker agent.
+
+    planned workers run one step of a supervisor plan: they pop that step
+    off `plan`, and a failed turn or a BLOCKED reply is handed back to the
+    supervisor through `blocked` instead of ending the run.
+    """
     config = load_agent_config(agent_id)
     role = config.get("role", agent_id)
     name = config.get("name", agent_id)
@@ -187,12 +370,7 @@ def make_worker_node(agent_id: str, out: OutputManager, turn_timeout: int):
         prior = state.get("messages", [])
         steps = state.get("steps", 0)
 
-        # Build context from recent messages (capped to avoid token blow-up)
-        ctx_parts = [
-            f"[{m['agent'].upper()} — {m['role']}]:\n{m['content']}"
-            for m in prior[-MAX_HISTORY_TURNS:]
-        ]
-        ctx = "\n\n".join(ctx_parts) if ctx_parts else "No prior context."
+        ctx = format_prior(prior, CONTEXT.budget_for(agent_id)) or "No prior context."
 
         prompt = (
             f"You are {name}, {role}.\n"
@@ -201,27 +379,39 @@ def make_worker_node(agent_id: str, out: OutputManager, turn_timeout: int):
             f"## Prior Work\n{ctx}\n\n"
             f"## Your Turn\n"
             f"Contribute your expertise. Be specific and concise."
+            + (f" {BLOCKED_INSTRUCTION}" if planned else "")
         )
 
-        response = call_agent(agent_id, prompt, turn_timeout)
-        out.log(agent_id, response, "worker")
+        if not planned:
+            response = stream_agent(agent_id, prompt, turn_timeout, out, "worker")
+        else:
+            try:
+                response = stream_agent(agent_id, prompt, turn_timeout, out, "worker")
+            except DeadlineExceeded:
+                raise
+            except Exception as exc:
+                response = f"_[{agent_id} failed: {exc}]_"
+                out.log(agent_id, response, "worker error")
+                return {
+                    "messages": [{"agent": agent_id, "role": role, "content": response, "error": str(exc)[:400]}],
+                    "steps": steps + 1,
+                    "plan": state.get("plan", [])[1:],
+                    "blocked": f"{agent_id} failed: {str(exc)[:400]}",
+                }
 
         # Parse METADATA: key=value lines from agent response
-        new_metadata = dict(state.get("metadata", {}))
-        for line in response.splitlines():
-            line = line.strip()
-            if line.upper().startswith("METADATA:"):
-                kv = line.split(":", 1)[1].strip()
-                if "=" in kv:
-                    k, v = kv.split("=", 1)
-                    new_metadata[k.strip()] = v.strip()
+        new_metadata = parse_metadata(response, state.get("metadata", {}))
 
-        return {
+        update = {
             "messages": [{"agent": agent_id, "role": role, "content": response}],
             "steps": steps + 1,
             "result": response,
             "metadata": new_metadata,
         }
+        if planned:
+            update["plan"] = state.get("plan", [])[1:]
+            update["blocked"] = blocked_reason(agent_id, response)
+        return update
 
     _node.__name__ = f"node_{agent_id}"
     return _node
@@ -243,11 +433,8 @@ def make_supervisor_node(
         prior = state.get("messages", [])
         steps = state.get("steps", 0)
 
-        ctx_parts = [
-            f"[{m['agent'].upper()} — {m['role']}]:\n{m['content'][:400]}"
-            for m in prior[-MAX_HISTORY_TURNS:]
-        ]
-        ctx = "\n\n".join(ctx_parts) if ctx_parts else "No work done yet."
+        # Routing needs the gist of each step, not the full text
+        ctx = format_prior(prior, CONTEXT.budget_for(supervisor_id), max_chars=400) or "No work done yet."
 
         prompt = (
             f"You are {name}, the orchestrating supervisor for this task.\n\n"
@@ -263,11 +450,12 @@ def make_supervisor_node(
             f"`NEXT: <id>` or `NEXT: FINISH` line."
         )
 
-        response = call_agent(supervisor_id, prompt, turn_timeout)
-        out.log(supervisor_id, response, "supervisor")
+        # Routing only needs the NEXT: line, so stop reading once it's complete
+        response = stream_agent(supervisor_id, prompt, turn_timeout, out, "supervisor",
+                                stop=next_directive_complete)
 
         # Parse NEXT: directive
-        m = re.search(r"NEXT:\s*(\S+)", response, re.IGNORECASE)
+        m = NEXT_DIRECTIVE.search(response)
         next_agent = "FINISH"
         if m:
             candidate = m.group(1).strip().rstrip(".,;").lower()
@@ -287,6 +475,103 @@ def make_supervisor_node(
     return _node
 
 
+def make_planning_supervisor_node(
+    supervisor_id: str,
+    worker_ids: list[str],
+    max_steps: int,
+    out: OutputManager,
+    turn_timeout: int,
+):
+    """
+    Return a supervisor node that plans several steps at once. Workers run
+    the plan without coming back to it; it is consulted again only when the
+    plan ends in NEXT: REVIEW or a step is blocked.
+    """
+    config = load_agent_config(supervisor_id)
+    name = config.get("name", supervisor_id)
+    workers_str = ", ".join(worker_ids)
+
+    def _node(state: GraphState) -> dict:
+        task = state["task"]
+        prior = state.get("messages", [])
+        steps = state.get("steps", 0)
+        blocked = state.get("blocked", "")
+
+        ctx = format_prior(prior, CONTEXT.budget_for(supervisor_id), max_chars=400) or "No work done yet."
+        situation = (
+            f"## Plan Blocked\nThe last plan stopped early: {blocked}\n\n" if blocked else ""
+        )
+
+        prompt = (
+            f"You are {name}, the orchestrating supervisor for this task.\n\n"
+            f"## Task\n{task}\n\n"
+            f"## Work Done So Far\n{ctx}\n\n"
+            f"{situation}"
+            f"## Available Workers\n{workers_str}\n\n"
+            f"## Instructions\n"
+            f"Plan the remaining work as an ordered list of steps, one line per step:\n"
+            f"- `NEXT: <worker_id>` — that worker takes the step\n"
+            f"- `NEXT: <worker_id>, <worker_id>` — those workers take the step in parallel\n"
+            f"Workers see everything done before their step. End the plan with "
+            f"`NEXT: FINISH` if these steps complete the task, or `NEXT: REVIEW` if you "
+            f"need to see their results before deciding more. If the task is already "
+            f"complete, answer just `NEXT: FINISH`.\n\n"
+            f"Give a brief rationale first, then the plan. Workers: {workers_str}. "
+            f"At most {max(1, max_steps - steps - 1)} steps."
+        )
+
+        # The plan is complete once its FINISH/REVIEW line is
+        response = stream_agent(supervisor_id, prompt, turn_timeout, out, "supervisor plan",
+                                stop=plan_complete)
+        plan, finish = parse_plan(response, worker_ids)
+
+        return {
+            "messages": [{"agent": supervisor_id, "role": "supervisor", "content": response}],
+            "steps": steps + 1,
+            "plan": plan,
+            "plan_finish": finish,
+            "blocked": "",
+        }
+
+    _node.__name__ = f"node_{supervisor_id}_planner"
+    return _node
+
+
+def make_plan_join_node(out: OutputManager):
+    """Return the node that closes a parallel plan step: pops it and folds in its branches."""
+
+    def _node(state: GraphState) -> dict:
+        plan = state.get("plan", [])
+        step = plan[0] if plan else []
+        # The step's branches are the messages appended in the superstep before this one
+        branches = [m for m in state.get("messages", [])[-len(step):] if m.get("branch")] if step else []
+        metadata = state.get("metadata", {})
+        blocked = []
+        for m in branches:
+            if "error" in m:
+                blocked.append(f"{m['agent']} failed: {m['error']}")
+            else:
+                metadata = parse_metadata(m["content"], metadata)
+                reason = blocked_reason(m["agent"], m["content"])
+                if reason:
+                    blocked.append(reason)
+        out.log("plan", f"parallel step {' + '.join(step)}: "
+                        f"{len(branches) - len(blocked)}/{len(branches)} done", "join")
+        succeeded = [m for m in branches if "error" not in m]
+        update = {
+            "plan": plan[1:],
+            "steps": state.get("steps", 0) + len(branches),
+            "metadata": metadata,
+            "blocked": "; ".join(blocked),
+        }
+        if succeeded:
+            update["result"] = succeeded[-1]["content"]
+        return update
+
+    _node.__name__ = "node_plan_join"
+    return _node
+
+
 def make_synthesizer_node(synthesizer_id: str, out: OutputManager, turn_timeout: int):
     """Return a synthesizer node that combines all prior worker outputs."""
     config = load_agent_config(synthesizer_id)
@@ -298,12 +583,41 @@ def make_synthesizer_node(synthesizer_id: str, out: OutputManager, turn_timeout:
         task = state["task"]
         prior = state.get("messages", [])
         steps = state.get("steps", 0)
-
-        sections = [
-            f"### {m['agent'].upper()} ({m['role']})\n{m['content']}"
-            for m in prior[-MAX_HISTORY_TURNS:]
-        ]
-        perspectives = "\n\n".join(sections) if sections else "No expert input."
+        metadata = state.get("metadata", {})
+
+        # After a fan-out, every branch is a perspective (not just the last few);
+        # branches don't touch `steps` or `metadata`, so account for them here.
+        branches = [m for m in prior if m.get("branch")]
+        if branches:
+            succeeded = [m for m in branches if "error" not in m]
+            if not succeeded:
+                raise RuntimeError(
+                    "All parallel workers failed: "
+                    + "; ".join(f"{m['agent']}: {m['error']}" for m in branches)
+                )
+            wall = max(m["finished"] for m in branches) - min(m["started"] for m in branches)
+            serial = sum(m["finished"] - m["started"] for m in branches)
+            out.log(
+                "fan-out",
+                f"{len(succeeded)}/{len(branches)} branches succeeded · "
+                f"wall {wall:.1f}s vs {serial:.1f}s if run serially",
+                "join",
+            )
+            for m in succeeded:
+                metadata = parse_metadata(m["content"], metadata)
+            steps += len(branches)
+            selected = succeeded
+        else:
+            selected = None
+
+        if selected is not None:
+            sections = [
+                f"### {m['agent'].upper()} ({m['role']})\n{m['content']}"
+                for m in selected
+            ]
+            perspectives = "\n\n".join(sections) if sections else "No expert input."
+        else:
+            perspectives = format_prior(prior, CONTEXT.budget_for(synthesizer_id)) or "No expert input."
 
         prompt = (
             f"You are {name}, {role}.\n"
@@ -315,13 +629,13 @@ def make_synthesizer_node(synthesizer_id: str, out: OutputManager, turn_timeout:
             f"Note consensus, flag disagreements, and deliver a unified recommendation."
         )
 
-        response = call_agent(synthesizer_id, prompt, turn_timeout)
-        out.log(synthesizer_id, response, "synthesizer")
+        response = stream_agent(synthesizer_id, prompt, turn_timeout, out, "synthesizer")
 
         return {
             "messages": [{"agent": synthesizer_id, "role": "synthesizer", "content": response}],
             "steps": steps + 1,
             "result": response,
+            "metadata": metadata,
         }
 
     _node.__name__ = f"node_{synthesizer_id}_synth"
@@ -341,7 +655,7 @@ def build_linear_graph(agents: list[str], out: OutputManager, turn_timeout: int)
     for i in range(len(agents) - 1):
         g.add_edge(agents[i], agents[i + 1])
     g.add_edge(agents[-1], END)
-    return g.compile()
+    return g
 
 
 def build_supervisor_graph(
@@ -350,8 +664,11 @@ def build_supervisor_graph(
     max_steps: int,
     out: OutputManager,
     turn_timeout: int,
+    plan: bool = False,
 ):
     """Supervisor ⇄ workers (dynamic routing until FINISH or max_steps)."""
+    if plan:
+        return build_planned_supervisor_graph(agents, supervisor_id, max_steps, out, turn_timeout)
     g = StateGraph(GraphState)
 
     # Worker nodes
@@ -381,7 +698,50 @@ def build_supervisor_graph(
     cond_map[END] = END
     g.add_conditional_edges("supervisor", route, cond_map)
 
-    return g.compile()
+    return g
+
+
+def build_planned_supervisor_graph(
+    agents: list[str],
+    supervisor_id: str,
+    max_steps: int,
+    out: OutputManager,
+    turn_timeout: int,
+):
+    """
+    Supervisor → plan of steps → supervisor only at plan end or when blocked.
+
+    A one-worker step is that worker's node; a parallel step fans out to
+    `<id>__parallel` branch nodes, joined by `plan_join`. After every step
+    the same router picks the next one, so a plan of n steps costs one
+    supervisor turn instead of n.
+    """
+    agents = list(dict.fromkeys(agents))
+    g = StateGraph(GraphState)
+    g.add_node("supervisor", make_planning_supervisor_node(supervisor_id, agents, max_steps, out, turn_timeout))
+    g.add_node("plan_join", make_plan_join_node(out))
+    for aid in agents:
+        g.add_node(aid, make_worker_node(aid, out, turn_timeout, planned=True))
+        g.add_node(aid + BRANCH_SUFFIX, make_branch_node(aid, out, turn_timeout, planned=True))
+        g.add_edge(aid + BRANCH_SUFFIX, "plan_join")
+    g.set_entry_point("supervisor")
+
+    def route(state: GraphState):
+        if state.get("steps", 0) >= max_steps:
+            return END
+        if state.get("blocked"):
+            return "supervisor"
+        plan = state.get("plan") or []
+        if not plan:
+            return END if state.get("plan_finish") else "supervisor"
+        step = plan[0]
+        return step[0] if len(step) == 1 else [aid + BRANCH_SUFFIX for aid in step]
+
+    targets = ["supervisor", END] + agents + [aid + BRANCH_SUFFIX for aid in agents]
+    for source in ["supervisor", "plan_join"] + agents:
+        g.add_conditional_edges(source, route, targets)
+
+    return g
 
 
 def build_parallel_graph(
@@ -390,25 +750,26 @@ def build_parallel_graph(
     out: OutputManager,
     turn_timeout: int,
 ):
-    """All workers → synthesizer → END (fan-out with synthesis).
+    """START ⇉ all workers concurrently ⇉ synthesizer → END (fan-out with synthesis).
 
-    Note: LangGraph v0.6 doesn't natively fan-out with true concurrency here;
-    we chain workers sequentially so every perspective is gathered, then
-    synthesise — which is semantically equivalent for our use-case.
+    Every worker is a branch off START, so LangGraph runs them in the same
+    superstep, concurrently; the synthesizer waits for all of them and reads
+    their outputs from the `messages` reducer. Wall time is roughly the
+    slowest turn rather than the sum. A failing branch is reported to the
+    synthesizer instead of aborting the others.
     """
     g = StateGraph(GraphState)
 
+    agents = list(dict.fromkeys(agents))  # duplicate IDs would collide as node names
     for aid in agents:
-        g.add_node(aid, make_worker_node(aid, out, turn_timeout))
+        g.add_node(aid, make_branch_node(aid, out, turn_timeout))
+        g.add_edge(START, aid)
     g.add_node("synthesizer", make_synthesizer_node(synthesizer_id, out, turn_timeout))
 
-    g.set_entry_point(agents[0])
-    for i in range(len(agents) - 1):
-        g.add_edge(agents[i], agents[i + 1])
-    g.add_edge(agents[-1], "synthesizer")
+    g.add_edge(agents, "synthesizer")
     g.add_edge("synthesizer", END)
 
-    return g.compile()
+    return g
 
 
 def build_conditional_graph(
@@ -452,14 +813,52 @@ def build_conditional_graph(
     g.add_edge(agent_true, END)
     g.add_edge(agent_false, END)
 
-    return g.compile()
+    return g
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Checkpoints
+# ─────────────────────────────────────────────────────────────────────────────
+
+def open_checkpointer(path: Path) -> SqliteSaver:
+    """
+    SQLite checkpointer shared by every run on this machine, one thread per
+    task_id. WAL and a busy timeout let batch and queue workers write to it
+    concurrently.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return SqliteSaver(conn)
+
+
+def completed_nodes(compiled, config: dict) -> list[str]:
+    """
+    Nodes whose results a checkpoint already holds, oldest first: the tasks of
+    every superstep before the latest, plus any of the latest's tasks that
+    finished before the run stopped (parallel siblings of a failed branch).
+    """
+    history = list(compiled.get_state_history(config))  # newest first
+    nodes = []
+    for snapshot in reversed(history[1:]):
+        nodes.extend(t.name for t in snapshot.tasks if not t.name.startswith("__"))
+    if history:
+        nodes.extend(t.name for t in history[0].tasks
+                     if t.result is not None and not t.name.startswith("__"))
+    return nodes
+
+
+def resume_hint(checkpointer, task_id: str) -> None:
+    if checkpointer is not None:
+        print(f"[langgraph-runner] checkpointed; rerun with --resume to continue task_id={task_id}",
+              file=sys.stderr, flush=True)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Entry point
 # ─────────────────────────────────────────────────────────────────────────────
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         description="LangGraph multi-agent runner (OpenClaw gateway routing)"
     )
@@ -477,6 +876,9 @@ def main() -> None:
     parser.add_argument("--output", required=True, help="Output directory path")
     parser.add_argument("--max-steps", type=int, default=10,
                         help="Max graph steps / recursion limit guard (default: 10)")
+    parser.add_argument("--supervisor-plan", action="store_true",
+                        help="Supervisor topology: the supervisor plans several steps per turn and is "
+                             "consulted again only at plan end or when a step is blocked")
     parser.add_argument("--turn-timeout", type=int, default=90,
                         help="Per-agent turn timeout in seconds (default: 90)")
     parser.add_argument("--timeout", type=int, default=300,
@@ -485,23 +887,41 @@ def main() -> None:
                         help="Condition for conditional topology: key=value:agent_true,agent_false")
     parser.add_argument("--metadata", default="{}",
                         help="Initial metadata JSON string")
-    args = parser.parse_args()
+    parser.add_argument("--context-tokens", type=int, default=DEFAULT_CONTEXT_TOKENS,
+                        help="Prompt token budget for prior messages, per agent; an agent's "
+                             f"\"context_tokens\" overrides it (default: {DEFAULT_CONTEXT_TOKENS})")
+    parser.add_argument("--checkpoint-db", default=str(DEFAULT_CHECKPOINT_DB),
+                        help="SQLite file for graph checkpoints, keyed by --task-id "
+                             f"(default: $OPENCLAW_LANGGRAPH_CHECKPOINTS or {DEFAULT_CHECKPOINT_DB})")
+    parser.add_argument("--no-checkpoint", action="store_true",
+                        help="Don't checkpoint the run (it can't be resumed)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue --task-id from its last checkpoint instead of starting over; "
+                             "completed nodes are not run again. Starts fresh if there is no checkpoint")
+    add_client_args(parser)
+    args = parser.parse_args(argv)
+    configure_client(args, AGENTS_DIR)
+    CONTEXT.default_budget = args.context_tokens
+    CONTEXT.budgets = load_context_budgets(AGENTS_DIR)
 
     agents = [a.strip() for a in args.agents.split(",") if a.strip()]
     if not agents:
         print("Error: --agents must contain at least one valid agent ID", file=sys.stderr)
         sys.exit(1)
+    if args.resume and args.no_checkpoint:
+        print("Error: --resume needs checkpoints; drop --no-checkpoint", file=sys.stderr)
+        sys.exit(1)
     if args.topology == "conditional" and not args.condition:
         print("Error: --condition is required for conditional topology.\n"
               "Format: 'key=value:agent_true,agent_false'\n"
               "Example: 'bug_found=true:forge,vigil'", file=sys.stderr)
         sys.exit(1)
     output_dir = Path(args.output)
-    if output_dir.exists():
+    if output_dir.exists() and not args.resume:
         print(f"[langgraph-runner] ERROR: output dir already exists: {output_dir}", file=sys.stderr)
         sys.exit(1)
     try:
-        out = OutputManager(output_dir, args.task_id)
+        out = OutputManager(output_dir, args.task_id, resume=args.resume)
     # Cannot write output files here — directory creation failed, no output dir to write to.
     except OSError as e:
         print(f"Error: could not create output directory {output_dir}: {e}", file=sys.stderr)
@@ -519,6 +939,9 @@ def main() -> None:
         "result": "",
         "steps": 0,
         "next_agent": "",
+        "plan": [],
+        "plan_finish": False,
+        "blocked": "",
     }
 
     print(
@@ -529,42 +952,72 @@ def main() -> None:
 
     start = time.time()
     steps_done = 0
+    # --timeout is a run deadline: every turn is clamped to the time left and
+    # cancelled (child killed, gateway request dropped) when it passes
+    set_run_deadline(args.timeout)
+    state = initial_state  # last completed superstep, for partial results
+    replayed: list[str] = []
+    executed: list[str] = []
+    checkpointer = None
 
     try:
         # ── Build graph ──────────────────────────────────────────────────────
         if args.topology == "linear":
-            compiled = build_linear_graph(agents, out, args.turn_timeout)
+            graph = build_linear_graph(agents, out, args.turn_timeout)
 
         elif args.topology == "supervisor":
-            compiled = build_supervisor_graph(
-                agents, args.supervisor, args.max_steps, out, args.turn_timeout
+            graph = build_supervisor_graph(
+                agents, args.supervisor, args.max_steps, out, args.turn_timeout,
+                plan=args.supervisor_plan,
             )
 
         elif args.topology == "parallel":
             synth_id = args.synthesizer or args.supervisor
-            compiled = build_parallel_graph(agents, synth_id, out, args.turn_timeout)
+            graph = build_parallel_graph(agents, synth_id, out, args.turn_timeout)
 
         elif args.topology == "conditional":
             if not args.condition:
                 raise ValueError("--condition is required for conditional topology")
-            compiled = build_conditional_graph(
+            graph = build_conditional_graph(
                 agents, args.condition, out, args.turn_timeout
             )
 
         else:
             raise ValueError(f"Unknown topology: {args.topology}")
 
-        # ── Run ──────────────────────────────────────────────────────────────
-        def _timeout_handler(signum, frame):
-            raise TimeoutError(f"Graph exceeded --timeout {args.timeout}s wall-clock limit")
-
-        signal.signal(signal.SIGALRM, _timeout_handler)
-        signal.alarm(args.timeout)
+        # ── Checkpoints ──────────────────────────────────────────────────────
+        # A parallel plan step takes two supersteps (branches, then the join)
+        recursion_limit = args.max_steps * (2 if args.supervisor_plan else 1) + 5
+        config = {"recursion_limit": recursion_limit}
+        graph_input = initial_state
+        if not args.no_checkpoint:
+            checkpointer = open_checkpointer(Path(args.checkpoint_db).expanduser())
+            config["configurable"] = {"thread_id": args.task_id}
+        compiled = graph.compile(checkpointer=checkpointer)
+
+        if args.resume:
+            snapshot = compiled.get_state(config)
+            if not snapshot.values:
+                print(f"[langgraph-runner] no checkpoint for task_id={args.task_id}; starting fresh",
+                      file=sys.stderr, flush=True)
+            elif snapshot.values.get("task") != args.task:
+                raise ValueError(f"checkpoint for task_id={args.task_id} is for a different --task")
+            else:
+                replayed = completed_nodes(compiled, config)
+                out.resumed(replayed, snapshot.config["configurable"]["checkpoint_id"])
+                state = snapshot.values
+                graph_input = None  # continue from the checkpoint
+        elif checkpointer is not None:
+            checkpointer.delete_thread(args.task_id)  # an earlier run under this task_id
 
-        final_state = compiled.invoke(
-            initial_state,
-            {"recursion_limit": args.max_steps + 5},
-        )
+        # ── Run ──────────────────────────────────────────────────────────────
+        # Stream state after each superstep so a deadline leaves partial results
+        for mode, chunk in compiled.stream(graph_input, config, stream_mode=["updates", "values"]):
+            if mode == "values":
+                state = chunk
+            else:
+                executed.extend(node for node in chunk if not node.startswith("__"))
+        final_state = state
 
         elapsed = time.time() - start
         steps_done = final_state.get("steps", 0)
@@ -574,23 +1027,62 @@ def main() -> None:
         if not result and final_state.get("messages"):
             result = final_state["messages"][-1].get("content", "")
 
-        signal.alarm(0)  # cancel alarm on success
+        fields = {}
+        if args.resume:
+            fields["nodes"] = {"replayed": replayed, "executed": executed}
+        if args.topology == "supervisor":
+            # Routing round trips vs useful work, to compare plain and --supervisor-plan runs
+            supervisor_turns = sum(1 for m in final_state.get("messages", []) if m.get("role") == "supervisor")
+            fields["turns"] = {
+                "supervisor": supervisor_turns,
+                "worker": len(final_state.get("messages", [])) - supervisor_turns,
+            }
         print(
-            f"[langgraph-runner] Complete in {elapsed:.1f}s | steps={steps_done}",
+            f"[langgraph-runner] Complete in {elapsed:.1f}s | steps={steps_done}"
+            + "".join(f" | {k}_turns={v}" for k, v in fields.get("turns", {}).items()),
             file=sys.stderr, flush=True,
         )
-        out.complete(result, steps_done)
+        out.complete(result, steps_done, fields)
+        if checkpointer is not None:
+            # A finished run has nothing to resume; don't let the shared file grow per task
+            checkpointer.delete_thread(args.task_id)
 
     except Exception as exc:
         elapsed = time.time() - start
+        deadline = run_deadline()
+        if isinstance(exc, DeadlineExceeded) or (deadline is not None and deadline.expired()):
+            steps_done = state.get("steps", 0)
+            print(
+                f"[langgraph-runner] TIMEOUT after {elapsed:.1f}s | steps={steps_done}",
+                file=sys.stderr, flush=True,
+            )
+            out.timeout(exc, state.get("messages", []), steps_done)
+            resume_hint(checkpointer, args.task_id)
+            sys.exit(1)
         tb_str = traceback.format_exc()
         print(
             f"[langgraph-runner] ERROR after {elapsed:.1f}s: {exc}",
             file=sys.stderr, flush=True,
         )
         out.error(exc, steps_done, tb_str)
+        resume_hint(checkpointer, args.task_id)
         sys.exit(1)
+    finally:
+        close_clients()
+        out.close()
+        if checkpointer is not None:
+            checkpointer.conn.close()
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["serve"]:
+        # LangGraph is already imported above, so the warm daemon needs no preload
+        from runner_daemon import serve_main
+        sys.exit(serve_main(sys.argv[2:], main))
+    if sys.argv[1:2] == ["batch"]:
+        from runner_batch import batch_main
+        sys.exit(batch_main(sys.argv[2:], main))
+    if sys.argv[1:2] == ["worker"]:
+        from task_queue import worker_main
+        sys.exit(worker_main(sys.argv[2:], main))
     main()
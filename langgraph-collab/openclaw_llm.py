@@ -1,47 +1,24 @@
 #!/usr/bin/env python3
 # NOTE: This file is NOT imported by langgraph_runner.py.
-# langgraph_runner.py uses its own call_agent() function directly.
+# langgraph_runner.py uses its own call_agent() function directly; both go
+# through openclaw_client.
 # This file is kept for reference/compatibility only.
 """
 openclaw_llm.py — LangGraph node LLM bridge to OpenClaw gateway.
 
-Routes all LLM calls through `openclaw agent --agent <id> --json`.
+Routes all LLM calls through OpenClaw via openclaw_client
+(`openclaw agent --agent <id> --json` by default).
 No API keys needed — uses existing OpenClaw provider configuration.
 """
 
-import json
-import subprocess
 from typing import Any
 
+from openclaw_client import get_client
+
 
 def run_openclaw_agent(agent_id: str, message: str, timeout: int = 90) -> str:
     """Call openclaw agent and return text response."""
-    result = subprocess.run(
-        ["openclaw", "agent",
-         "--agent", agent_id,
-         "--message", message,
-         "--json",
-         "--timeout", str(timeout)],
-        capture_output=True, text=True, timeout=timeout + 10,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"openclaw agent --agent {agent_id} failed (exit {result.returncode}): "
-            f"{result.stderr[:200]}"
-        )
-    try:
-        data = json.loads(result.stdout)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"Failed to parse openclaw JSON: {e}\nOutput: {result.stdout[:300]}")
-
-    payloads = data.get("result", {}).get("payloads", [])
-    if not payloads:
-        raise RuntimeError(f"No payloads in openclaw response for agent {agent_id}")
-    text = payloads[0].get("text", "")
-    aborted = data.get("result", {}).get("meta", {}).get("aborted", False)
-    if aborted:
-        raise RuntimeError(f"Agent {agent_id} turn aborted: {text[:100]}")
-    return text
+    return get_client().run_turn(agent_id, message, timeout)
 
 
 def extract_prompt_from_messages(messages: list | str) -> str:
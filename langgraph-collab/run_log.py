@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+run_log.py — append-only event log for a collab run, with rendered views.
+
+Every runner output goes through one RunLog per run:
+
+  <output>/events.jsonl   — one JSON event per line (transcript, status, result);
+                            the source of truth
+  <output>/transcript.md  — transcript events, appended as they happen
+  <output>/status.json    — the latest status event
+  <output>/result.md      — the result event, with YAML frontmatter
+
+Writes go through in-process buffers. A background thread flushes them every
+FLUSH_INTERVAL seconds (so `tail -f transcript.md` keeps up) and fsyncs the
+event log every FSYNC_INTERVAL seconds. Terminal statuses and results are
+flushed and fsynced immediately. "running" status updates are coalesced to
+at most one status.json rewrite per STATUS_INTERVAL seconds; status.json and
+result.md are replaced atomically, so pollers never see a partial file.
+
+If a run dies before its views are current, rebuild them from the log:
+
+  python3 run_log.py render <output-dir>
+
+This file is kept identical across autogen-collab, crewai-collab and
+langgraph-collab — change all three together.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+EVENTS_FILENAME = "events.jsonl"
+FLUSH_INTERVAL = 0.5
+FSYNC_INTERVAL = 5.0
+STATUS_INTERVAL = 2.0
+BUFFER_SIZE = 1 << 16
+TAIL_BLOCK = 8192
+
+
+def render_status(status: str, fields: dict, updated_at: str) -> str:
+    return json.dumps({"status": status, "updated_at": updated_at, **fields}, indent=2)
+
+
+def render_result(content: str, meta: dict) -> str:
+    frontmatter = "\n".join(f"{k}: {v}" for k, v in meta.items())
+    return f"---\n{frontmatter}\n---\n\n{content}\n"
+
+
+def write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def tail_lines(path: Path, n: int) -> list[str]:
+    """The last n lines of a text file, reading backwards from the end in blocks."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return data.decode("utf-8", "replace").splitlines()[-n:]
+
+
+class RunLog:
+    """Event log plus transcript/status/result views for one run. Thread-safe."""
+
+    def __init__(self, output_dir: Path, flush_interval: float = FLUSH_INTERVAL,
+                 fsync_interval: float = FSYNC_INTERVAL, status_interval: float = STATUS_INTERVAL):
+        self.output_dir = Path(output_dir)
+        self.transcript_path = self.output_dir / "transcript.md"
+        self.status_path = self.output_dir / "status.json"
+        self.result_path = self.output_dir / "result.md"
+        self.status_interval = status_interval
+        self.fsync_interval = fsync_interval
+
+        self._lock = threading.RLock()
+        self._events = open(self.output_dir / EVENTS_FILENAME, "a", encoding="utf-8", buffering=BUFFER_SIZE)
+        self._transcript = open(self.transcript_path, "a", encoding="utf-8", buffering=BUFFER_SIZE)
+        self._streamed: list[str] = []
+        self._pending_status: str | None = None  # rendered status.json not yet written
+        self._status_written = 0.0
+        self._fsynced = time.monotonic()
+        self._dirty = False
+        self._closed = False
+
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, args=(flush_interval,), daemon=True)
+        self._flusher.start()
+
+    # ── events ───────────────────────────────────────────────────────────────
+
+    def emit(self, event_type: str, **fields) -> None:
+        with self._lock:
+            self._events.write(json.dumps({"ts": round(time.time(), 3), "type": event_type, **fields},
+                                          separators=(",", ":")) + "\n")
+            self._dirty = True
+
+    def transcript(self, text: str) -> None:
+        """Append text verbatim to the transcript."""
+        with self._lock:
+            self.emit("transcript", text=text)
+            self._transcript.write(text)
+
+    def delta(self, text: str) -> None:
+        """Append streamed text to the transcript; logged as one event at end_stream()."""
+        with self._lock:
+            self._streamed.append(text)
+            self._transcript.write(text)
+            self._dirty = True
+
+    def end_stream(self) -> None:
+        with self._lock:
+            if self._streamed:
+                self.emit("transcript", text="".join(self._streamed), streamed=True)
+                self._streamed = []
+
+    def status(self, status: str, fields: dict | None = None) -> None:
+        """
+        Record a status. "running" updates are coalesced; anything else is
+        written (and fsynced) immediately.
+        """
+        fields = fields or {}
+        updated_at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self.emit("status", status=status, updated_at=updated_at, fields=fields)
+            self._pending_status = render_status(status, fields, updated_at)
+            first = self._status_written == 0.0
+            if status != "running":
+                self.sync()
+            elif first or time.monotonic() - self._status_written >= self.status_interval:
+                self._write_status()
+
+    def result(self, content: str, meta: dict) -> None:
+        with self._lock:
+            self.emit("result", content=content, meta=meta)
+            write_atomic(self.result_path, render_result(content, meta))
+            self.sync()
+
+    # ── reads ────────────────────────────────────────────────────────────────
+
+    def tail(self, n: int = 40) -> list[str]:
+        """Last n transcript lines, without reading the whole file."""
+        with self._lock:
+            self._transcript.flush()
+        return tail_lines(self.transcript_path, n)
+
+    # ── durability ───────────────────────────────────────────────────────────
+
+    def _write_status(self) -> None:
+        if self._pending_status is not None:
+            write_atomic(self.status_path, self._pending_status)
+            self._pending_status = None
+            self._status_written = time.monotonic()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            if self._dirty:
+                self._events.flush()
+                self._transcript.flush()
+                self._dirty = False
+            if self._pending_status is not None and time.monotonic() - self._status_written >= self.status_interval:
+                self._write_status()
+            if time.monotonic() - self._fsynced >= self.fsync_interval:
+                os.fsync(self._events.fileno())
+                self._fsynced = time.monotonic()
+
+    def sync(self) -> None:
+        """Flush everything, write any pending status and fsync the event log."""
+        with self._lock:
+            if self._closed:
+                return
+            self._events.flush()
+            self._transcript.flush()
+            self._dirty = False
+            self._write_status()
+            os.fsync(self._events.fileno())
+            self._fsynced = time.monotonic()
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+            except (OSError, ValueError):
+                return  # files closed underneath us at exit
+
+    def close(self) -> None:
+        self._stop.set()
+        self._flusher.join()
+        with self._lock:
+            if self._closed:
+                return
+            self.end_stream()
+            self.sync()
+            self._closed = True
+            self._events.close()
+            self._transcript.close()
+
+
+# ── Rebuilding views ──────────────────────────────────────────────────────────
+
+def read_events(output_dir: Path):
+    with open(Path(output_dir) / EVENTS_FILENAME, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                return  # torn last line from a crash
+
+
+def render_run(output_dir: Path) -> dict:
+    """Rewrite transcript.md, status.json and result.md from events.jsonl. Returns event counts."""
+    output_dir = Path(output_dir)
+    counts = {"transcript": 0, "status": 0, "result": 0}
+    status = result = None
+    tmp = output_dir / "transcript.md.tmp"
+    with open(tmp, "w", encoding="utf-8") as transcript:
+        for event in read_events(output_dir):
+            kind = event.get("type")
+            if kind == "transcript":
+                transcript.write(event["text"])
+            elif kind == "status":
+                status = event
+            elif kind == "result":
+                result = event
+            if kind in counts:
+                counts[kind] += 1
+    os.replace(tmp, output_dir / "transcript.md")
+    if status is not None:
+        write_atomic(output_dir / "status.json",
+                     render_status(status["status"], status.get("fields", {}), status["updated_at"]))
+    if result is not None:
+        write_atomic(output_dir / "result.md", render_result(result["content"], result["meta"]))
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Collab run event log tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    render_p = sub.add_parser("render", help="Rebuild transcript.md, status.json and result.md from events.jsonl")
+    render_p.add_argument("output_dir")
+    args = parser.parse_args()
+
+    counts = render_run(Path(args.output_dir))
+    print(f"Rendered {counts['transcript']} transcript, {counts['status']} status and "
+          f"{counts['result']} result events in {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,30 +2,44 @@
 """Generate and serve a review page for eval results.
 
 Reads the workspace directory, discovers runs (directories with outputs/),
-embeds all output data into a self-contained HTML page, and serves it via
-a tiny HTTP server. Feedback auto-saves to feedback.json in the workspace.
+and serves a review page via a tiny threaded HTTP server. In server mode
+the page fetches runs a page at a time from /api/runs (with server-side
+filtering) and only gets a manifest of each run's output files; the files
+themselves are fetched from /api/file/<run>/<name> (with ETag, Range and
+gzip support) when a run is viewed. --static writes a self-contained HTML page with every
+output embedded instead, and --static-dir writes a directory (small HTML,
+manifest.json, content-addressed assets/) that stores each unique file once
+and can be opened from disk or any static host. Feedback auto-saves to
+feedback.json in the workspace.
 
 Usage:
     python generate_review.py <workspace-path> [--port PORT] [--skill-name NAME]
-    python generate_review.py <workspace-path> --previous-feedback /path/to/old/feedback.json
+    python generate_review.py <workspace-path> --static review.html
+    python generate_review.py <workspace-path> --static-dir review/
+    python generate_review.py <workspace-path> --previous-workspace /path/to/iteration-1
 
 No dependencies beyond the Python stdlib are required.
 """
 
 import argparse
 import base64
+import difflib
+import gzip
+import hashlib
 import json
 import mimetypes
 import os
 import re
+import shutil
 import signal
 import subprocess
 import sys
+import threading
 import time
-import webbrowser
 from functools import partial
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
 
 # Files to exclude from output listings
 METADATA_FILES = {"transcript.md", "user_notes.md", "metrics.json"}
@@ -48,6 +62,27 @@ MIME_OVERRIDES = {
     ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
 }
 
+# Served files at least this large are gzipped when the client accepts it
+# (text and SVG only — other formats are already compressed)
+GZIP_MIN_BYTES = 1024
+
+# Chunk size for streaming served files
+SEND_CHUNK_BYTES = 64 * 1024
+
+# Default and maximum page sizes for /api/runs
+RUNS_PAGE_SIZE = 50
+RUNS_MAX_PAGE_SIZE = 500
+
+# Serializes feedback.json writes across server threads
+_FEEDBACK_LOCK = threading.Lock()
+
+# Text files larger than this are marked changed without computing a diff
+DIFF_MAX_BYTES = 1_000_000
+
+# path -> (mtime_ns, size, sha256), so unchanged files are hashed only once
+_HASH_CACHE: dict[Path, tuple[int, int, str]] = {}
+_HASH_CACHE_LOCK = threading.Lock()
+
 
 def get_mime_type(path: Path) -> str:
     ext = path.suffix.lower()
@@ -57,32 +92,107 @@ def get_mime_type(path: Path) -> str:
     return mime or "application/octet-stream"
 
 
-def find_runs(workspace: Path) -> list[dict]:
+def get_file_type(path: Path) -> str:
+    """Classify a file as text, image, pdf, xlsx or binary for rendering."""
+    ext = path.suffix.lower()
+    if ext in TEXT_EXTENSIONS:
+        return "text"
+    if ext in IMAGE_EXTENSIONS:
+        return "image"
+    if ext == ".pdf":
+        return "pdf"
+    if ext == ".xlsx":
+        return "xlsx"
+    return "binary"
+
+
+def run_id_for(root: Path, run_dir: Path) -> str:
+    """Derive the stable run id used in feedback.json from a run directory."""
+    return str(run_dir.relative_to(root)).replace("/", "-").replace("\\", "-")
+
+
+def run_config_for(root: Path, run_dir: Path) -> str:
+    """Configuration name of a run (e.g. with_skill), from its directory layout.
+
+    Handles both eval-N/<config>/ and eval-N/<config>/run-M/ layouts.
+    """
+    parts = run_dir.relative_to(root).parts
+    if parts and re.fullmatch(r"run-\d+", parts[-1]):
+        parts = parts[:-1]
+    return parts[-1] if parts else ""
+
+
+def file_url(run_id: str, name: str) -> str:
+    """URL the server mode viewer fetches an output file from."""
+    return f"/api/file/{quote(run_id, safe='')}/{quote(name, safe='')}"
+
+
+def prev_file_url(run_id: str, name: str) -> str:
+    """URL the server mode viewer fetches a previous iteration's output file from."""
+    return f"/api/prev-file/{quote(run_id, safe='')}/{quote(name, safe='')}"
+
+
+def find_run_dirs(workspace: Path) -> list[Path]:
     """Recursively find directories that contain an outputs/ subdirectory."""
+    run_dirs: list[Path] = []
+    _find_runs_recursive(workspace, run_dirs)
+    return run_dirs
+
+
+def find_runs(workspace: Path, embed: bool = True, assets: "AssetStore | None" = None) -> list[dict]:
+    """Build run dicts for every run directory in the workspace.
+
+    With embed=False, output files are described by a manifest entry with a
+    /api/file URL instead of being read and inlined. With an AssetStore,
+    files are copied into it and referenced by their content-addressed path.
+    """
     runs: list[dict] = []
-    _find_runs_recursive(workspace, workspace, runs)
-    runs.sort(key=lambda r: (r.get("eval_id", float("inf")), r["id"]))
+    for run_dir in find_run_dirs(workspace):
+        run = build_run(workspace, run_dir, embed=embed, assets=assets)
+        if run:
+            runs.append(run)
+    runs.sort(key=run_sort_key)
     return runs
 
 
-def _find_runs_recursive(root: Path, current: Path, runs: list[dict]) -> None:
+def run_sort_key(run: dict) -> tuple:
+    """Sort runs by eval_id (runs without one last), then by id."""
+    eval_id = run.get("eval_id")
+    return (eval_id if eval_id is not None else float("inf"), run["id"])
+
+
+# Directories never searched for runs
+SKIP_DIRS = {"node_modules", ".git", "__pycache__", "skill", "inputs"}
+
+
+def _find_runs_recursive(current: Path, run_dirs: list[Path]) -> None:
     if not current.is_dir():
         return
 
     outputs_dir = current / "outputs"
     if outputs_dir.is_dir():
-        run = build_run(root, current)
-        if run:
-            runs.append(run)
+        run_dirs.append(current)
         return
 
-    skip = {"node_modules", ".git", "__pycache__", "skill", "inputs"}
     for child in sorted(current.iterdir()):
-        if child.is_dir() and child.name not in skip:
-            _find_runs_recursive(root, child, runs)
+        if child.is_dir() and child.name not in SKIP_DIRS:
+            _find_runs_recursive(child, run_dirs)
 
 
-def build_run(root: Path, run_dir: Path) -> dict | None:
+def list_output_files(run_dir: Path) -> list[Path]:
+    """Output files of a run, excluding metadata files, sorted by name."""
+    outputs_dir = run_dir / "outputs"
+    if not outputs_dir.is_dir():
+        return []
+    return [
+        f for f in sorted(outputs_dir.iterdir())
+        if f.is_file() and f.name not in METADATA_FILES
+    ]
+
+
+def build_run(
+    root: Path, run_dir: Path, embed: bool = True, assets: "AssetStore | None" = None,
+) -> dict | None:
     """Build a run dict with prompt, outputs, and grading data."""
     prompt = ""
     eval_id = None
@@ -116,15 +226,17 @@ def build_run(root: Path, run_dir: Path) -> dict | None:
     if not prompt:
         prompt = "(No prompt found)"
 
-    run_id = str(run_dir.relative_to(root)).replace("/", "-").replace("\\", "-")
+    run_id = run_id_for(root, run_dir)
 
     # Collect output files
-    outputs_dir = run_dir / "outputs"
     output_files: list[dict] = []
-    if outputs_dir.is_dir():
-        for f in sorted(outputs_dir.iterdir()):
-            if f.is_file() and f.name not in METADATA_FILES:
-                output_files.append(embed_file(f))
+    for f in list_output_files(run_dir):
+        if assets is not None:
+            output_files.append(assets.add(f))
+        elif embed:
+            output_files.append(embed_file(f))
+        else:
+            output_files.append(describe_file(f, file_url(run_id, f.name)))
 
     # Load grading if present
     grading = None
@@ -141,11 +253,253 @@ def build_run(root: Path, run_dir: Path) -> dict | None:
         "id": run_id,
         "prompt": prompt,
         "eval_id": eval_id,
+        "config": run_config_for(root, run_dir),
         "outputs": output_files,
         "grading": grading,
     }
 
 
+def grading_status(run: dict) -> str:
+    """"pass" if every graded expectation passed, "fail" if any failed, else "ungraded"."""
+    grading = run.get("grading")
+    if not grading:
+        return "ungraded"
+    summary = grading.get("summary", {})
+    if summary.get("failed"):
+        return "fail"
+    expectations = grading.get("expectations", [])
+    if any(not exp.get("passed") for exp in expectations):
+        return "fail"
+    return "pass" if (summary.get("total") or expectations) else "ungraded"
+
+
+def filter_runs(
+    runs: list[dict],
+    eval_id: str | None = None,
+    grading: str | None = None,
+    config: str | None = None,
+    query: str | None = None,
+) -> list[dict]:
+    """Filter runs by eval id, grading status, configuration and prompt text.
+
+    Empty filters match everything; the text search is case-insensitive over
+    the prompt and run id.
+    """
+    query = (query or "").strip().lower()
+    matched = []
+    for run in runs:
+        if eval_id and str(run.get("eval_id")) != eval_id:
+            continue
+        if grading and grading_status(run) != grading:
+            continue
+        if config and run.get("config") != config:
+            continue
+        if query and query not in run.get("prompt", "").lower() and query not in run["id"].lower():
+            continue
+        matched.append(run)
+    return matched
+
+
+def runs_page(runs: list[dict], params: dict[str, list[str]]) -> dict:
+    """Build the /api/runs response from parsed query-string params."""
+    def param(name: str) -> str:
+        return params.get(name, [""])[0]
+
+    try:
+        offset = max(int(param("offset") or 0), 0)
+        limit = min(max(int(param("limit") or RUNS_PAGE_SIZE), 0), RUNS_MAX_PAGE_SIZE)
+    except ValueError:
+        offset, limit = 0, RUNS_PAGE_SIZE
+
+    matched = filter_runs(
+        runs,
+        eval_id=param("eval_id"),
+        grading=param("grading"),
+        config=param("config"),
+        query=param("q"),
+    )
+    page = {
+        "total": len(matched),
+        "unfiltered_total": len(runs),
+        "offset": offset,
+        "limit": limit,
+        "runs": matched[offset:offset + limit],
+    }
+    if param("ids") == "1":
+        page["ids"] = [run["id"] for run in matched]
+    if param("facets") == "1":
+        page["facets"] = run_facets(runs)
+    return page
+
+
+def run_facets(runs: list[dict]) -> dict:
+    """Distinct eval ids and configurations, for populating filter controls."""
+    eval_ids = sorted({r["eval_id"] for r in runs if r.get("eval_id") is not None}, key=str)
+    configs = sorted({r["config"] for r in runs if r.get("config")})
+    return {"eval_ids": eval_ids, "configs": configs}
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a path, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def run_signature(run_dir: Path) -> tuple:
+    """Stat signature of everything build_run reads for a run directory.
+
+    Two equal signatures mean the run dict would come out the same, so the
+    cached one can be reused without reading any file contents.
+    """
+    outputs: list[tuple] = []
+    try:
+        with os.scandir(run_dir / "outputs") as entries:
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                outputs.append((entry.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        pass
+    outputs.sort()
+    metadata = tuple(
+        _stat_key(p) for p in (
+            run_dir / "eval_metadata.json",
+            run_dir.parent / "eval_metadata.json",
+            run_dir / "transcript.md",
+            run_dir / "grading.json",
+            run_dir.parent / "grading.json",
+        )
+    )
+    return tuple(outputs), metadata
+
+
+class RunIndex:
+    """In-memory index of a workspace's runs, rebuilt incrementally.
+
+    Directory listings are cached by directory mtime, so a refresh only
+    re-lists directories that gained or lost entries, and each run is only
+    rebuilt when its run_signature() changes. Thread-safe.
+    """
+
+    def __init__(self, workspace: Path, embed: bool = False):
+        self.workspace = workspace
+        self.embed = embed
+        self._lock = threading.Lock()
+        # dir -> (mtime_ns, is_run_dir, child dirs)
+        self._dirs: dict[Path, tuple[int, bool, list[Path]]] = {}
+        # run_dir -> (signature, run dict)
+        self._runs: dict[Path, tuple[tuple, dict]] = {}
+        self._by_id: dict[str, Path] = {}
+        self._sorted: list[dict] = []
+        self.version = 0
+        self.stats: dict = {
+            "full_build_seconds": None,
+            "last_refresh_seconds": None,
+            "last_refresh_rebuilt": 0,
+            "last_refresh_removed": 0,
+            "last_refresh_at": None,
+            "refreshes": 0,
+            "total_rebuilt": 0,
+        }
+
+    def _walk(self, current: Path, run_dirs: list[Path], seen: set[Path]) -> None:
+        try:
+            mtime = current.stat().st_mtime_ns
+        except OSError:
+            return
+        seen.add(current)
+        cached = self._dirs.get(current)
+        if cached and cached[0] == mtime:
+            _, is_run, children = cached
+        else:
+            is_run = (current / "outputs").is_dir()
+            children = []
+            if not is_run:
+                try:
+                    children = sorted(
+                        c for c in current.iterdir()
+                        if c.is_dir() and c.name not in SKIP_DIRS
+                    )
+                except OSError:
+                    pass
+            self._dirs[current] = (mtime, is_run, children)
+        if is_run:
+            run_dirs.append(current)
+            return
+        for child in children:
+            self._walk(child, run_dirs, seen)
+
+    def refresh(self) -> list[dict]:
+        """Rescan the workspace, rebuilding only changed runs. Returns sorted runs."""
+        with self._lock:
+            start = time.perf_counter()
+            first_build = self.stats["full_build_seconds"] is None
+            run_dirs: list[Path] = []
+            seen: set[Path] = set()
+            self._walk(self.workspace, run_dirs, seen)
+            for stale in set(self._dirs) - seen:
+                del self._dirs[stale]
+
+            rebuilt = 0
+            current = set(run_dirs)
+            removed = [d for d in self._runs if d not in current]
+            for run_dir in removed:
+                del self._runs[run_dir]
+            for run_dir in run_dirs:
+                signature = run_signature(run_dir)
+                cached = self._runs.get(run_dir)
+                if cached and cached[0] == signature:
+                    continue
+                run = build_run(self.workspace, run_dir, embed=self.embed)
+                if run:
+                    self._runs[run_dir] = (signature, run)
+                    rebuilt += 1
+
+            if rebuilt or removed or first_build:
+                self._sorted = sorted((run for _, run in self._runs.values()), key=run_sort_key)
+                self._by_id = {run["id"]: d for d, (_, run) in self._runs.items()}
+                self.version += 1
+
+            elapsed = round(time.perf_counter() - start, 6)
+            if first_build:
+                self.stats["full_build_seconds"] = elapsed
+            self.stats.update({
+                "last_refresh_seconds": elapsed,
+                "last_refresh_rebuilt": rebuilt,
+                "last_refresh_removed": len(removed),
+                "last_refresh_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "refreshes": self.stats["refreshes"] + 1,
+                "total_rebuilt": self.stats["total_rebuilt"] + rebuilt,
+            })
+            return self._sorted
+
+    def run_dir(self, run_id: str) -> Path | None:
+        """Directory for a run id, refreshing once if it isn't indexed yet."""
+        with self._lock:
+            run_dir = self._by_id.get(run_id)
+        if run_dir is None:
+            self.refresh()
+            with self._lock:
+                run_dir = self._by_id.get(run_id)
+        return run_dir
+
+    def describe(self) -> dict:
+        """Index size and build timings, for the /api/index endpoint."""
+        with self._lock:
+            return {
+                "workspace": str(self.workspace),
+                "runs": len(self._runs),
+                "dirs_tracked": len(self._dirs),
+                "version": self.version,
+                **self.stats,
+            }
+
+
 def embed_file(path: Path) -> dict:
     """Read a file and return an embedded representation."""
     ext = path.suffix.lower()
@@ -210,10 +564,179 @@ def embed_file(path: Path) -> dict:
         }
 
 
+def describe_file(path: Path, url: str) -> dict:
+    """Return a manifest entry for a file that the viewer fetches from url."""
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return {"name": path.name, "type": "error", "content": "(Error reading file)"}
+    return {
+        "name": path.name,
+        "type": get_file_type(path),
+        "mime": get_mime_type(path),
+        "size": size,
+        "url": url,
+    }
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(SEND_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_sha256(path: Path) -> str:
+    """file_sha256, memoized on the file's (mtime_ns, size)."""
+    st = path.stat()
+    with _HASH_CACHE_LOCK:
+        cached = _HASH_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    digest = file_sha256(path)
+    with _HASH_CACHE_LOCK:
+        _HASH_CACHE[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def files_identical(a: Path, b: Path) -> bool:
+    """Compare two files by size, then by content hash."""
+    try:
+        if a.stat().st_size != b.stat().st_size:
+            return False
+        return cached_sha256(a) == cached_sha256(b)
+    except OSError:
+        return False
+
+
+def text_diff(old: Path, new: Path) -> str | None:
+    """Unified diff from old to new, or None if either is too large to diff."""
+    try:
+        if old.stat().st_size > DIFF_MAX_BYTES or new.stat().st_size > DIFF_MAX_BYTES:
+            return None
+        old_lines = old.read_text(errors="replace").splitlines(keepends=True)
+        new_lines = new.read_text(errors="replace").splitlines(keepends=True)
+    except OSError:
+        return None
+    return "".join(difflib.unified_diff(
+        old_lines, new_lines, fromfile=f"previous/{old.name}", tofile=f"current/{new.name}",
+    ))
+
+
+def compare_outputs(prev_dir: Path | None, cur_dir: Path | None, file_entry) -> list[dict]:
+    """Compare a previous run's output files against the current run's.
+
+    Every entry gets a status: "unchanged" (same content hash — nothing else
+    is included), "changed" (a unified "diff" for text files, otherwise
+    file_entry(prev_path)), "removed" (file_entry(prev_path)) or "added"
+    (name only).
+    """
+    prev_files = {f.name: f for f in list_output_files(prev_dir)} if prev_dir else {}
+    cur_files = {f.name: f for f in list_output_files(cur_dir)} if cur_dir else {}
+
+    entries: list[dict] = []
+    for name, prev_path in prev_files.items():
+        cur_path = cur_files.get(name)
+        file_type = get_file_type(prev_path)
+        if cur_path is not None and files_identical(prev_path, cur_path):
+            entries.append({"name": name, "type": file_type, "status": "unchanged"})
+            continue
+        diff = text_diff(prev_path, cur_path) if cur_path is not None and file_type == "text" else None
+        if diff is not None:
+            # The diff is all the viewer shows, so skip the previous content
+            entries.append({"name": name, "type": file_type, "status": "changed", "diff": diff})
+            continue
+        entry = file_entry(prev_path)
+        entry["status"] = "removed" if cur_path is None else "changed"
+        entries.append(entry)
+    for name in cur_files.keys() - prev_files.keys():
+        entries.append({"name": name, "type": get_file_type(cur_files[name]), "status": "added"})
+    entries.sort(key=lambda e: e["name"])
+    return entries
+
+
+class AssetStore:
+    """Content-addressed asset directory for --static-dir exports.
+
+    Each unique file is copied once to assets/<hash><ext>, however many runs
+    (or previous iterations) it appears in. Text assets are stored with a
+    .txt extension so browsers display them directly when the export is
+    opened from disk, where the viewer cannot fetch() them.
+    """
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+        self.assets_dir = out_dir / "assets"
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        self.files_seen = 0
+        self.bytes_seen = 0
+        self.unique: dict[str, int] = {}  # asset name -> size
+
+    def add(self, path: Path) -> dict:
+        """Store a file (if new) and return its manifest entry."""
+        try:
+            digest = file_sha256(path)
+            size = path.stat().st_size
+        except OSError:
+            return {"name": path.name, "type": "error", "content": "(Error reading file)"}
+        file_type = get_file_type(path)
+        ext = ".txt" if file_type == "text" else path.suffix.lower()
+        asset_name = f"{digest[:20]}{ext}"
+        if asset_name not in self.unique:
+            target = self.assets_dir / asset_name
+            if not target.exists():
+                shutil.copyfile(path, target)
+            self.unique[asset_name] = size
+        self.files_seen += 1
+        self.bytes_seen += size
+        return {
+            "name": path.name,
+            "type": file_type,
+            "mime": get_mime_type(path),
+            "size": size,
+            "sha256": digest,
+            "url": f"assets/{asset_name}",
+        }
+
+    def summary(self) -> dict:
+        unique_bytes = sum(self.unique.values())
+        return {
+            "files": self.files_seen,
+            "unique_assets": len(self.unique),
+            "bytes": self.bytes_seen,
+            "unique_bytes": unique_bytes,
+        }
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range "bytes=start-end" header into inclusive offsets.
+
+    Returns None if the range is malformed or unsatisfiable.
+    """
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", header)
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    if match.group(1):
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+    else:
+        # Suffix range: last N bytes
+        start = max(size - int(match.group(2)), 0)
+        end = size - 1
+    end = min(end, size - 1)
+    if start > end:
+        return None
+    return start, end
+
+
 def load_previous_iteration(workspace: Path) -> dict[str, dict]:
-    """Load previous iteration's feedback and outputs.
+    """Load previous iteration's feedback and locate its runs.
 
-    Returns a map of run_id -> {"feedback": str, "outputs": list[dict]}.
+    Returns a map of run_id -> {"feedback": str, "run_dir": Path | None}.
+    Output files are not read here; they are compared against the current
+    iteration by content hash when needed (see compare_outputs).
     """
     result: dict[str, dict] = {}
 
@@ -231,48 +754,85 @@ def load_previous_iteration(workspace: Path) -> dict[str, dict]:
         except (json.JSONDecodeError, OSError, KeyError):
             pass
 
-    # Load runs (to get outputs)
-    prev_runs = find_runs(workspace)
-    for run in prev_runs:
-        result[run["id"]] = {
-            "feedback": feedback_map.get(run["id"], ""),
-            "outputs": run.get("outputs", []),
+    # Locate runs (outputs are compared lazily)
+    for run_dir in find_run_dirs(workspace):
+        run_id = run_id_for(workspace, run_dir)
+        result[run_id] = {
+            "feedback": feedback_map.get(run_id, ""),
+            "run_dir": run_dir,
         }
 
     # Also add feedback for run_ids that had feedback but no matching run
     for run_id, fb in feedback_map.items():
         if run_id not in result:
-            result[run_id] = {"feedback": fb, "outputs": []}
+            result[run_id] = {"feedback": fb, "run_dir": None}
 
     return result
 
 
+def attach_previous_outputs(
+    previous: dict[str, dict], workspace: Path, file_entry,
+) -> dict[str, dict]:
+    """Add compared "outputs" to each previous run, for static pages.
+
+    file_entry(path) builds the entry for changed/removed files (embedded
+    or asset-backed); unchanged files carry no content at all.
+    """
+    current_dirs = {run_id_for(workspace, d): d for d in find_run_dirs(workspace)}
+    result: dict[str, dict] = {}
+    for run_id, data in previous.items():
+        outputs = []
+        if data.get("run_dir"):
+            outputs = compare_outputs(data["run_dir"], current_dirs.get(run_id), file_entry)
+        result[run_id] = {"feedback": data.get("feedback", ""), "outputs": outputs}
+    return result
+
 def generate_html(
     runs: list[dict],
     skill_name: str,
     previous: dict[str, dict] | None = None,
     benchmark: dict | None = None,
+    runs_api: str | None = None,
+    static_export: bool = False,
 ) -> str:
-    """Generate the complete standalone HTML page with embedded data."""
+    """Generate the complete HTML page with embedded data.
+
+    With runs_api set, runs are not embedded; the page fetches them a page
+    at a time from that endpoint and only the run count is embedded. Likewise
+    previous runs without precomputed "outputs" are only listed, and the page
+    fetches their comparison from /api/previous/<run_id> when opened.
+    """
     template_path = Path(__file__).parent / "viewer.html"
     template = template_path.read_text()
 
     # Build previous_feedback and previous_outputs maps for the template
     previous_feedback: dict[str, str] = {}
     previous_outputs: dict[str, list[dict]] = {}
+    previous_runs: list[str] = []
     if previous:
         for run_id, data in previous.items():
             if data.get("feedback"):
                 previous_feedback[run_id] = data["feedback"]
             if data.get("outputs"):
                 previous_outputs[run_id] = data["outputs"]
+            elif "outputs" not in data and data.get("run_dir"):
+                previous_runs.append(run_id)
 
     embedded = {
         "skill_name": skill_name,
-        "runs": runs,
+        "runs": [] if runs_api else runs,
         "previous_feedback": previous_feedback,
         "previous_outputs": previous_outputs,
     }
+    if previous_runs:
+        embedded["previous_runs"] = previous_runs
+        embedded["previous_api"] = "/api/previous"
+    if static_export:
+        embedded["static_export"] = True
+    if runs_api:
+        embedded["runs_api"] = runs_api
+        embedded["total_runs"] = len(runs)
+        embedded["facets"] = run_facets(runs)
     if benchmark:
         embedded["benchmark"] = benchmark
 
@@ -281,6 +841,48 @@ def generate_html(
     return template.replace("/*__EMBEDDED_DATA__*/", f"const EMBEDDED_DATA = {data_json};")
 
 
+def export_static_dir(
+    out_dir: Path,
+    workspace: Path,
+    skill_name: str,
+    previous_workspace: Path | None = None,
+    benchmark: dict | None = None,
+) -> dict:
+    """Write a static viewer directory with content-addressed assets.
+
+    Layout:
+        <out_dir>/index.html      viewer with the manifest embedded
+        <out_dir>/manifest.json   the same manifest, for tooling
+        <out_dir>/assets/         one file per unique output content
+
+    Returns the AssetStore summary (files seen vs unique assets stored).
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    assets = AssetStore(out_dir)
+    runs = find_runs(workspace, assets=assets)
+    previous = {}
+    if previous_workspace:
+        previous = attach_previous_outputs(load_previous_iteration(previous_workspace), workspace, assets.add)
+
+    html = generate_html(runs, skill_name, previous, benchmark, static_export=True)
+    (out_dir / "index.html").write_text(html)
+
+    manifest = {
+        "skill_name": skill_name,
+        "runs": runs,
+        "previous": previous,
+        "assets": assets.summary(),
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+
+    # Drop assets left over from an earlier export into the same directory
+    for stale in assets.assets_dir.iterdir():
+        if stale.name not in assets.unique:
+            stale.unlink()
+
+    return assets.summary()
+
+
 # ---------------------------------------------------------------------------
 # HTTP server (stdlib only, zero dependencies)
 # ---------------------------------------------------------------------------
@@ -308,13 +910,14 @@ def _kill_port(port: int) -> None:
 class ReviewHandler(BaseHTTPRequestHandler):
     """Serves the review HTML and handles feedback saves.
 
-    Regenerates the HTML on each page load so that refreshing the browser
-    picks up new eval outputs without restarting the server.
+    Refreshes the shared RunIndex on each page load so that refreshing the
+    browser picks up new eval outputs without restarting the server; only
+    runs whose files changed since the last load are rebuilt.
     """
 
     def __init__(
         self,
-        workspace: Path,
+        index: RunIndex,
         skill_name: str,
         feedback_path: Path,
         previous: dict[str, dict],
@@ -322,7 +925,8 @@ class ReviewHandler(BaseHTTPRequestHandler):
         *args,
         **kwargs,
     ):
-        self.workspace = workspace
+        self.index = index
+        self.workspace = index.workspace
         self.skill_name = skill_name
         self.feedback_path = feedback_path
         self.previous = previous
@@ -331,21 +935,47 @@ class ReviewHandler(BaseHTTPRequestHandler):
 
     def do_GET(self) -> None:
         if self.path == "/" or self.path == "/index.html":
-            # Regenerate HTML on each request (re-scans workspace for new outputs)
-            runs = find_runs(self.workspace)
+            # Regenerate HTML on each request (picks up new or changed runs).
+            # Only file manifests are embedded; contents load via /api/file.
+            runs = self.index.refresh()
             benchmark = None
             if self.benchmark_path and self.benchmark_path.exists():
                 try:
                     benchmark = json.loads(self.benchmark_path.read_text())
                 except (json.JSONDecodeError, OSError):
                     pass
-            html = generate_html(runs, self.skill_name, self.previous, benchmark)
+            html = generate_html(runs, self.skill_name, self.previous, benchmark, runs_api="/api/runs")
             content = html.encode("utf-8")
             self.send_response(200)
             self.send_header("Content-Type", "text/html; charset=utf-8")
             self.send_header("Content-Length", str(len(content)))
             self.end_headers()
             self.wfile.write(content)
+        elif self.path == "/api/runs" or self.path.startswith("/api/runs?"):
+            runs = self.index.refresh()
+            page = runs_page(runs, parse_qs(urlsplit(self.path).query))
+            self._send_json(page)
+        elif self.path == "/api/run-ids":
+            self._send_json([run["id"] for run in self.index.refresh()])
+        elif self.path.startswith("/api/file/"):
+            self._serve_output_file(self.path[len("/api/file/"):])
+        elif self.path.startswith("/api/prev-file/"):
+            self._serve_output_file(self.path[len("/api/prev-file/"):], previous=True)
+        elif self.path.startswith("/api/previous/"):
+            run_id = unquote(self.path[len("/api/previous/"):].split("?", 1)[0])
+            prev = self.previous.get(run_id)
+            if not prev or not prev.get("run_dir"):
+                self.send_error(404)
+                return
+            entries = compare_outputs(
+                prev["run_dir"],
+                self.index.run_dir(run_id),
+                lambda path: describe_file(path, prev_file_url(run_id, path.name)),
+            )
+            self._send_json(entries)
+        elif self.path == "/api/index":
+            self.index.refresh()
+            self._send_json(self.index.describe())
         elif self.path == "/api/feedback":
             data = b"{}"
             if self.feedback_path.exists():
@@ -358,6 +988,126 @@ class ReviewHandler(BaseHTTPRequestHandler):
         else:
             self.send_error(404)
 
+    def _send_json(self, obj: object) -> None:
+        data = json.dumps(obj).encode()
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if accepts_gzip and len(data) >= GZIP_MIN_BYTES:
+            data = gzip.compress(data, compresslevel=6)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _serve_output_file(self, rest: str, previous: bool = False) -> None:
+        """Serve <run_id>/<name> from the run's outputs/ directory.
+
+        With previous=True the run is looked up in the previous iteration.
+        """
+        parts = rest.split("?", 1)[0].split("/")
+        if len(parts) != 2:
+            self.send_error(404)
+            return
+        run_id, name = unquote(parts[0]), unquote(parts[1])
+        if "/" in name or "\\" in name or name in ("", ".", "..") or name in METADATA_FILES:
+            self.send_error(404)
+            return
+        if previous:
+            run_dir = self.previous.get(run_id, {}).get("run_dir")
+        else:
+            run_dir = self.index.run_dir(run_id)
+        if run_dir is None:
+            self.send_error(404)
+            return
+        path = run_dir / "outputs" / name
+        if not path.is_file():
+            self.send_error(404)
+            return
+        self._send_file(path)
+
+    def _send_file(self, path: Path) -> None:
+        """Send a file with ETag revalidation, single byte ranges and gzip."""
+        try:
+            st = path.stat()
+        except OSError:
+            self.send_error(404)
+            return
+        size = st.st_size
+        # The gzip and identity representations differ byte for byte, so each gets its own tag
+        etag = f'"{st.st_mtime_ns:x}-{size:x}"'
+        gzip_etag = f'"{st.st_mtime_ns:x}-{size:x}-gz"'
+        mime = get_mime_type(path)
+        if mime.startswith("text/") or get_file_type(path) == "text":
+            mime = f"{mime}; charset=utf-8"
+        compressible = get_file_type(path) == "text" or path.suffix.lower() == ".svg"
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        gzip_full = compressible and accepts_gzip and size >= GZIP_MIN_BYTES
+
+        if {etag, gzip_etag} & {t.strip() for t in self.headers.get("If-None-Match", "").split(",")}:
+            self.send_response(304)
+            self.send_header("ETag", gzip_etag if gzip_full else etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        start, end = 0, size - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            parsed = parse_range(range_header, size)
+            if parsed is None:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return
+            start, end = parsed
+            status = 206
+
+        if status == 200 and gzip_full:
+            try:
+                body = gzip.compress(path.read_bytes(), compresslevel=6)
+            except OSError:
+                self.send_error(500)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", mime)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", gzip_etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        length = end - start + 1 if size else 0
+        self.send_response(status)
+        self.send_header("Content-Type", mime)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        try:
+            with open(path, "rb") as f:
+                f.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(SEND_CHUNK_BYTES, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
     def do_POST(self) -> None:
         if self.path == "/api/feedback":
             length = int(self.headers.get("Content-Length", 0))
@@ -366,7 +1116,10 @@ class ReviewHandler(BaseHTTPRequestHandler):
                 data = json.loads(body)
                 if not isinstance(data, dict) or "reviews" not in data:
                     raise ValueError("Expected JSON object with 'reviews' key")
-                self.feedback_path.write_text(json.dumps(data, indent=2) + "\n")
+                with _FEEDBACK_LOCK:
+                    tmp_path = self.feedback_path.with_suffix(".json.tmp")
+                    tmp_path.write_text(json.dumps(data, indent=2) + "\n")
+                    tmp_path.replace(self.feedback_path)
                 resp = b'{"ok":true}'
                 self.send_response(200)
             except (json.JSONDecodeError, OSError, ValueError) as e:
@@ -397,10 +1150,15 @@ def main() -> None:
         "--benchmark", type=Path, default=None,
         help="Path to benchmark.json to show in the Benchmark tab",
     )
-    parser.add_argument(
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
         "--static", "-s", type=Path, default=None,
         help="Write standalone HTML to this path instead of starting a server",
     )
+    output.add_argument(
+        "--static-dir", type=Path, default=None,
+        help="Write a static viewer directory (HTML, manifest.json, deduplicated assets/) instead of starting a server",
+    )
     args = parser.parse_args()
 
     workspace = args.workspace.resolve()
@@ -408,12 +1166,34 @@ def main() -> None:
         print(f"Error: {workspace} is not a directory", file=sys.stderr)
         sys.exit(1)
 
-    runs = find_runs(workspace)
+    skill_name = args.skill_name or workspace.name.replace("-workspace", "")
+
+    if args.static_dir:
+        if not find_run_dirs(workspace):
+            print(f"No runs found in {workspace}", file=sys.stderr)
+            sys.exit(1)
+        benchmark = None
+        if args.benchmark and args.benchmark.exists():
+            try:
+                benchmark = json.loads(args.benchmark.read_text())
+            except (json.JSONDecodeError, OSError):
+                pass
+        previous_workspace = args.previous_workspace.resolve() if args.previous_workspace else None
+        summary = export_static_dir(args.static_dir, workspace, skill_name, previous_workspace, benchmark)
+        print(f"\n  Static viewer directory written to: {args.static_dir}")
+        print(f"  {summary['files']} files ({summary['bytes']:,} bytes) -> "
+              f"{summary['unique_assets']} unique assets ({summary['unique_bytes']:,} bytes)\n")
+        sys.exit(0)
+
+    if args.static:
+        runs = find_runs(workspace)
+    else:
+        index = RunIndex(workspace)
+        runs = index.refresh()
     if not runs:
         print(f"No runs found in {workspace}", file=sys.stderr)
         sys.exit(1)
 
-    skill_name = args.skill_name or workspace.name.replace("-workspace", "")
     feedback_path = workspace / "feedback.json"
 
     previous: dict[str, dict] = {}
@@ -429,6 +1209,7 @@ def main() -> None:
             pass
 
     if args.static:
+        previous = attach_previous_outputs(previous, workspace, embed_file)
         html = generate_html(runs, skill_name, previous, benchmark)
         args.static.parent.mkdir(parents=True, exist_ok=True)
         args.static.write_text(html)
@@ -438,12 +1219,12 @@ def main() -> None:
     # Kill any existing process on the target port
     port = args.port
     _kill_port(port)
-    handler = partial(ReviewHandler, workspace, skill_name, feedback_path, previous, benchmark_path)
+    handler = partial(ReviewHandler, index, skill_name, feedback_path, previous, benchmark_path)
     try:
-        server = HTTPServer(("127.0.0.1", port), handler)
+        server = ThreadingHTTPServer(("127.0.0.1", port), handler)
     except OSError:
         # Port still in use after kill attempt — find a free one
-        server = HTTPServer(("127.0.0.1", 0), handler)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
         port = server.server_address[1]
 
     url = f"http://localhost:{port}"
@@ -458,6 +1239,8 @@ def main() -> None:
         print(f"  Benchmark: {benchmark_path}")
     print(f"\n  Press Ctrl+C to stop.\n")
 
+    # Imported here so --static and --help don't pay for it
+    import webbrowser
     webbrowser.open(url)
 
     try:
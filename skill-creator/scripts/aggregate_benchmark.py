@@ -7,11 +7,15 @@ Reads grading.json files from run directories and produces:
 - delta between with_skill and without_skill configurations
 
 Usage:
-    python aggregate_benchmark.py <benchmark_dir>
+    python aggregate_benchmark.py <benchmark_dir> [--store <store_dir>]
 
 Example:
     python aggregate_benchmark.py benchmarks/2026-01-15T10-30-00/
 
+With --store, the aggregated runs and per-expectation rows are also written
+to a Parquet dataset partitioned by skill/iteration/configuration (see
+benchmark_store.py) for cross-iteration trend queries in DuckDB.
+
 The script supports two directory layouts:
 
     Workspace layout (from skill-creator iterations):
@@ -359,6 +363,17 @@ def main():
         type=Path,
         help="Output path for benchmark.json (default: <benchmark_dir>/benchmark.json)"
     )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        help="Also write runs and expectations to this Parquet benchmark store (requires pyarrow)"
+    )
+    parser.add_argument(
+        "--iteration",
+        type=int,
+        default=None,
+        help="Iteration number for the store (default: inferred from an iteration-N path component)"
+    )
 
     args = parser.parse_args()
 
@@ -384,6 +399,16 @@ def main():
         f.write(markdown)
     print(f"Generated: {output_md}")
 
+    # Write to the columnar store
+    if args.store:
+        from scripts.benchmark_store import infer_iteration, write_benchmark_store
+        iteration = args.iteration if args.iteration is not None else infer_iteration(args.benchmark_dir)
+        try:
+            counts = write_benchmark_store(benchmark, args.store, iteration)
+            print(f"Stored: {counts['runs']} runs, {counts['expectations']} expectations -> {args.store}")
+        except ImportError as e:
+            print(f"Warning: {e}")
+
     # Print summary
     run_summary = benchmark["run_summary"]
     configs = [k for k in run_summary if k != "delta"]
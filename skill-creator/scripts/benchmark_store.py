@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Columnar benchmark store for cross-iteration analysis.
+
+benchmark.json is a nested document per iteration directory, so comparing
+pass rate, time and tokens across many iterations means loading and walking
+many JSON trees. This module flattens each benchmark into two Parquet
+datasets, hive-partitioned by skill/iteration/configuration:
+
+    <store_dir>/
+    ├── runs/skill=<name>/iteration=<N>/configuration=<config>/*.parquet
+    └── expectations/skill=<name>/iteration=<N>/configuration=<config>/*.parquet
+
+Re-aggregating an iteration replaces its partitions, so the store always
+holds the latest numbers for each (skill, iteration). Trend queries then run
+in DuckDB over the whole store.
+
+Requires pyarrow for writing and duckdb for querying (both optional — the
+rest of skill-creator works without them).
+
+Usage:
+    # Add an iteration's benchmark.json to the store
+    python -m scripts.benchmark_store add <workspace>/iteration-3/benchmark.json --store <store_dir>
+
+    # Pass rate / time / tokens per iteration and configuration
+    python -m scripts.benchmark_store trends --store <store_dir> [--skill <name>]
+
+    # Ad-hoc SQL over the `runs` and `expectations` views
+    python -m scripts.benchmark_store query --store <store_dir> \\
+        --sql "SELECT iteration, avg(pass_rate) FROM runs GROUP BY 1 ORDER BY 1"
+"""
+
+import argparse
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+from urllib.parse import quote
+
+PARTITION_COLS = ["skill", "iteration", "configuration"]
+
+TRENDS_SQL = """
+SELECT
+    skill,
+    iteration,
+    configuration,
+    count(*)                      AS runs,
+    round(avg(pass_rate), 4)      AS pass_rate_mean,
+    round(stddev_samp(pass_rate), 4) AS pass_rate_stddev,
+    round(avg(time_seconds), 2)   AS time_seconds_mean,
+    round(avg(tokens), 0)         AS tokens_mean
+FROM runs
+{where}
+GROUP BY skill, iteration, configuration
+ORDER BY skill, iteration, configuration
+"""
+
+
+def infer_iteration(path: Path) -> int:
+    """Infer the iteration number from an `iteration-N` directory in the path, or 0."""
+    for part in reversed(path.resolve().parts):
+        match = re.fullmatch(r"iteration-(\d+)", part)
+        if match:
+            return int(match.group(1))
+    return 0
+
+
+def flatten_benchmark(benchmark: dict, iteration: int) -> tuple[list[dict], list[dict]]:
+    """
+    Flatten a benchmark.json dict into (run_rows, expectation_rows).
+
+    Every row carries the partition columns so the two tables can be joined
+    on (skill, iteration, configuration, eval_id, run_number).
+    """
+    metadata = benchmark.get("metadata", {})
+    skill = metadata.get("skill_name") or "unknown"
+    timestamp = metadata.get("timestamp", "")
+
+    run_rows = []
+    expectation_rows = []
+    for run in benchmark.get("runs", []):
+        result = run.get("result", {})
+        key = {
+            "skill": skill,
+            "iteration": iteration,
+            "configuration": run.get("configuration", ""),
+            "eval_id": str(run.get("eval_id", "")),
+            "run_number": int(run.get("run_number", 0)),
+        }
+        run_rows.append({
+            **key,
+            "eval_name": run.get("eval_name", ""),
+            "timestamp": timestamp,
+            "pass_rate": float(result.get("pass_rate", 0.0)),
+            "passed": int(result.get("passed", 0)),
+            "failed": int(result.get("failed", 0)),
+            "total": int(result.get("total", 0)),
+            "time_seconds": float(result.get("time_seconds", 0.0)),
+            "tokens": int(result.get("tokens", 0)),
+            "tool_calls": int(result.get("tool_calls", 0)),
+            "errors": int(result.get("errors", 0)),
+            "note_count": len(run.get("notes", [])),
+        })
+        for idx, exp in enumerate(run.get("expectations", [])):
+            expectation_rows.append({
+                **key,
+                "expectation_index": idx,
+                "text": exp.get("text", ""),
+                "passed": bool(exp.get("passed", False)),
+                "evidence": exp.get("evidence", ""),
+            })
+
+    return run_rows, expectation_rows
+
+
+def _remove_iteration(table_dir: Path, skill: str, iteration: int) -> None:
+    """Remove a table's `skill=/iteration=` directory so a re-add starts from nothing."""
+    shutil.rmtree(table_dir / f"skill={quote(skill, safe='')}" / f"iteration={iteration}", ignore_errors=True)
+
+
+def write_benchmark_store(benchmark: dict, store_dir: Path, iteration: int) -> dict:
+    """
+    Write one benchmark into the Parquet store, replacing that iteration's partitions.
+
+    Returns a dict with the number of run and expectation rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required for the benchmark store. Install with: pip install pyarrow")
+
+    run_rows, expectation_rows = flatten_benchmark(benchmark, iteration)
+    skill = benchmark.get("metadata", {}).get("skill_name") or "unknown"
+
+    for table_name, rows in (("runs", run_rows), ("expectations", expectation_rows)):
+        _remove_iteration(store_dir / table_name, skill, iteration)
+        if not rows:
+            continue
+        pq.write_to_dataset(
+            pa.Table.from_pylist(rows),
+            root_path=str(store_dir / table_name),
+            partition_cols=PARTITION_COLS,
+            basename_template=f"{skill}-{iteration}-{{i}}.parquet",
+        )
+
+    return {"runs": len(run_rows), "expectations": len(expectation_rows)}
+
+
+def connect_store(store_dir: Path):
+    """Open an in-memory DuckDB connection with `runs` and `expectations` views over the store."""
+    try:
+        import duckdb
+    except ImportError:
+        raise ImportError("duckdb is required to query the benchmark store. Install with: pip install duckdb")
+
+    conn = duckdb.connect()
+    for table_name in ("runs", "expectations"):
+        table_dir = store_dir / table_name
+        if not table_dir.exists():
+            continue
+        glob = (table_dir / "**" / "*.parquet").as_posix()
+        conn.execute(
+            f"CREATE VIEW {table_name} AS "
+            f"SELECT * FROM read_parquet('{glob}', hive_partitioning = true)"
+        )
+    return conn
+
+
+def query_store(store_dir: Path, sql: str, params: list | None = None) -> list[dict]:
+    """Run SQL against the store and return rows as dicts."""
+    conn = connect_store(store_dir)
+    cursor = conn.execute(sql, params or [])
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def query_trends(store_dir: Path, skill: str = "") -> list[dict]:
+    """Pass rate, time and tokens per (skill, iteration, configuration)."""
+    if skill:
+        return query_store(store_dir, TRENDS_SQL.format(where="WHERE skill = ?"), [skill])
+    return query_store(store_dir, TRENDS_SQL.format(where=""))
+
+
+def print_rows(rows: list[dict]) -> None:
+    """Print rows as a plain aligned table."""
+    if not rows:
+        print("(no rows)")
+        return
+    columns = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar benchmark store for cross-iteration analysis")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add_p = sub.add_parser("add", help="Add a benchmark.json to the store")
+    add_p.add_argument("benchmark", type=Path, help="Path to benchmark.json")
+    add_p.add_argument("--store", type=Path, required=True, help="Store directory")
+    add_p.add_argument("--iteration", type=int, default=None,
+                       help="Iteration number (default: inferred from an iteration-N path component)")
+
+    trends_p = sub.add_parser("trends", help="Show per-iteration trends")
+    trends_p.add_argument("--store", type=Path, required=True, help="Store directory")
+    trends_p.add_argument("--skill", default="", help="Only show this skill")
+
+    query_p = sub.add_parser("query", help="Run SQL over the runs/expectations views")
+    query_p.add_argument("--store", type=Path, required=True, help="Store directory")
+    query_p.add_argument("--sql", required=True, help="SQL query")
+    query_p.add_argument("--json", action="store_true", help="Print rows as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "add":
+            if not args.benchmark.exists():
+                print(f"File not found: {args.benchmark}")
+                sys.exit(1)
+            benchmark = json.loads(args.benchmark.read_text())
+            iteration = args.iteration if args.iteration is not None else infer_iteration(args.benchmark.parent)
+            counts = write_benchmark_store(benchmark, args.store, iteration)
+            print(f"Stored iteration {iteration}: {counts['runs']} runs, {counts['expectations']} expectations -> {args.store}")
+        elif not (args.store / "runs").exists():
+            print(f"No benchmarks stored in {args.store}")
+            sys.exit(1)
+        elif args.command == "trends":
+            print_rows(query_trends(args.store, args.skill))
+        else:
+            rows = query_store(args.store, args.sql)
+            if args.json:
+                print(json.dumps(rows, indent=2, default=str))
+            else:
+                print_rows(rows)
+    except ImportError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
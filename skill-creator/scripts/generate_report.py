@@ -4,22 +4,55 @@
 Takes the JSON output from run_loop.py and generates a visual HTML report
 showing each description attempt with check/x for each test case.
 Distinguishes between train and test queries.
+
+Large histories (many iterations x many queries) are rendered in compact
+mode: the results are embedded as a small JSON payload and drawn by a
+virtualized grid that only keeps the visible cells in the DOM, instead of
+a full HTML table. Use --mode to force either layout, and --benchmark to
+time both on a synthetic history.
 """
 
 import argparse
 import html
 import json
+import random
 import sys
+import time
 from pathlib import Path
 
-
-def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "") -> str:
-    """Generate HTML report from loop output data. If auto_refresh is True, adds a meta refresh tag."""
-    history = data.get("history", [])
-    holdout = data.get("holdout", 0)
-    title_prefix = html.escape(skill_name + " \u2014 ") if skill_name else ""
-
-    # Get all unique queries from train and test sets, with should_trigger info
+# Above this many result cells (iterations x queries), "auto" mode switches
+# from the full HTML table to the compact virtualized grid
+LARGE_HISTORY_CELLS = 2000
+
+
+def aggregate_runs(results: list[dict]) -> tuple[int, int]:
+    """Compute aggregate correct/total runs across all retries."""
+    correct = 0
+    total = 0
+    for r in results:
+        runs = r.get("runs", 0)
+        triggers = r.get("triggers", 0)
+        total += runs
+        if r.get("should_trigger", True):
+            correct += triggers
+        else:
+            correct += runs - triggers
+    return correct, total
+
+
+def score_class(correct: int, total: int) -> str:
+    """CSS class for a correct/total score."""
+    if total > 0:
+        ratio = correct / total
+        if ratio >= 0.8:
+            return "score-good"
+        elif ratio >= 0.5:
+            return "score-ok"
+    return "score-bad"
+
+
+def collect_queries(history: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Train and test query columns (with should_trigger), from the first iteration."""
     train_queries: list[dict] = []
     test_queries: list[dict] = []
     if history:
@@ -28,10 +61,39 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         if history[0].get("test_results"):
             for r in history[0].get("test_results", []):
                 test_queries.append({"query": r["query"], "should_trigger": r.get("should_trigger", True)})
+    return train_queries, test_queries
+
+
+def find_best_iteration(history: list[dict], has_test: bool):
+    """Iteration number to highlight: best test score, or best train score without a test set."""
+    if not history:
+        return None
+    if has_test:
+        return max(history, key=lambda h: h.get("test_passed") or 0).get("iteration")
+    return max(history, key=lambda h: h.get("train_passed", h.get("passed", 0))).get("iteration")
+
+
+def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "", mode: str = "auto") -> str:
+    """Generate HTML report from loop output data. If auto_refresh is True, adds a meta refresh tag.
 
+    mode is "table" (full HTML table), "compact" (JSON payload + virtualized
+    grid) or "auto" (compact once the history exceeds LARGE_HISTORY_CELLS).
+    """
+    history = data.get("history", [])
+    train_queries, test_queries = collect_queries(history)
+    if mode == "auto":
+        cells = len(history) * (len(train_queries) + len(test_queries))
+        mode = "compact" if cells > LARGE_HISTORY_CELLS else "table"
+    if mode == "compact":
+        return generate_compact_html(data, auto_refresh=auto_refresh, skill_name=skill_name)
+    return generate_table_html(data, auto_refresh=auto_refresh, skill_name=skill_name)
+
+
+def _page_head(title_prefix: str, auto_refresh: bool, extra_css: str = "") -> str:
+    """Shared <head>, title and explainer for both report layouts."""
     refresh_tag = '    <meta http-equiv="refresh" content="5">\n' if auto_refresh else ""
 
-    html_parts = ["""<!DOCTYPE html>
+    return """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
@@ -143,29 +205,27 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         .swatch-negative { background: #141413; border-bottom: 3px solid #c44; }
         .swatch-test { background: #6a9bcc; }
         .swatch-train { background: #141413; }
-    </style>
+""" + extra_css + """    </style>
 </head>
 <body>
     <h1>""" + title_prefix + """Skill Description Optimization</h1>
     <div class="explainer">
         <strong>Optimizing your skill's description.</strong> This page updates automatically as Claude tests different versions of your skill's description. Each row is an iteration — a new description attempt. The columns show test queries: green checkmarks mean the skill triggered correctly (or correctly didn't trigger), red crosses mean it got it wrong. The "Train" score shows performance on queries used to improve the description; the "Test" score shows performance on held-out queries the optimizer hasn't seen. When it's done, Claude will apply the best-performing description to your skill.
     </div>
-"""]
+"""
+
 
-    # Summary section
+def _summary_html(data: dict) -> str:
+    """Shared summary box and legend for both report layouts."""
     best_test_score = data.get('best_test_score')
-    best_train_score = data.get('best_train_score')
-    html_parts.append(f"""
+    return f"""
     <div class="summary">
         <p><strong>Original:</strong> {html.escape(data.get('original_description', 'N/A'))}</p>
         <p class="best"><strong>Best:</strong> {html.escape(data.get('best_description', 'N/A'))}</p>
         <p><strong>Best Score:</strong> {data.get('best_score', 'N/A')} {'(test)' if best_test_score else '(train)'}</p>
         <p><strong>Iterations:</strong> {data.get('iterations_run', 0)} | <strong>Train:</strong> {data.get('train_size', '?')} | <strong>Test:</strong> {data.get('test_size', '?')}</p>
     </div>
-""")
 
-    # Legend
-    html_parts.append("""
     <div class="legend">
         <span style="font-weight:600">Query columns:</span>
         <span class="legend-item"><span class="legend-swatch swatch-positive"></span> Should trigger</span>
@@ -173,7 +233,16 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         <span class="legend-item"><span class="legend-swatch swatch-train"></span> Train</span>
         <span class="legend-item"><span class="legend-swatch swatch-test"></span> Test</span>
     </div>
-""")
+"""
+
+
+def generate_table_html(data: dict, auto_refresh: bool = False, skill_name: str = "") -> str:
+    """Full HTML table layout: one row per iteration, one column per query."""
+    history = data.get("history", [])
+    title_prefix = html.escape(skill_name + " \u2014 ") if skill_name else ""
+    train_queries, test_queries = collect_queries(history)
+
+    html_parts = [_page_head(title_prefix, auto_refresh), _summary_html(data)]
 
     # Table header
     html_parts.append("""
@@ -203,10 +272,7 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
 """)
 
     # Find best iteration for highlighting
-    if test_queries:
-        best_iter = max(history, key=lambda h: h.get("test_passed") or 0).get("iteration")
-    else:
-        best_iter = max(history, key=lambda h: h.get("train_passed", h.get("passed", 0))).get("iteration")
+    best_iter = find_best_iteration(history, bool(test_queries))
 
     # Add rows for each iteration
     for h in history:
@@ -223,33 +289,9 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         train_by_query = {r["query"]: r for r in train_results}
         test_by_query = {r["query"]: r for r in test_results} if test_results else {}
 
-        # Compute aggregate correct/total runs across all retries
-        def aggregate_runs(results: list[dict]) -> tuple[int, int]:
-            correct = 0
-            total = 0
-            for r in results:
-                runs = r.get("runs", 0)
-                triggers = r.get("triggers", 0)
-                total += runs
-                if r.get("should_trigger", True):
-                    correct += triggers
-                else:
-                    correct += runs - triggers
-            return correct, total
-
         train_correct, train_runs = aggregate_runs(train_results)
         test_correct, test_runs = aggregate_runs(test_results)
 
-        # Determine score classes
-        def score_class(correct: int, total: int) -> str:
-            if total > 0:
-                ratio = correct / total
-                if ratio >= 0.8:
-                    return "score-good"
-                elif ratio >= 0.5:
-                    return "score-ok"
-            return "score-bad"
-
         train_class = score_class(train_correct, train_runs)
         test_class = score_class(test_correct, test_runs)
 
@@ -301,19 +343,311 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
     return "".join(html_parts)
 
 
+def build_report_payload(data: dict) -> dict:
+    """Compact JSON payload for the virtualized grid.
+
+    Query columns are listed once; each history row carries its scores and
+    a flat [pass, triggers, runs, pass, triggers, runs, ...] array aligned
+    with the columns, instead of repeating query text per cell.
+    """
+    history = data.get("history", [])
+    train_queries, test_queries = collect_queries(history)
+    columns = [q["query"] for q in train_queries] + [q["query"] for q in test_queries]
+
+    rows = []
+    for h in history:
+        train_results = h.get("train_results", h.get("results", []))
+        test_results = h.get("test_results", [])
+        by_query = {r["query"]: r for r in train_results}
+        test_by_query = {r["query"]: r for r in test_results}
+
+        cells: list[int] = []
+        for i, query in enumerate(columns):
+            r = (by_query if i < len(train_queries) else test_by_query).get(query, {})
+            cells.extend((1 if r.get("pass", False) else 0, r.get("triggers", 0), r.get("runs", 0)))
+
+        train_correct, train_runs = aggregate_runs(train_results)
+        test_correct, test_runs = aggregate_runs(test_results)
+        rows.append({
+            "i": h.get("iteration", "?"),
+            "tr": [train_correct, train_runs, score_class(train_correct, train_runs)],
+            "te": [test_correct, test_runs, score_class(test_correct, test_runs)],
+            "d": h.get("description", ""),
+            "c": cells,
+        })
+
+    return {
+        "queries": [
+            {"q": q["query"], "t": 1 if q["should_trigger"] else 0, "test": 0} for q in train_queries
+        ] + [
+            {"q": q["query"], "t": 1 if q["should_trigger"] else 0, "test": 1} for q in test_queries
+        ],
+        "rows": rows,
+        "best": find_best_iteration(history, bool(test_queries)),
+    }
+
+
+COMPACT_CSS = """        .grid {
+            position: relative;
+            overflow: auto;
+            height: 75vh;
+            background: white;
+            border: 1px solid #e8e6dc;
+            border-radius: 6px;
+            font-size: 12px;
+        }
+        .grid-layer { position: absolute; top: 0; left: 0; }
+        .grid .cell {
+            position: absolute;
+            box-sizing: border-box;
+            border-right: 1px solid #e8e6dc;
+            border-bottom: 1px solid #e8e6dc;
+            padding: 4px 6px;
+            overflow: hidden;
+            background: white;
+        }
+        .grid .cell.result { text-align: center; font-size: 16px; padding-top: 8px; }
+        .grid .cell.result.test-result { background: #f0f6fc; }
+        .grid .cell.head {
+            font-family: 'Poppins', sans-serif;
+            background: #141413;
+            color: #faf9f5;
+            font-weight: 500;
+            font-size: 11px;
+            line-height: 1.3;
+        }
+        .grid .cell.head.test-col { background: #6a9bcc; }
+        .grid .cell.head.positive-col { border-bottom: 3px solid #788c5d; }
+        .grid .cell.head.negative-col { border-bottom: 3px solid #c44; }
+        .grid .cell.description { font-family: monospace; font-size: 11px; cursor: pointer; }
+        .grid .cell.best-row { background: #f5f8f2; }
+        .grid-layer.frozen .cell { z-index: 1; }
+        .grid-layer.header .cell { z-index: 2; }
+        .grid-layer.corner .cell { z-index: 3; }
+        .detail {
+            background: white;
+            padding: 10px 15px;
+            border-radius: 6px;
+            border: 1px solid #e8e6dc;
+            margin-top: 10px;
+            font-family: monospace;
+            font-size: 12px;
+            white-space: pre-wrap;
+            display: none;
+        }
+"""
+
+COMPACT_SCRIPT = """
+    <script>
+    const P = REPORT_PAYLOAD;
+    const ROW_H = 56, HEAD_H = 120, COL_W = 56;
+    const FROZEN = [["Iter", 48], ["Train", 72], ["Test", 72], ["Description", 360]];
+    const FROZEN_W = FROZEN.reduce((a, [, w]) => a + w, 0);
+    const NQ = P.queries.length, NR = P.rows.length;
+    const grid = document.getElementById("grid");
+    const layers = {};
+    for (const name of ["body", "frozen", "header", "corner"]) {
+        const el = document.createElement("div");
+        el.className = "grid-layer " + name;
+        grid.appendChild(el);
+        layers[name] = el;
+    }
+    const sizer = document.createElement("div");
+    sizer.style.width = (FROZEN_W + NQ * COL_W) + "px";
+    sizer.style.height = (HEAD_H + NR * ROW_H) + "px";
+    grid.appendChild(sizer);
+
+    function esc(s) {
+        return String(s).replace(/[&<>"]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+    }
+    function cell(x, y, w, h, cls, inner, title) {
+        return '<div class="cell ' + cls + '" style="left:' + x + 'px;top:' + y + 'px;width:' + w + 'px;height:' + h + 'px"'
+            + (title ? ' title="' + esc(title) + '"' : "") + '>' + inner + '</div>';
+    }
+    function frozenCells(row, y) {
+        const best = row.i === P.best ? " best-row" : "";
+        let x = 0, out = "";
+        const values = [
+            esc(row.i),
+            '<span class="score ' + row.tr[2] + '">' + row.tr[0] + "/" + row.tr[1] + "</span>",
+            '<span class="score ' + row.te[2] + '">' + row.te[0] + "/" + row.te[1] + "</span>",
+            esc(row.d),
+        ];
+        FROZEN.forEach(([, w], k) => {
+            out += cell(x, y, w, ROW_H, (k === 3 ? "description" : "") + best, values[k], k === 3 ? row.d : "");
+            x += w;
+        });
+        return out;
+    }
+
+    let pending = false;
+    function render() {
+        pending = false;
+        const top = grid.scrollTop, left = grid.scrollLeft;
+        const r0 = Math.max(0, Math.floor(top / ROW_H) - 2);
+        const r1 = Math.min(NR, Math.ceil((top + grid.clientHeight) / ROW_H) + 2);
+        const c0 = Math.max(0, Math.floor(left / COL_W) - 2);
+        const c1 = Math.min(NQ, Math.ceil((left + grid.clientWidth) / COL_W) + 2);
+
+        let body = "", frozen = "", header = "", corner = "";
+        for (let r = r0; r < r1; r++) {
+            const row = P.rows[r];
+            const y = HEAD_H + r * ROW_H;
+            for (let c = c0; c < c1; c++) {
+                const pass = row.c[c * 3], triggers = row.c[c * 3 + 1], runs = row.c[c * 3 + 2];
+                const cls = "result " + (pass ? "pass" : "fail") + (P.queries[c].test ? " test-result" : "");
+                body += cell(FROZEN_W + c * COL_W, y, COL_W, ROW_H, cls,
+                    (pass ? "\u2713" : "\u2717") + '<span class="rate">' + triggers + "/" + runs + "</span>");
+            }
+            frozen += frozenCells(row, y);
+        }
+        for (let c = c0; c < c1; c++) {
+            const q = P.queries[c];
+            const cls = "head " + (q.test ? "test-col " : "") + (q.t ? "positive-col" : "negative-col");
+            header += cell(FROZEN_W + c * COL_W, 0, COL_W, HEAD_H, cls, esc(q.q.slice(0, 80)), q.q);
+        }
+        let x = 0;
+        for (const [label, w] of FROZEN) {
+            corner += cell(x, 0, w, HEAD_H, "head", label);
+            x += w;
+        }
+        layers.body.innerHTML = body;
+        layers.frozen.innerHTML = frozen;
+        layers.header.innerHTML = header;
+        layers.corner.innerHTML = corner;
+        // Pin the header row and the frozen columns while scrolling
+        layers.frozen.style.transform = "translateX(" + left + "px)";
+        layers.header.style.transform = "translateY(" + top + "px)";
+        layers.corner.style.transform = "translate(" + left + "px," + top + "px)";
+    }
+    function schedule() {
+        if (!pending) {
+            pending = true;
+            requestAnimationFrame(render);
+        }
+    }
+    grid.addEventListener("scroll", schedule);
+    window.addEventListener("resize", schedule);
+    grid.addEventListener("click", e => {
+        const el = e.target.closest(".description");
+        if (!el) return;
+        const detail = document.getElementById("detail");
+        detail.textContent = el.title;
+        detail.style.display = "block";
+    });
+    render();
+    </script>
+"""
+
+
+def generate_compact_html(data: dict, auto_refresh: bool = False, skill_name: str = "") -> str:
+    """Compact layout: JSON payload plus a virtualized grid for large histories."""
+    title_prefix = html.escape(skill_name + " \u2014 ") if skill_name else ""
+    payload = json.dumps(build_report_payload(data), separators=(",", ":"))
+    # Keep the payload from closing the <script> element early
+    payload = payload.replace("</", "<\\/")
+
+    return "".join([
+        _page_head(title_prefix, auto_refresh, extra_css=COMPACT_CSS),
+        _summary_html(data),
+        """
+    <div class="grid" id="grid"></div>
+    <div class="detail" id="detail"></div>
+    <script>const REPORT_PAYLOAD = """ + payload + """;</script>""",
+        COMPACT_SCRIPT,
+        """
+</body>
+</html>
+""",
+    ])
+
+
+def synthetic_history(n_queries: int = 200, n_iterations: int = 50, seed: int = 0) -> dict:
+    """A run_loop-shaped output with n_queries (60/40 train/test) over n_iterations."""
+    rng = random.Random(seed)
+    queries = [
+        {"query": f"synthetic query {i}: " + " ".join(rng.choice(["pdf", "chart", "merge", "xlsx", "deploy", "review"]) for _ in range(12)),
+         "should_trigger": rng.random() < 0.5}
+        for i in range(n_queries)
+    ]
+    n_train = int(n_queries * 0.6)
+    train, test = queries[:n_train], queries[n_train:]
+
+    def results(qs: list[dict]) -> list[dict]:
+        out = []
+        for q in qs:
+            triggers = rng.randint(0, 3)
+            passed = triggers >= 2 if q["should_trigger"] else triggers <= 1
+            out.append({**q, "triggers": triggers, "runs": 3, "pass": passed})
+        return out
+
+    history = []
+    for it in range(1, n_iterations + 1):
+        train_results, test_results = results(train), results(test)
+        history.append({
+            "iteration": it,
+            "description": f"Iteration {it} description. " + "Use this skill whenever the user asks about documents. " * 6,
+            "train_passed": sum(r["pass"] for r in train_results),
+            "train_total": len(train_results),
+            "test_passed": sum(r["pass"] for r in test_results),
+            "test_total": len(test_results),
+            "train_results": train_results,
+            "test_results": test_results,
+        })
+    return {
+        "original_description": history[0]["description"],
+        "best_description": history[-1]["description"],
+        "best_score": "n/a",
+        "iterations_run": n_iterations,
+        "train_size": len(train),
+        "test_size": len(test),
+        "history": history,
+    }
+
+
+def run_benchmark(n_queries: int = 200, n_iterations: int = 50, repeat: int = 3) -> list[dict]:
+    """Time both layouts on a synthetic history; returns one result per mode."""
+    data = synthetic_history(n_queries, n_iterations)
+    results = []
+    for mode in ("table", "compact"):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = generate_html(data, mode=mode)
+            timings.append(time.perf_counter() - start)
+        results.append({
+            "mode": mode,
+            "seconds": round(min(timings), 4),
+            "bytes": len(output.encode("utf-8")),
+            "dom_cells": output.count("<td") + output.count("<th"),
+        })
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate HTML report from run_loop output")
-    parser.add_argument("input", help="Path to JSON output from run_loop.py (or - for stdin)")
+    parser.add_argument("input", nargs="?", help="Path to JSON output from run_loop.py (or - for stdin)")
     parser.add_argument("-o", "--output", default=None, help="Output HTML file (default: stdout)")
     parser.add_argument("--skill-name", default="", help="Skill name to include in the report title")
+    parser.add_argument("--mode", choices=["auto", "table", "compact"], default="auto",
+                        help=f"Report layout (default: auto — compact above {LARGE_HISTORY_CELLS} result cells)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time both layouts on a synthetic 200-query x 50-iteration history and exit")
     args = parser.parse_args()
 
+    if args.benchmark:
+        for r in run_benchmark():
+            print(f"{r['mode']:>8}: {r['seconds']:.4f}s  {r['bytes']:>10,} bytes  {r['dom_cells']:>6} table cells in HTML")
+        return
+    if not args.input:
+        parser.error("input is required unless --benchmark is given")
+
     if args.input == "-":
         data = json.load(sys.stdin)
     else:
         data = json.loads(Path(args.input).read_text())
 
-    html_output = generate_html(data, skill_name=args.skill_name)
+    html_output = generate_html(data, skill_name=args.skill_name, mode=args.mode)
 
     if args.output:
         Path(args.output).write_text(html_output)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Startup profile and import-time budget for skill-creator entry points.
+
+Each entry point is run in a fresh interpreter with `-X importtime`, both
+as a CLI (`--help`) and as a process-pool worker would bootstrap it (just
+importing the module that holds the worker function). The check fails if:
+
+- a heavy module listed in FORBIDDEN is imported at startup (deterministic,
+  so this catches regressions like a top-level `import anthropic`),
+- a bare import of a LEAN_IMPORTS module leaves one of its listed modules
+  in sys.modules, or
+- the import time on top of a bare interpreter exceeds the entry's budget
+  (best of --repeat runs; scale budgets with --budget-scale on slow CI).
+
+Usage:
+    python -m scripts.import_budget                 # check, exit 1 on failure
+    python -m scripts.import_budget --profile 10    # also show the 10 slowest imports per entry point
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SKILL_CREATOR_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that no entry point should import before it actually needs them.
+FORBIDDEN = {"anthropic", "webbrowser", "pyarrow", "duckdb"}
+
+# Modules a bare import of these must not pull in; checked through sys.modules,
+# which is exact where wall-clock budgets are noisy.
+LEAN_IMPORTS = {
+    "scripts.run_eval": {"yaml", "anthropic", "webbrowser", "scripts.generate_report"},
+    "scripts.run_loop": {"yaml", "anthropic", "webbrowser", "scripts.generate_report"},
+}
+
+# (label, interpreter args, budget in ms of import time above a bare interpreter,
+# about 1.3x the measured time)
+ENTRY_POINTS = [
+    ("run_loop --help", ["-m", "scripts.run_loop", "--help"], 25),
+    ("run_eval --help", ["-m", "scripts.run_eval", "--help"], 20),
+    ("improve_description --help", ["-m", "scripts.improve_description", "--help"], 15),
+    ("generate_report --help", ["-m", "scripts.generate_report", "--help"], 15),
+    ("aggregate_benchmark --help", ["-m", "scripts.aggregate_benchmark", "--help"], 15),
+    ("benchmark_store --help", ["-m", "scripts.benchmark_store", "--help"], 20),
+    ("package_skill --help", ["-m", "scripts.package_skill", "--help"], 20),
+    ("validate_skills --help", ["-m", "scripts.validate_skills", "--help"], 25),
+    ("skill_registry --help", ["-m", "scripts.skill_registry", "--help"], 25),
+    ("generate_review --help", ["eval-viewer/generate_review.py", "--help"], 80),
+    # What a spawn/forkserver pool worker imports before running its task
+    ("run_eval worker", ["-c", "import scripts.run_eval"], 20),
+    ("package_skill worker", ["-c", "import scripts.package_skill"], 10),
+    ("validate_skills worker", ["-c", "import scripts.validate_skills"], 12),
+]
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once(args: list[str], importtime: bool = False) -> tuple[float, str]:
+    """Run the interpreter once from the skill-creator dir; returns (wall seconds, stderr)."""
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=SKILL_CREATOR_DIR, capture_output=True, text=True, env=env)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited {proc.returncode}: {proc.stderr.strip()[-500:]}")
+    return elapsed, proc.stderr
+
+
+def best_of(args: list[str], repeat: int) -> float:
+    return min(run_once(args)[0] for _ in range(repeat))
+
+
+def import_cost(args: list[str], repeat: int) -> float:
+    """Best-of-repeat wall seconds for args minus a bare interpreter, sampled alternately so drift cancels."""
+    entry, bare = [], []
+    for _ in range(repeat):
+        bare.append(run_once(["-c", "pass"])[0])
+        entry.append(run_once(args)[0])
+    return min(entry) - min(bare)
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse `-X importtime` output into [{"module", "self_us", "cumulative_us", "depth"}]."""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            rows.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            })
+    return rows
+
+
+def heavy_modules(module: str, heavy: set[str]) -> list[str]:
+    """Which of heavy are in sys.modules after a bare `import module` in a fresh interpreter."""
+    code = f"import sys, {module}; print(*sys.modules, sep='\\n', file=sys.stderr)"
+    loaded = set(run_once(["-c", code])[1].split())
+    return sorted(loaded & heavy)
+
+
+def check(repeat: int = 5, budget_scale: float = 1.0, profile: int = 0) -> bool:
+    """Profile every entry point and print a report. Returns True if all are within budget."""
+    baseline = best_of(["-c", "pass"], repeat)
+    print(f"Bare interpreter: {baseline * 1000:.1f} ms (re-sampled and subtracted for each entry)\n")
+    print(f"{'entry point':<30} {'import ms':>10} {'budget':>8}  status")
+
+    ok = True
+    for label, args, budget_ms in ENTRY_POINTS:
+        budget = budget_ms * budget_scale
+        try:
+            imported = parse_importtime(run_once(args, importtime=True)[1])
+            elapsed_ms = max(0.0, import_cost(args, repeat) * 1000)
+        except RuntimeError as e:
+            print(f"{label:<30} {'-':>10} {budget:>6.0f}ms  FAIL ({e})")
+            ok = False
+            continue
+
+        top_level = {row["module"].split(".")[0] for row in imported}
+        forbidden = sorted(top_level & FORBIDDEN)
+        problems = []
+        if forbidden:
+            problems.append(f"imports {', '.join(forbidden)}")
+        if elapsed_ms > budget:
+            problems.append("over budget")
+        ok = ok and not problems
+        status = "FAIL (" + "; ".join(problems) + ")" if problems else "ok"
+        print(f"{label:<30} {elapsed_ms:>10.1f} {budget:>6.0f}ms  {status}")
+
+        if profile:
+            # Where the time actually goes: slowest modules by self time
+            for row in sorted(imported, key=lambda r: -r["self_us"])[:profile]:
+                print(f"    {row['self_us'] / 1000:>8.1f} ms  {row['module']}")
+
+    print()
+    for module, heavy in LEAN_IMPORTS.items():
+        loaded = heavy_modules(module, heavy)
+        ok = ok and not loaded
+        status = f"FAIL (loads {', '.join(loaded)})" if loaded else "ok"
+        print(f"{'import ' + module:<30} {'no heavy modules':>19}  {status}")
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile and budget check for skill-creator entry points")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point; the fastest counts (default: 5)")
+    parser.add_argument("--budget-scale", type=float, default=float(os.environ.get("IMPORT_BUDGET_SCALE", "1.0")),
+                        help="Multiply every budget (default: $IMPORT_BUDGET_SCALE or 1.0)")
+    parser.add_argument("--profile", type=int, default=0, metavar="N",
+                        help="Show the N slowest imports (by self time) for each entry point")
+    args = parser.parse_args()
+
+    ok = check(repeat=args.repeat, budget_scale=args.budget_scale, profile=args.profile)
+    print("\nAll entry points within budget." if ok else "\nImport budget check failed.")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,25 @@ import json
 import re
 import sys
 from pathlib import Path
-
-import anthropic
+from typing import TYPE_CHECKING
 
 from scripts.utils import parse_skill_md
 
+if TYPE_CHECKING:
+    import anthropic
+
+
+def make_client() -> "anthropic.Anthropic":
+    """Create an Anthropic client. The SDK is imported here, on first use, since it is slow to import."""
+    try:
+        import anthropic
+    except ImportError:
+        raise ImportError("anthropic is required to improve descriptions. Install with: pip install anthropic")
+    return anthropic.Anthropic()
+
 
 def improve_description(
-    client: anthropic.Anthropic,
+    client: "anthropic.Anthropic",
     skill_name: str,
     skill_content: str,
     current_description: str,
@@ -216,7 +227,7 @@ def main():
         print(f"Current: {current_description}", file=sys.stderr)
         print(f"Score: {eval_results['summary']['passed']}/{eval_results['summary']['total']}", file=sys.stderr)
 
-    client = anthropic.Anthropic()
+    client = make_client()
     new_description = improve_description(
         client=client,
         skill_name=name,
@@ -2,19 +2,30 @@
 """
 Skill Packager - Creates a distributable .skill file of a skill folder
 
+Archives are deterministic: entries are sorted, timestamps and permissions
+are fixed, so the same skill contents always produce the same bytes. The
+archive comment records a content hash of the packaged files, and packaging
+is skipped when an existing .skill file already has the current hash.
+
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python -m scripts.package_skill <path/to/skill-folder> [output-directory] [--force]
+    python -m scripts.package_skill --all <skills-root> [output-directory] [--num-workers N]
 
 Example:
-    python utils/package_skill.py skills/public/my-skill
-    python utils/package_skill.py skills/public/my-skill ./dist
+    python -m scripts.package_skill skills/public/my-skill
+    python -m scripts.package_skill skills/public/my-skill ./dist
+    python -m scripts.package_skill --all skills/public ./dist
 """
 
+import argparse
 import fnmatch
+import hashlib
+import os
 import sys
 import zipfile
 from pathlib import Path
 from scripts.quick_validate import validate_skill
+from scripts.utils import find_skills
 
 # Patterns to exclude when packaging skills.
 EXCLUDE_DIRS = {"__pycache__", "node_modules"}
@@ -23,6 +34,18 @@ EXCLUDE_FILES = {".DS_Store"}
 # Directories excluded only at the skill root (not when nested deeper).
 ROOT_EXCLUDE_DIRS = {"evals"}
 
+# Already-compressed formats are stored as-is; deflating them again costs
+# time and usually makes them slightly larger.
+STORED_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico",
+    ".pdf", ".xlsx", ".docx", ".pptx", ".odt", ".ods", ".odp",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".skill",
+    ".mp3", ".mp4", ".m4a", ".mov", ".webm", ".woff", ".woff2",
+}
+# Fixed entry timestamp (the earliest the zip format can represent).
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+HASH_PREFIX = "sha256:"
+
 
 def should_exclude(rel_path: Path) -> bool:
     """Check if a path should be excluded from packaging."""
@@ -39,18 +62,84 @@ def should_exclude(rel_path: Path) -> bool:
     return any(fnmatch.fnmatch(name, pat) for pat in EXCLUDE_GLOBS)
 
 
-def package_skill(skill_path, output_dir=None):
+def collect_files(skill_path: Path, verbose: bool = True) -> list[tuple[Path, str]]:
+    """Return (file_path, arcname) pairs to package, sorted by arcname."""
+    files = []
+    for root, dirs, filenames in os.walk(skill_path):
+        dirs.sort()
+        for name in filenames:
+            file_path = Path(root) / name
+            rel_path = file_path.relative_to(skill_path.parent)
+            if should_exclude(rel_path):
+                if verbose:
+                    print(f"  Skipped: {rel_path}")
+                continue
+            if file_path.is_file():
+                files.append((file_path, rel_path.as_posix()))
+    files.sort(key=lambda f: f[1])
+    return files
+
+
+def content_hash(files: list[tuple[Path, str]]) -> str:
+    """Hash of the archive contents: every arcname, its executable bit and its bytes."""
+    digest = hashlib.sha256()
+    for file_path, arcname in files:
+        digest.update(arcname.encode("utf-8") + b"\0")
+        digest.update(b"x" if os.access(file_path, os.X_OK) else b"-")
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(hashlib.sha256(chunk).digest())
+        digest.update(b"\0")
+    return HASH_PREFIX + digest.hexdigest()
+
+
+def archive_hash(skill_filename: Path) -> str | None:
+    """Content hash recorded in an existing .skill file's comment, if any."""
+    try:
+        with zipfile.ZipFile(skill_filename) as zipf:
+            comment = zipf.comment.decode("utf-8", "replace")
+    except (OSError, zipfile.BadZipFile):
+        return None
+    return comment if comment.startswith(HASH_PREFIX) else None
+
+
+def write_archive(skill_filename: Path, files: list[tuple[Path, str]], digest: str, verbose: bool = True) -> None:
+    """Write a deterministic zip: sorted entries, fixed timestamps and modes."""
+    tmp_filename = skill_filename.with_name(skill_filename.name + ".tmp")
+    with zipfile.ZipFile(tmp_filename, "w") as zipf:
+        for file_path, arcname in files:
+            info = zipfile.ZipInfo(arcname, date_time=ZIP_EPOCH)
+            mode = 0o755 if os.access(file_path, os.X_OK) else 0o644
+            info.external_attr = (0o100000 | mode) << 16
+            info.create_system = 3  # Unix, so the mode bits are honoured
+            if Path(arcname).suffix.lower() in STORED_SUFFIXES:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            with open(file_path, "rb") as src, zipf.open(info, "w") as dst:
+                for chunk in iter(lambda: src.read(1 << 20), b""):
+                    dst.write(chunk)
+            if verbose:
+                print(f"  Added: {arcname}")
+        zipf.comment = digest.encode("utf-8")
+    os.replace(tmp_filename, skill_filename)
+
+
+def package_skill(skill_path, output_dir=None, force=False, verbose=True):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        force: Rebuild even if the existing .skill file is up to date
+        verbose: Print validation and per-file progress
 
     Returns:
-        Path to the created .skill file, or None if error
+        Path to the created (or already up-to-date) .skill file, or None if error
     """
     skill_path = Path(skill_path).resolve()
+    log = print if verbose else (lambda *a, **k: None)
 
     # Validate skill folder exists
     if not skill_path.exists():
@@ -68,13 +157,13 @@ def package_skill(skill_path, output_dir=None):
         return None
 
     # Run validation before packaging
-    print("🔍 Validating skill...")
+    log("🔍 Validating skill...")
     valid, message = validate_skill(skill_path)
     if not valid:
         print(f"❌ Validation failed: {message}")
         print("   Please fix the validation errors before packaging.")
         return None
-    print(f"✅ {message}\n")
+    log(f"✅ {message}\n")
 
     # Determine output location
     skill_name = skill_path.name
@@ -86,21 +175,16 @@ def package_skill(skill_path, output_dir=None):
 
     skill_filename = output_path / f"{skill_name}.skill"
 
-    # Create the .skill file (zip format)
+    # Create the .skill file (zip format), unless it is already up to date
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory, excluding build artifacts
-            for file_path in skill_path.rglob('*'):
-                if not file_path.is_file():
-                    continue
-                arcname = file_path.relative_to(skill_path.parent)
-                if should_exclude(arcname):
-                    print(f"  Skipped: {arcname}")
-                    continue
-                zipf.write(file_path, arcname)
-                print(f"  Added: {arcname}")
+        files = collect_files(skill_path, verbose=verbose)
+        digest = content_hash(files)
+        if not force and skill_filename.exists() and archive_hash(skill_filename) == digest:
+            log(f"✅ Up to date, skipped: {skill_filename}")
+            return skill_filename
 
-        print(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        write_archive(skill_filename, files, digest, verbose=verbose)
+        log(f"\n✅ Successfully packaged skill to: {skill_filename}")
         return skill_filename
 
     except Exception as e:
@@ -108,23 +192,87 @@ def package_skill(skill_path, output_dir=None):
         return None
 
 
+def _package_worker(skill_path: str, output_dir: str, force: bool) -> tuple[str, str | None, bool]:
+    """Process-pool entry point: returns (skill_path, output_path, rebuilt)."""
+    skill_filename = Path(output_dir) / f"{Path(skill_path).name}.skill"
+    before = archive_hash(skill_filename)
+    result = package_skill(skill_path, output_dir, force=force, verbose=False)
+    rebuilt = result is not None and (force or archive_hash(result) != before)
+    return skill_path, str(result) if result else None, rebuilt
+
+
+def package_all(root, output_dir=None, num_workers=None, force=False) -> bool:
+    """
+    Package every skill under root in parallel.
+
+    Returns True if every skill packaged (or was already up to date).
+    """
+    # Imported here so pool workers importing this module don't load it
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    root = Path(root).resolve()
+    output_path = Path(output_dir).resolve() if output_dir else Path.cwd()
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    skills = find_skills(root)
+    if not skills:
+        print(f"❌ Error: No skills (directories with SKILL.md) found under {root}")
+        return False
+
+    seen: dict[str, Path] = {}
+    for skill in skills:
+        if skill.name in seen:
+            print(f"❌ Error: Two skills would both package to {skill.name}.skill: {seen[skill.name]} and {skill}")
+            return False
+        seen[skill.name] = skill
+
+    print(f"📦 Packaging {len(skills)} skills from {root} -> {output_path}\n")
+    built = skipped = failed = 0
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(_package_worker, str(skill), str(output_path), force)
+            for skill in skills
+        ]
+        for future in as_completed(futures):
+            try:
+                skill, result, rebuilt = future.result()
+            except Exception as e:
+                print(f"  ❌ Worker failed: {e}")
+                failed += 1
+                continue
+            name = Path(skill).name
+            if result is None:
+                print(f"  ❌ {name}")
+                failed += 1
+            elif rebuilt:
+                print(f"  ✅ {name} -> {result}")
+                built += 1
+            else:
+                print(f"  ·  {name} (up to date)")
+                skipped += 1
+
+    print(f"\nPackaged {built}, up to date {skipped}, failed {failed}")
+    return failed == 0
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Package a skill folder (or every skill in a tree) into .skill files")
+    parser.add_argument("path", help="Skill folder, or the root to search with --all")
+    parser.add_argument("output_dir", nargs="?", default=None, help="Output directory (default: current directory)")
+    parser.add_argument("--all", action="store_true", help="Package every skill (directory with SKILL.md) under path")
+    parser.add_argument("--num-workers", type=int, default=None, help="Parallel workers for --all (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the .skill file is up to date")
+    args = parser.parse_args()
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    if args.all:
+        sys.exit(0 if package_all(args.path, args.output_dir, args.num_workers, args.force) else 1)
 
-    print(f"📦 Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
+    print(f"📦 Packaging skill: {args.path}")
+    if args.output_dir:
+        print(f"   Output directory: {args.output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(args.path, args.output_dir, force=args.force)
 
     if result:
         sys.exit(0)
@@ -13,7 +13,6 @@ import subprocess
 import sys
 import time
 import uuid
-from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 from scripts.utils import parse_skill_md
@@ -193,6 +192,10 @@ def run_eval(
     model: str | None = None,
 ) -> dict:
     """Run the full eval set and return results."""
+    # Imported here rather than at module level: pool workers import this
+    # module to find run_single_query and never need the executor machinery.
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
     results = []
 
     with ProcessPoolExecutor(max_workers=num_workers) as executor:
@@ -12,13 +12,12 @@ import random
 import sys
 import tempfile
 import time
-import webbrowser
 from pathlib import Path
 
-import anthropic
-
-from scripts.generate_report import generate_html
-from scripts.improve_description import improve_description
+# anthropic, webbrowser and the report generator are imported where they are
+# used, so `--help` and pool workers (which re-import this module under
+# spawn/forkserver) don't pay for them.
+from scripts.improve_description import improve_description, make_client
 from scripts.run_eval import find_project_root, run_eval
 from scripts.utils import parse_skill_md
 
@@ -75,7 +74,7 @@ def run_loop(
         train_set = eval_set
         test_set = []
 
-    client = anthropic.Anthropic()
+    client = make_client()
     history = []
     exit_reason = "unknown"
 
@@ -141,6 +140,8 @@ def run_loop(
 
         # Write live report if path provided
         if live_report_path:
+            from scripts.generate_report import generate_html
+
             partial_output = {
                 "original_description": original_description,
                 "best_description": current_description,
@@ -280,6 +281,7 @@ def main():
             live_report_path = Path(args.report)
         # Open the report immediately so the user can watch
         live_report_path.write_text("<html><body><h1>Starting optimization loop...</h1><meta http-equiv='refresh' content='5'></body></html>")
+        import webbrowser
         webbrowser.open(str(live_report_path))
     else:
         live_report_path = None
@@ -318,6 +320,8 @@ def main():
 
     # Write final HTML report (without auto-refresh)
     if live_report_path:
+        from scripts.generate_report import generate_html
+
         live_report_path.write_text(generate_html(output, auto_refresh=False, skill_name=name))
         print(f"\nReport: {live_report_path}", file=sys.stderr)
 
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Skill registry - a precomputed catalog of every skill in a tree.
+
+Builds a single JSON index holding, for each skill: name, description,
+the parsed frontmatter, its file list with sizes and SHA-256 hashes, and a
+content hash over the whole skill. Rebuilds are incremental: a file is only
+re-hashed when its mtime or size changed, and SKILL.md is only re-parsed
+when it changed, so refreshing an up-to-date registry is a stat walk.
+
+Tools that need the catalog can call load_registry() (one JSON read) or
+refresh_registry() (stat walk + read) instead of re-parsing every SKILL.md.
+
+Usage:
+    python -m scripts.skill_registry build <skills-root> [--index FILE]
+    python -m scripts.skill_registry list <skills-root> [--index FILE] [--json]
+    python -m scripts.skill_registry show <skills-root> <skill-name> [--index FILE]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from scripts.utils import SKIP_DIRS, find_skills, parse_frontmatter
+
+INDEX_FILENAME = ".skill-registry.json"
+INDEX_VERSION = 1
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_frontmatter(skill_path: Path) -> tuple[dict, str | None]:
+    """
+    (frontmatter, error) for a skill, parsed by utils.parse_frontmatter like
+    quick_validate does; a skill whose frontmatter doesn't parse gets {} and
+    the validator's error message.
+    """
+    try:
+        content = (skill_path / "SKILL.md").read_text()
+    except OSError as e:
+        return {}, str(e)
+    frontmatter, error = parse_frontmatter(content)
+    return frontmatter or {}, error
+
+
+def list_skill_files(skill_path: Path) -> list[tuple[str, os.stat_result]]:
+    """(relative posix path, stat) for every file in the skill, sorted."""
+    files = []
+    for dirpath, dirs, filenames in os.walk(skill_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+        for name in filenames:
+            path = Path(dirpath) / name
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((path.relative_to(skill_path).as_posix(), st))
+    files.sort(key=lambda f: f[0])
+    return files
+
+
+def build_entry(skill_path: Path, previous: dict | None) -> tuple[dict, int]:
+    """
+    Build (or refresh) one skill's registry entry.
+
+    Returns (entry, files_hashed). Unchanged files reuse the previous hash.
+    """
+    old_files = {f["path"]: f for f in (previous or {}).get("files", [])}
+    files = []
+    hashed = 0
+    for rel, st in list_skill_files(skill_path):
+        old = old_files.get(rel)
+        if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+            sha = old["sha256"]
+        else:
+            sha = file_sha256(skill_path / rel)
+            hashed += 1
+        files.append({"path": rel, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha})
+
+    skill_md = next((f for f in files if f["path"] == "SKILL.md"), None)
+    old_skill_md = old_files.get("SKILL.md")
+    if previous and skill_md and old_skill_md and skill_md["sha256"] == old_skill_md["sha256"]:
+        frontmatter, error = previous["frontmatter"], previous.get("frontmatter_error")
+    else:
+        frontmatter, error = read_frontmatter(skill_path)
+
+    digest = hashlib.sha256()
+    for f in files:
+        digest.update(f"{f['path']}\0{f['sha256']}\n".encode("utf-8"))
+
+    name = frontmatter.get("name")
+    description = frontmatter.get("description")
+    entry = {
+        "name": name.strip() if isinstance(name, str) and name.strip() else skill_path.name,
+        "description": description.strip() if isinstance(description, str) else "",
+        "path": str(skill_path),
+        "frontmatter": frontmatter,
+        "frontmatter_error": error,
+        "file_count": len(files),
+        "total_size": sum(f["size"] for f in files),
+        "content_hash": digest.hexdigest(),
+        "files": files,
+    }
+    return entry, hashed
+
+
+def default_index_path(root: Path) -> Path:
+    return Path(root) / INDEX_FILENAME
+
+
+def load_registry(index_path: Path) -> dict:
+    """Load a registry index without touching the skills. Returns {} if missing or stale-format."""
+    try:
+        data = json.loads(Path(index_path).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != INDEX_VERSION:
+        return {}
+    return data
+
+
+def refresh_registry(root, index_path: Path | None = None, verbose: bool = False) -> dict:
+    """
+    Bring the registry for root up to date and write it back.
+
+    Returns the registry: {"version", "root", "built_at", "skills": {path: entry}}.
+    """
+    root = Path(root).resolve()
+    index_path = Path(index_path) if index_path else default_index_path(root)
+    start = time.perf_counter()
+
+    registry = load_registry(index_path)
+    previous = registry.get("skills", {}) if registry.get("root") == str(root) else {}
+
+    skills = {}
+    hashed = 0
+    for skill_path in find_skills(root):
+        entry, n = build_entry(skill_path, previous.get(str(skill_path)))
+        skills[str(skill_path)] = entry
+        hashed += n
+
+    registry = {
+        "version": INDEX_VERSION,
+        "root": str(root),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "skills": skills,
+    }
+    # Skip the write when nothing changed, so read-only refreshes stay cheap
+    # and the index mtime reflects the last real change.
+    if hashed or set(skills) != set(previous) or any(
+        skills[k]["content_hash"] != previous[k]["content_hash"] for k in skills
+    ):
+        tmp = index_path.with_name(index_path.name + ".tmp")
+        tmp.write_text(json.dumps(registry, indent=1, default=str))
+        os.replace(tmp, index_path)
+
+    if verbose:
+        print(
+            f"Indexed {len(skills)} skills ({hashed} files hashed) in "
+            f"{time.perf_counter() - start:.3f}s -> {index_path}",
+            file=sys.stderr,
+        )
+    return registry
+
+
+def find_skill(registry: dict, name: str) -> dict | None:
+    """Look up a skill entry by frontmatter name or directory name."""
+    for entry in registry.get("skills", {}).values():
+        if entry["name"] == name or Path(entry["path"]).name == name:
+            return entry
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precomputed catalog of skills")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for cmd, help_text in (("build", "Build or refresh the index"),
+                           ("list", "List skills in the index"),
+                           ("show", "Show one skill's entry")):
+        p = sub.add_parser(cmd, help=help_text)
+        p.add_argument("root", help="Directory to search for skills")
+        p.add_argument("--index", default=None, help=f"Index file (default: <root>/{INDEX_FILENAME})")
+        if cmd == "list":
+            p.add_argument("--json", action="store_true", help="Print entries (without file lists) as JSON")
+        if cmd == "show":
+            p.add_argument("name", help="Skill name or directory name")
+
+    args = parser.parse_args()
+    registry = refresh_registry(args.root, args.index, verbose=True)
+
+    if args.command == "list":
+        entries = sorted(registry["skills"].values(), key=lambda e: e["name"])
+        if args.json:
+            print(json.dumps([{k: v for k, v in e.items() if k != "files"} for e in entries], indent=2))
+        else:
+            for e in entries:
+                flag = "  ⚠ " + e["frontmatter_error"] if e["frontmatter_error"] else ""
+                print(f"{e['name']:<40} {e['file_count']:>4} files {e['total_size']:>10,} bytes{flag}")
+    elif args.command == "show":
+        entry = find_skill(registry, args.name)
+        if entry is None:
+            print(f"Skill not found: {args.name}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(entry, indent=2))
+
+
+if __name__ == "__main__":
+    main()
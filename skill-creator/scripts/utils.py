@@ -1,7 +1,44 @@
 """Shared utilities for skill-creator scripts."""
 
+import os
+import re
 from pathlib import Path
 
+# Directories never searched for skills.
+SKIP_DIRS = {"__pycache__", "node_modules"}
+
+
+def find_skills(root: Path) -> list[Path]:
+    """Every directory under root (inclusive) containing a SKILL.md, skipping build artifacts and hidden dirs."""
+    skills = []
+    for dirpath, dirs, filenames in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        if "SKILL.md" in filenames:
+            skills.append(Path(dirpath))
+    return skills
+
+
+def parse_frontmatter(content: str) -> tuple[dict | None, str | None]:
+    """
+    Parse SKILL.md content's frontmatter as YAML.
+
+    Returns (frontmatter, None), or (None, error) with the message
+    quick_validate reports for that problem.
+    """
+    import yaml
+
+    if not content.startswith("---"):
+        return None, "No YAML frontmatter found"
+    match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
+    if not match:
+        return None, "Invalid frontmatter format"
+    try:
+        frontmatter = yaml.safe_load(match.group(1))
+    except yaml.YAMLError as e:
+        return None, f"Invalid YAML in frontmatter: {e}"
+    if not isinstance(frontmatter, dict):
+        return None, "Frontmatter must be a YAML dictionary"
+    return frontmatter, None
 
 
 def parse_skill_md(skill_path: Path) -> tuple[str, str, str]:
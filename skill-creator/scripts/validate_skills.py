@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Bulk skill validator - validate every skill in a tree in one process.
+
+Runs the same checks as quick_validate.py, but over every directory that
+contains a SKILL.md, collecting all violations per skill instead of stopping
+at the first. Large trees are validated across a process pool. Results are
+cached by SKILL.md mtime and size, so unchanged skills are not re-checked on
+the next run.
+
+Usage:
+    python -m scripts.validate_skills <skills-root> [--format text|json|junit] [--output FILE]
+
+Example:
+    python -m scripts.validate_skills .. --format junit --output validate.xml
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from scripts.quick_validate import check_skill
+from scripts.utils import find_skills
+
+CACHE_FILENAME = ".skill-validate-cache.json"
+CACHE_VERSION = 1
+# Below this many skills to check, process startup costs more than it saves.
+PARALLEL_THRESHOLD = 64
+
+
+def skill_signature(skill_path: Path) -> list[int] | None:
+    """(mtime_ns, size) of SKILL.md — everything check_skill reads — or None if missing."""
+    try:
+        st = (skill_path / "SKILL.md").stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_cache(cache_path: Path | None) -> dict:
+    if not cache_path or not cache_path.exists():
+        return {}
+    try:
+        data = json.loads(cache_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("skills", {})
+
+
+def save_cache(cache_path: Path | None, entries: dict) -> None:
+    if not cache_path:
+        return
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": CACHE_VERSION, "skills": entries}, indent=2))
+    os.replace(tmp, cache_path)
+
+
+def _check_worker(skill_path: str) -> tuple[list[str], float]:
+    start = time.perf_counter()
+    try:
+        errors = check_skill(skill_path)
+    except Exception as e:
+        errors = [f"Validator crashed: {e}"]
+    return errors, time.perf_counter() - start
+
+
+def validate_tree(root, num_workers: int | None = None, cache_path: Path | None = None) -> list[dict]:
+    """
+    Validate every skill under root.
+
+    Returns one result per skill, sorted by path:
+    {"name", "path", "valid", "errors", "cached", "seconds"}.
+    """
+    root = Path(root).resolve()
+    skills = find_skills(root)
+    cache = load_cache(cache_path)
+
+    results: dict[str, dict] = {}
+    pending: list[tuple[str, list[int] | None]] = []
+    for skill in skills:
+        key = str(skill)
+        signature = skill_signature(skill)
+        entry = cache.get(key)
+        if entry and signature is not None and entry.get("signature") == signature:
+            results[key] = {"errors": entry["errors"], "cached": True, "seconds": 0.0}
+        else:
+            pending.append((key, signature))
+
+    paths = [key for key, _ in pending]
+    if len(paths) >= PARALLEL_THRESHOLD and num_workers != 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            outcomes = list(executor.map(_check_worker, paths, chunksize=16))
+    else:
+        outcomes = [_check_worker(p) for p in paths]
+
+    for (key, signature), (errors, seconds) in zip(pending, outcomes):
+        results[key] = {"errors": errors, "cached": False, "seconds": seconds}
+        if signature is not None:
+            cache[key] = {"signature": signature, "errors": errors}
+
+    # Drop cache entries for skills that no longer exist under this root
+    live = {str(s) for s in skills}
+    cache = {k: v for k, v in cache.items() if k in live or not k.startswith(str(root))}
+    save_cache(cache_path, cache)
+
+    return [
+        {
+            "name": skill.name,
+            "path": str(skill),
+            "valid": not results[str(skill)]["errors"],
+            **results[str(skill)],
+        }
+        for skill in skills
+    ]
+
+
+def format_text(results: list[dict]) -> str:
+    lines = []
+    for r in results:
+        suffix = " (cached)" if r["cached"] else ""
+        if r["valid"]:
+            lines.append(f"✅ {r['name']}{suffix}")
+        else:
+            lines.append(f"❌ {r['name']}{suffix} — {r['path']}")
+            lines.extend(f"   - {e}" for e in r["errors"])
+    failed = sum(1 for r in results if not r["valid"])
+    cached = sum(1 for r in results if r["cached"])
+    lines.append(f"\n{len(results)} skills, {failed} invalid, {cached} from cache")
+    return "\n".join(lines)
+
+
+def format_json(results: list[dict]) -> str:
+    return json.dumps({
+        "summary": {
+            "total": len(results),
+            "invalid": sum(1 for r in results if not r["valid"]),
+            "cached": sum(1 for r in results if r["cached"]),
+        },
+        "skills": results,
+    }, indent=2)
+
+
+def format_junit(results: list[dict]) -> str:
+    """One <testcase> per skill, one <failure> per violation."""
+    suite = ET.Element("testsuite", {
+        "name": "skill-validation",
+        "tests": str(len(results)),
+        "failures": str(sum(len(r["errors"]) for r in results)),
+        "errors": "0",
+        "time": f"{sum(r['seconds'] for r in results):.4f}",
+    })
+    for r in results:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": "skills",
+            "name": r["name"],
+            "file": str(Path(r["path"]) / "SKILL.md"),
+            "time": f"{r['seconds']:.4f}",
+        })
+        for error in r["errors"]:
+            failure = ET.SubElement(case, "failure", {"message": error})
+            failure.text = error
+    ET.indent(suite)
+    return '<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(suite, encoding="unicode")
+
+
+FORMATTERS = {"text": format_text, "json": format_json, "junit": format_junit}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate every skill under a directory")
+    parser.add_argument("root", help="Directory to search for skills (directories with SKILL.md)")
+    parser.add_argument("--format", choices=sorted(FORMATTERS), default="text", help="Output format")
+    parser.add_argument("--output", "-o", default=None, help="Write the report here instead of stdout")
+    parser.add_argument("--num-workers", type=int, default=None,
+                        help=f"Parallel workers when {PARALLEL_THRESHOLD}+ skills need checking (default: CPU count)")
+    parser.add_argument("--cache", default=None,
+                        help=f"Cache file (default: <root>/{CACHE_FILENAME})")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every skill and don't write a cache")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"Error: Not a directory: {root}", file=sys.stderr)
+        sys.exit(1)
+
+    cache_path = None if args.no_cache else Path(args.cache) if args.cache else root / CACHE_FILENAME
+    results = validate_tree(root, num_workers=args.num_workers, cache_path=cache_path)
+    if not results:
+        print(f"Error: No skills found under {root}", file=sys.stderr)
+        sys.exit(1)
+
+    report = FORMATTERS[args.format](results)
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+        if args.format != "text":
+            print(format_text(results).rsplit("\n", 1)[-1], file=sys.stderr)
+    else:
+        print(report)
+
+    sys.exit(0 if all(r["valid"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()